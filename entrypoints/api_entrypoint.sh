@@ -15,6 +15,10 @@ export RUNNING_MIGRATIONS
 echo "Starting Migrations"
 python3.10 manage.py migrate
 RUNNING_MIGRATIONS="False"
-echo "Starting Gunicorn"
-exec gunicorn sensor.wsgi -c ../gunicorn/config.py &
+APPLICATION="sensor.wsgi"
+if [[ "${ASGI,,}" == "true" || "$ASGI" == "1" ]]; then
+    APPLICATION="sensor.asgi"
+fi
+echo "Starting Gunicorn ($APPLICATION)"
+exec gunicorn $APPLICATION -c ../gunicorn/config.py &
 wait
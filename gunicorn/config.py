@@ -4,8 +4,13 @@ from multiprocessing import cpu_count
 
 bind = ":8000"
 workers = 1
-worker_class = "gthread"
-threads = cpu_count()
+# With ASGI=True, serve sensor.asgi with uvicorn workers, where streamed
+# responses don't each hold a thread. See entrypoints/api_entrypoint.sh.
+if os.environ.get("ASGI", "").lower() in ("1", "true"):
+    worker_class = "uvicorn.workers.UvicornWorker"
+else:
+    worker_class = "gthread"
+    threads = cpu_count()
 
 loglevel = os.environ.get("GUNICORN_LOG_LEVEL", "info")
 
@@ -20,15 +25,21 @@ def _modify_path():
 
 
 def post_worker_init(worker):
-    """Start scheduler in worker."""
+    """Start scheduler and status poller in worker."""
     _modify_path()
     os.environ.setdefault("DJANGO_SETTINGS_MODULE", "sensor.settings")
     import django
 
     django.setup()
+    from django.conf import settings
+
     from scheduler import scheduler
+    from status.views import status_poller
 
     scheduler.thread.start()
+    if settings.STATUS_HISTORY_POLL:
+        # Poll status continuously to record its history
+        status_poller.start()
 
 
 def worker_exit(server, worker):
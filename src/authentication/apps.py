@@ -1,5 +1,16 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save
 
 
 class AuthenticationConfig(AppConfig):
     name = "authentication"
+
+    def ready(self):
+        from rest_framework.authtoken.models import Token
+
+        from .auth import invalidate_cached_user
+        from .models import User
+
+        for model in (User, Token):
+            post_save.connect(invalidate_cached_user, sender=model)
+            post_delete.connect(invalidate_cached_user, sender=model)
@@ -1,15 +1,18 @@
-import datetime
+import copy
 import logging
 import re
+import threading
+import time
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.utils import timezone
 from rest_framework import authentication, exceptions
 
 logger = logging.getLogger(__name__)
 
 token_auth_enabled = (
-    "rest_framework.authentication.TokenAuthentication"
+    "authentication.auth.CachedTokenAuthentication"
     in settings.REST_FRAMEWORK["DEFAULT_AUTHENTICATION_CLASSES"]
 )
 certificate_authentication_enabled = (
@@ -18,6 +21,96 @@ certificate_authentication_enabled = (
 )
 
 
+class UserCache:
+    """
+    Caches the user for a certificate DN or token for `ttl` seconds.
+
+    Entries are removed when the user or their token changes in this process.
+    Changes made by other processes, e.g. management commands, are seen once
+    entries expire, except that token users are checked to still be active on
+    each request. A `ttl` of 0 disables the cache.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached value for `key`, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires <= time.monotonic():
+                del self._entries[key]
+                return None
+            return value
+
+    def set(self, key, value, user_pk):
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = ((value, user_pk), time.monotonic() + self.ttl)
+
+    def invalidate_user(self, user_pk):
+        with self._lock:
+            for key, ((_, pk), _) in list(self._entries.items()):
+                if pk == user_pk:
+                    del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = UserCache(settings.AUTH_CACHE_TTL)
+
+
+def invalidate_cached_user(sender, instance, update_fields=None, **kwargs):
+    """Remove the cached user when the user or their token changes."""
+    if update_fields is not None and set(update_fields) == {"last_login"}:
+        return
+    user_pk = instance.user_id if hasattr(instance, "user_id") else instance.pk
+    user_cache.invalidate_user(user_pk)
+
+
+def update_last_login(user, cached_user=None):
+    """Save the login time if not saved within LAST_LOGIN_UPDATE_INTERVAL."""
+    now = timezone.now()
+    last_login = (cached_user or user).last_login
+    if last_login is not None and (
+        (now - last_login).total_seconds() < settings.LAST_LOGIN_UPDATE_INTERVAL
+    ):
+        return
+
+    user.last_login = now
+    if cached_user is not None:
+        cached_user.last_login = now
+    user.save(update_fields=["last_login"])
+
+
+class CachedTokenAuthentication(authentication.TokenAuthentication):
+    """Token authentication that caches the user for each token."""
+
+    def authenticate_credentials(self, key):
+        cached = user_cache.get(("token", key))
+        if cached is None:
+            user, token = super().authenticate_credentials(key)
+            user_cache.set(("token", key), (user, token), user.pk)
+            return user, token
+
+        (user, token), _ = cached
+        # DRF checks this on each lookup. The cached user doesn't show that
+        # another process, e.g. a management command, deactivated or deleted
+        # them, so only whether they are active is read again.
+        if not get_user_model().objects.filter(pk=user.pk, is_active=True).exists():
+            user_cache.invalidate_user(user.pk)
+            raise exceptions.AuthenticationFailed("User inactive or deleted.")
+        return copy.copy(user), token
+
+
 class CertificateAuthentication(authentication.BaseAuthentication):
     def authenticate(self, request):
         logger.debug("Authenticating certificate.")
@@ -25,10 +118,16 @@ class CertificateAuthentication(authentication.BaseAuthentication):
         if cert_dn:
             user_model = get_user_model()
             try:
-                cn = get_cn_from_dn(cert_dn)
-                user = user_model.objects.get(username=cn)
-                user.last_login = datetime.datetime.now()
-                user.save()
+                cached = user_cache.get(("dn", cert_dn))
+                if cached is None:
+                    cn = get_cn_from_dn(cert_dn)
+                    cached_user = None
+                    user = user_model.objects.get(username=cn)
+                    user_cache.set(("dn", cert_dn), user, user.pk)
+                else:
+                    cached_user, _ = cached
+                    user = copy.copy(cached_user)
+                update_last_login(user, cached_user)
             except user_model.DoesNotExist:
                 logger.error(f"No username matching {cn} found in database!")
                 raise exceptions.AuthenticationFailed("No matching username found!")
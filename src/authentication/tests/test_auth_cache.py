@@ -0,0 +1,100 @@
+import datetime
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from authentication import auth
+from authentication.auth import CachedTokenAuthentication, UserCache
+
+
+@pytest.fixture
+def user_cache(monkeypatch):
+    cache = UserCache(ttl=60)
+    monkeypatch.setattr(auth, "user_cache", cache)
+    return cache
+
+
+def test_user_cache_expires(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(auth.time, "monotonic", lambda: now[0])
+    cache = UserCache(ttl=10)
+    cache.set("key", "value", 1)
+    assert cache.get("key") == ("value", 1)
+    now[0] += 10
+    assert cache.get("key") is None
+
+
+def test_user_cache_disabled():
+    cache = UserCache(ttl=0)
+    cache.set("key", "value", 1)
+    assert cache.get("key") is None
+
+
+def test_user_cache_invalidate_user():
+    cache = UserCache(ttl=60)
+    cache.set(("dn", "a"), "a", 1)
+    cache.set(("token", "b"), "b", 1)
+    cache.set(("token", "c"), "c", 2)
+    cache.invalidate_user(1)
+    assert cache.get(("dn", "a")) is None
+    assert cache.get(("token", "b")) is None
+    assert cache.get(("token", "c")) == ("c", 2)
+
+
+@pytest.mark.django_db
+def test_token_user_cached(user_cache, admin_user, django_assert_num_queries):
+    key = admin_user.auth_token.key
+    CachedTokenAuthentication().authenticate_credentials(key)
+    # only whether the user is still active
+    with django_assert_num_queries(1):
+        user, token = CachedTokenAuthentication().authenticate_credentials(key)
+    assert user == admin_user
+    assert token.key == key
+
+
+@pytest.mark.django_db
+def test_token_cache_invalidated_on_user_change(user_cache, admin_user):
+    key = admin_user.auth_token.key
+    CachedTokenAuthentication().authenticate_credentials(key)
+    admin_user.is_active = False
+    admin_user.save()
+    with pytest.raises(auth.exceptions.AuthenticationFailed):
+        CachedTokenAuthentication().authenticate_credentials(key)
+
+
+@pytest.mark.django_db
+def test_token_user_deactivated_by_another_process(user_cache, admin_user):
+    key = admin_user.auth_token.key
+    CachedTokenAuthentication().authenticate_credentials(key)
+    # update() sends no signals, like a change made by another process
+    get_user_model().objects.filter(pk=admin_user.pk).update(is_active=False)
+    with pytest.raises(auth.exceptions.AuthenticationFailed):
+        CachedTokenAuthentication().authenticate_credentials(key)
+    assert user_cache.get(("token", key)) is None
+
+
+@pytest.mark.django_db
+def test_token_cache_invalidated_on_token_delete(user_cache, admin_user):
+    key = admin_user.auth_token.key
+    CachedTokenAuthentication().authenticate_credentials(key)
+    Token.objects.filter(user=admin_user).delete()
+    with pytest.raises(auth.exceptions.AuthenticationFailed):
+        CachedTokenAuthentication().authenticate_credentials(key)
+
+
+@pytest.mark.django_db
+def test_last_login_update_throttled(settings, admin_user):
+    settings.LAST_LOGIN_UPDATE_INTERVAL = 300
+    auth.update_last_login(admin_user)
+    first_login = admin_user.last_login
+    assert first_login is not None
+
+    auth.update_last_login(admin_user)
+    assert admin_user.last_login == first_login
+
+    admin_user.last_login = timezone.now() - datetime.timedelta(seconds=301)
+    auth.update_last_login(admin_user)
+    admin_user.refresh_from_db()
+    assert admin_user.last_login > first_login
@@ -0,0 +1,51 @@
+"""Cache the rendered capabilities.
+
+The capabilities rarely change but include the full sensor definition, so
+the JSON response is rendered once and served with a strong ETag. The sensor
+definition is only loaded at startup, so the capabilities are rendered again
+only when the actions change.
+
+"""
+
+import hashlib
+import logging
+import threading
+
+from rest_framework.renderers import JSONRenderer
+
+from initialization import action_loader
+
+logger = logging.getLogger(__name__)
+
+
+class CapabilitiesCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._key = None
+        self._content = None
+        self._etag = None
+
+    def _get_key(self) -> tuple:
+        return tuple(action_loader.actions)
+
+    def get(self, get_capabilities) -> tuple[bytes, str]:
+        """
+        Return the capabilities JSON and its ETag.
+
+        :param get_capabilities: returns the capabilities, called if they
+            changed since last rendered
+        """
+        key = self._get_key()
+        with self._lock:
+            if key == self._key:
+                return self._content, self._etag
+
+        logger.debug("Rendering capabilities")
+        content = JSONRenderer().render(get_capabilities())
+        etag = f'"{hashlib.sha256(content).hexdigest()}"'
+        with self._lock:
+            self._key, self._content, self._etag = key, content, etag
+        return content, etag
+
+
+capabilities_cache = CapabilitiesCache()
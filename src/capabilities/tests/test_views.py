@@ -0,0 +1,47 @@
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from capabilities import views
+from initialization import action_loader
+from sensor import V1
+from sensor.tests.utils import HTTPS_KWARG
+
+
+class NewAction:
+    description = "An action loaded after startup."
+
+
+def test_capabilities_etag(admin_client):
+    url = reverse("capabilities", kwargs=V1)
+    response = admin_client.get(url, **HTTPS_KWARG)
+    assert response.status_code == status.HTTP_200_OK
+    assert "actions" in response.json()
+    etag = response["ETag"]
+
+    response = admin_client.get(url, HTTP_IF_NONE_MATCH=etag, **HTTPS_KWARG)
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response["ETag"] == etag
+
+    response = admin_client.get(url, HTTP_IF_NONE_MATCH='"other"', **HTTPS_KWARG)
+    assert response.status_code == status.HTTP_200_OK
+
+
+def test_capabilities_rendered_again_when_actions_change(admin_client, monkeypatch):
+    url = reverse("capabilities", kwargs=V1)
+    rendered = []
+
+    def get_capabilities():
+        rendered.append(1)
+        return views.get_capabilities()
+
+    monkeypatch.setattr(views, "get_capabilities", get_capabilities)
+    monkeypatch.setitem(action_loader.actions, "new_action", NewAction())
+    response = admin_client.get(url, **HTTPS_KWARG)
+    admin_client.get(url, **HTTPS_KWARG)
+    assert len(rendered) == 1
+    assert "new_action" in {a["name"] for a in response.json()["actions"]}
+
+    del action_loader.actions["new_action"]
+    response_after = admin_client.get(url, **HTTPS_KWARG)
+    assert len(rendered) == 2
+    assert response_after["ETag"] != response["ETag"]
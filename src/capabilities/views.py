@@ -1,12 +1,16 @@
 import copy
 import logging
 
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import parse_etags
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 
-from utils import get_summary
+from initialization import action_loader
+from utils import summarize
 
 from . import actions_by_name, sensor_capabilities
+from .cache import capabilities_cache
 
 logger = logging.getLogger(__name__)
 logger.debug("scos-sensor/capabilities/views.py")
@@ -15,11 +19,12 @@ logger.debug("scos-sensor/capabilities/views.py")
 def get_actions():
     serialized_actions = []
     for action in actions_by_name:
+        description = action_loader.get_description(action)
         serialized_actions.append(
             {
                 "name": action,
-                "summary": get_summary(actions_by_name[action]),
-                "description": actions_by_name[action].description,
+                "summary": summarize(description),
+                "description": description,
             }
         )
 
@@ -29,7 +34,20 @@ def get_actions():
 @api_view()
 def capabilities_view(request, version, format=None):
     """The capabilites of the sensor."""
+    if request.accepted_renderer.format != "json":
+        return Response(get_capabilities())
+
+    content, etag = capabilities_cache.get(get_capabilities)
+    if etag in parse_etags(request.headers.get("If-None-Match", "")):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(content, content_type="application/json")
+    response["ETag"] = etag
+    return response
+
+
+def get_capabilities():
     filtered_actions = get_actions()
     filtered_capabilities = copy.deepcopy(sensor_capabilities)
     filtered_capabilities["actions"] = filtered_actions
-    return Response(filtered_capabilities)
+    return filtered_capabilities
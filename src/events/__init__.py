@@ -0,0 +1,54 @@
+import logging
+import time
+
+from .broker import EventBroker
+
+logger = logging.getLogger(__name__)
+logger.debug("********** Initializing events **********")
+
+# Event types
+TASK_STARTED = "task_started"
+TASK_FINISHED = "task_finished"
+ACQUISITION_CREATED = "acquisition_created"
+SCHEDULE_ENTRY_CREATED = "schedule_entry_created"
+SCHEDULE_ENTRY_UPDATED = "schedule_entry_updated"
+SCHEDULE_ENTRY_DELETED = "schedule_entry_deleted"
+SCHEDULE_CHANGED = "schedule_changed"
+
+event_broker = EventBroker()
+
+
+def publish(event_type: str, data: dict) -> None:
+    """Publish an event to all event stream clients."""
+    event_broker.publish(event_type, data)
+
+
+def wait_for_task(schedule_entry_name: str, is_done, timeout: float) -> bool:
+    """
+    Wait up to `timeout` seconds for `is_done` to return True.
+
+    `is_done` is checked again each time a task of the schedule entry
+    finishes, rather than in a loop.
+
+    :return: the last value returned by `is_done`
+    """
+    deadline = time.monotonic() + timeout
+    # taken before checking so that a task finishing meanwhile isn't missed
+    after_id = event_broker.last_id
+    while not is_done():
+        remaining = deadline - time.monotonic()
+        while remaining > 0:
+            events, complete, last_id = event_broker.get_events(
+                after_id, timeout=remaining
+            )
+            after_id = max(after_id, last_id)
+            if not complete or any(
+                e.type == TASK_FINISHED
+                and e.data["schedule_entry"] == schedule_entry_name
+                for e in events
+            ):
+                break
+            remaining = deadline - time.monotonic()
+        else:
+            return is_done()
+    return True
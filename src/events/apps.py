@@ -0,0 +1,14 @@
+from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save
+
+
+class EventsConfig(AppConfig):
+    name = "events"
+
+    def ready(self):
+        from schedule.models import ScheduleEntry
+
+        from .handlers import schedule_entry_deleted, schedule_entry_saved
+
+        post_save.connect(schedule_entry_saved, sender=ScheduleEntry)
+        post_delete.connect(schedule_entry_deleted, sender=ScheduleEntry)
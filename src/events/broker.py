@@ -0,0 +1,107 @@
+"""In-process publish/subscribe of sensor events.
+
+Events are kept in a ring buffer of the last EVENTS_BUFFER_SIZE events so
+that a client can resume from the last event it received. Event ids increase
+monotonically, starting from the time the process started in milliseconds so
+that ids from before a restart are older than new ones.
+
+Clients wait for events in a thread with :meth:`EventBroker.get_events` or,
+when served over ASGI, in the event loop with
+:meth:`EventBroker.aget_events`.
+
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque, namedtuple
+
+from django.conf import settings
+
+Event = namedtuple("Event", ("id", "type", "data"))
+
+
+class EventBroker:
+    def __init__(self, buffer_size: int = None):
+        buffer_size = buffer_size or settings.EVENTS_BUFFER_SIZE
+        self._events = deque(maxlen=buffer_size)
+        self._next_id = int(time.time() * 1000)
+        self._condition = threading.Condition()
+        # (event loop, asyncio.Event) of each client waiting in an event loop
+        self._waiters = set()
+
+    def publish(self, event_type: str, data: dict) -> Event:
+        with self._condition:
+            event = Event(self._next_id, event_type, data)
+            self._next_id += 1
+            self._events.append(event)
+            self._condition.notify_all()
+            waiters = list(self._waiters)
+        for loop, waiter in waiters:
+            try:
+                loop.call_soon_threadsafe(waiter.set)
+            except RuntimeError:
+                # the event loop was closed
+                pass
+        return event
+
+    @property
+    def last_id(self):
+        """The id of the last published event."""
+        with self._condition:
+            return self._next_id - 1
+
+    def _collect(self, after_id: int):
+        """Return the result of get_events, or None if there are no events."""
+        first_id = self._events[0].id if self._events else self._next_id
+        if after_id + 1 < first_id:
+            return list(self._events), False, self._next_id - 1
+        if self._next_id - 1 > after_id:
+            events = [e for e in self._events if e.id > after_id]
+            return events, True, self._next_id - 1
+        return None
+
+    def get_events(self, after_id: int, timeout: float = 0):
+        """
+        Return the events published after `after_id`.
+
+        :param after_id: the id of the last event received
+        :param timeout: seconds to wait for an event if there are none
+        :return: the events, whether they are complete, i.e. no events after
+            `after_id` were dropped from the buffer, and the id of the last
+            published event
+        """
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while True:
+                result = self._collect(after_id)
+                if result is not None:
+                    return result
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return [], True, self._next_id - 1
+                self._condition.wait(remaining)
+
+    async def aget_events(self, after_id: int, timeout: float = 0):
+        """Like :meth:`get_events`, but waits without blocking the event loop."""
+        deadline = time.monotonic() + timeout
+        waiter = (asyncio.get_running_loop(), asyncio.Event())
+        try:
+            while True:
+                with self._condition:
+                    result = self._collect(after_id)
+                    if result is not None:
+                        return result
+                    waiter[1].clear()
+                    self._waiters.add(waiter)
+                    last_id = self._next_id - 1
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return [], True, last_id
+                try:
+                    await asyncio.wait_for(waiter[1].wait(), remaining)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            with self._condition:
+                self._waiters.discard(waiter)
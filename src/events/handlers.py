@@ -0,0 +1,18 @@
+import events
+
+
+def schedule_entry_saved(sender, instance, created, update_fields=None, **kwargs):
+    # The scheduler saves only the fields it updates, e.g. the next task time
+    if update_fields:
+        return
+
+    event_type = (
+        events.SCHEDULE_ENTRY_CREATED if created else events.SCHEDULE_ENTRY_UPDATED
+    )
+    events.publish(
+        event_type, {"schedule_entry": instance.name, "is_active": instance.is_active}
+    )
+
+
+def schedule_entry_deleted(sender, instance, **kwargs):
+    events.publish(events.SCHEDULE_ENTRY_DELETED, {"schedule_entry": instance.name})
@@ -0,0 +1,24 @@
+import json
+
+from rest_framework.renderers import BaseRenderer
+
+
+def format_event(event_type: str, data, event_id=None) -> str:
+    """Format an event as a server-sent event."""
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event_type}")
+    lines.append(f"data: {json.dumps(data)}")
+    return "\n".join(lines) + "\n\n"
+
+
+class EventStreamRenderer(BaseRenderer):
+    """Renders a response, e.g. an authentication error, as an error event."""
+
+    media_type = "text/event-stream"
+    format = "event-stream"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return format_event("error", data).encode(self.charset)
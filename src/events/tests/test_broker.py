@@ -0,0 +1,102 @@
+import asyncio
+import threading
+
+import events
+from events.broker import EventBroker
+
+
+def test_get_events_after_id():
+    broker = EventBroker(buffer_size=10)
+    first = broker.publish("task_started", {"task_id": 1})
+    second = broker.publish("task_finished", {"task_id": 1})
+
+    events, complete, last_id = broker.get_events(first.id)
+    assert events == [second]
+    assert complete
+    assert last_id == second.id
+
+
+def test_get_events_waits_for_event():
+    broker = EventBroker(buffer_size=10)
+    last_id = broker.last_id
+    timer = threading.Timer(0.05, broker.publish, ("task_started", {}))
+    timer.start()
+
+    events, complete, _ = broker.get_events(last_id, timeout=5)
+    timer.join()
+    assert [e.type for e in events] == ["task_started"]
+    assert complete
+
+
+def test_get_events_timeout():
+    broker = EventBroker(buffer_size=10)
+    events, complete, last_id = broker.get_events(broker.last_id, timeout=0.01)
+    assert events == []
+    assert complete
+    assert last_id == broker.last_id
+
+
+def test_get_events_dropped_from_buffer():
+    broker = EventBroker(buffer_size=2)
+    first = broker.publish("task_started", {"task_id": 1})
+    for task_id in range(2, 5):
+        broker.publish("task_started", {"task_id": task_id})
+
+    events, complete, _ = broker.get_events(first.id)
+    assert not complete
+    assert [e.data["task_id"] for e in events] == [3, 4]
+
+
+def test_get_events_from_before_restart():
+    broker = EventBroker(buffer_size=10)
+    events, complete, last_id = broker.get_events(broker.last_id - 100)
+    assert events == []
+    assert not complete
+    assert last_id == broker.last_id
+
+
+def test_aget_events_waits_for_event():
+    broker = EventBroker(buffer_size=10)
+    last_id = broker.last_id
+
+    async def wait_for_event():
+        loop = asyncio.get_running_loop()
+        loop.call_later(0.05, broker.publish, "task_finished", {})
+        return await broker.aget_events(last_id, timeout=5)
+
+    events, complete, _ = asyncio.run(wait_for_event())
+    assert [e.type for e in events] == ["task_finished"]
+    assert complete
+
+
+def test_aget_events_timeout():
+    broker = EventBroker(buffer_size=10)
+    events, complete, last_id = asyncio.run(
+        broker.aget_events(broker.last_id, timeout=0.01)
+    )
+    assert events == []
+    assert complete
+
+
+def test_wait_for_task_checks_when_entry_task_finishes():
+    done = threading.Event()
+    checks = []
+
+    def is_done():
+        checks.append(1)
+        return done.is_set()
+
+    def finish():
+        events.publish(events.TASK_FINISHED, {"schedule_entry": "other"})
+        done.set()
+        events.publish(events.TASK_FINISHED, {"schedule_entry": "test"})
+
+    timer = threading.Timer(0.05, finish)
+    timer.start()
+    assert events.wait_for_task("test", is_done, timeout=5)
+    timer.join()
+    assert len(checks) == 2
+
+
+def test_wait_for_task_timeout():
+    assert not events.wait_for_task("test", lambda: False, timeout=0.01)
@@ -0,0 +1,56 @@
+import json
+
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+import events
+from schedule.tests.utils import TEST_SCHEDULE_ENTRY, post_schedule
+from sensor import V1
+from sensor.tests.utils import HTTPS_KWARG
+
+
+def parse_events(response):
+    content = b"".join(response.streaming_content).decode()
+    parsed = []
+    for block in content.split("\n\n"):
+        fields = dict(
+            line.split(": ", 1) for line in block.splitlines() if ": " in line
+        )
+        if "event" in fields:
+            parsed.append((fields["event"], json.loads(fields["data"])))
+    return parsed
+
+
+def test_events_require_authentication(client):
+    url = reverse("events", kwargs=V1)
+    response = client.get(url, **HTTPS_KWARG)
+    assert response.status_code in (
+        status.HTTP_401_UNAUTHORIZED,
+        status.HTTP_403_FORBIDDEN,
+    )
+
+
+def test_events_resume_from_last_event_id(admin_client, settings):
+    settings.EVENTS_STREAM_TIMEOUT = 0.1
+    settings.EVENTS_KEEPALIVE_INTERVAL = 0.05
+    last_event_id = events.event_broker.last_id
+    post_schedule(admin_client, TEST_SCHEDULE_ENTRY)
+
+    url = reverse("events", kwargs=V1)
+    response = admin_client.get(
+        url, HTTP_LAST_EVENT_ID=str(last_event_id), **HTTPS_KWARG
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response["Content-Type"] == "text/event-stream"
+    assert (
+        events.SCHEDULE_ENTRY_CREATED,
+        {"schedule_entry": "test", "is_active": True},
+    ) in parse_events(response)
+
+
+def test_events_unavailable_when_streams_limited(admin_client, settings):
+    settings.MAX_LONG_REQUESTS = 0
+    url = reverse("events", kwargs=V1)
+    response = admin_client.get(url, HTTP_ACCEPT="application/json", **HTTPS_KWARG)
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert "Retry-After" in response
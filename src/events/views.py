@@ -0,0 +1,131 @@
+import logging
+import time
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from rest_framework import status
+from rest_framework.decorators import api_view, renderer_classes
+from rest_framework.exceptions import ValidationError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from sensor.streaming import (
+    RETRY_AFTER,
+    SlotIterator,
+    is_asgi_request,
+    long_request_slots,
+)
+
+from . import event_broker
+from .renderers import EventStreamRenderer, format_event
+
+logger = logging.getLogger(__name__)
+
+
+def get_last_event_id(request):
+    """Return the id of the last event the client received, if any."""
+    last_event_id = request.headers.get(
+        "Last-Event-ID", request.query_params.get("last_event_id")
+    )
+    if last_event_id in (None, ""):
+        return None
+    try:
+        return int(last_event_id)
+    except ValueError:
+        raise ValidationError({"last_event_id": "Must be an integer."})
+
+
+def format_events(events, complete, last_event_id, last_id):
+    if not complete:
+        # events since the client's id are gone, so resume from the last event
+        yield format_event("missed", {"last_event_id": last_event_id}, last_id)
+    elif not events:
+        # keep proxies from closing an idle connection
+        yield ": keepalive\n\n"
+    for event in events:
+        yield format_event(event.type, event.data, event.id)
+
+
+def stream_events(last_event_id, timeout: float, keepalive: float):
+    """
+    Yield server-sent events until `timeout` seconds have passed.
+
+    If events after `last_event_id` are no longer buffered, a ``missed``
+    event is sent first so the client knows to refresh its state.
+    """
+    # tell EventSource clients how long to wait before reconnecting
+    yield "retry: 1000\n\n"
+    if last_event_id is None:
+        last_event_id = event_broker.last_id
+
+    deadline = time.monotonic() + timeout
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        events, complete, last_id = event_broker.get_events(
+            last_event_id, timeout=min(keepalive, remaining)
+        )
+        yield from format_events(events, complete, last_event_id, last_id)
+        last_event_id = max(last_event_id, last_id)
+
+
+async def astream_events(last_event_id, timeout: float, keepalive: float):
+    """Like :func:`stream_events`, but waits for events in the event loop."""
+    yield "retry: 1000\n\n"
+    if last_event_id is None:
+        last_event_id = event_broker.last_id
+
+    deadline = time.monotonic() + timeout
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        events, complete, last_id = await event_broker.aget_events(
+            last_event_id, timeout=min(keepalive, remaining)
+        )
+        for chunk in format_events(events, complete, last_event_id, last_id):
+            yield chunk
+        last_event_id = max(last_event_id, last_id)
+
+
+@api_view(("GET",))
+@renderer_classes((EventStreamRenderer, JSONRenderer))
+def events_view(request, version, format=None):
+    """
+    Stream task, acquisition and schedule events as server-sent events.
+
+    Event types are `task_started`, `task_finished`, `acquisition_created`,
+    `schedule_entry_created`, `schedule_entry_updated` and
+    `schedule_entry_deleted`. To resume after a disconnect, send the id of the
+    last event received in the `Last-Event-ID` header or the `last_event_id`
+    query parameter. A `missed` event is sent if events since then are no
+    longer available. Streams are closed after EVENTS_STREAM_TIMEOUT seconds.
+    Unless served over ASGI, at most MAX_LONG_REQUESTS streams and waiting
+    requests are open at once, and 503 Service Unavailable is returned when
+    the limit is reached.
+    """
+    last_event_id = get_last_event_id(request)
+    stream_args = (
+        last_event_id,
+        settings.EVENTS_STREAM_TIMEOUT,
+        settings.EVENTS_KEEPALIVE_INTERVAL,
+    )
+    if is_asgi_request(request):
+        # over ASGI, open streams wait in the event loop rather than in a thread
+        stream = astream_events(*stream_args)
+    elif long_request_slots.acquire():
+        stream = SlotIterator(stream_events(*stream_args))
+    else:
+        response = Response(
+            {"detail": "Too many open event streams, try again later."},
+            status=status.HTTP_503_SERVICE_UNAVAILABLE,
+        )
+        response["Retry-After"] = str(RETRY_AFTER)
+        return response
+
+    response = StreamingHttpResponse(stream, content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    # don't let nginx buffer events
+    response["X-Accel-Buffering"] = "no"
+    return response
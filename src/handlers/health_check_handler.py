@@ -8,7 +8,21 @@ logger = logging.getLogger(__name__)
 
 
 def trigger_api_restart_callback(sender, **kwargs):
+    """Recover the signal analyzer in-process, or restart the API container.
+
+    :return: ``True`` if the signal analyzer was recovered without a restart
+    """
+    import initialization
+    from initialization.recovery import recover_signal_analyzer
+
+    sensor_loader = initialization.sensor_loader
+    if sensor_loader is not None and recover_signal_analyzer(
+        sensor_loader.sensor, initialization.switches
+    ):
+        return True
+
     logger.warning("triggering API container restart")
     if settings.IN_DOCKER:
         Path(settings.SDR_HEALTHCHECK_FILE).touch()
-        sleep(60) # sleep to prevent running next task until restart completed
+        sleep(60)  # sleep to prevent running next task until restart completed
+    return False
@@ -1,13 +1,44 @@
+import hashlib
 import logging
+import threading
+from contextlib import contextmanager
 
-from cryptography.fernet import Fernet
 from django.conf import settings
 from django.core.files.base import ContentFile
+from django.db.models import Max
 
+import events
 from tasks.models import TaskResult
 
 logger = logging.getLogger(__name__)
 
+# the task group step running in this thread, see task_group_step
+group_step = threading.local()
+
+
+@contextmanager
+def task_group_step(index):
+    """Number the recordings of a task group step after earlier steps' ones.
+
+    Every step of a task group stores its data on the group's one task result,
+    so recordings stored by steps after the first are offset by the highest
+    recording id already stored for it.
+
+    """
+    group_step.index = index
+    group_step.offset = None
+    try:
+        yield
+    finally:
+        group_step.index = None
+
+
+def set_data_size_and_hash(acquisition, data):
+    """Record the size and hash of the data stored for an acquisition."""
+    view = memoryview(data).cast("B")
+    acquisition.data_size = view.nbytes
+    acquisition.data_sha256 = hashlib.sha256(view).hexdigest()
+
 
 def measurement_action_completed_callback(sender, **kwargs):
     from tasks.models import Acquisition
@@ -27,6 +58,12 @@ def measurement_action_completed_callback(sender, **kwargs):
         schedule_entry__name=schedule_entry_name, task_id=task_id
     )
 
+    if getattr(group_step, "index", None):
+        if group_step.offset is None:
+            stored = task_result.data.aggregate(Max("recording_id"))
+            group_step.offset = stored["recording_id__max"] or 0
+        recording_id = (recording_id or 1) + group_step.offset
+
     name = schedule_entry_name + "_" + str(task_result.task_id)
     if recording_id:
         name += "_" + str(recording_id)
@@ -42,6 +79,8 @@ def measurement_action_completed_callback(sender, **kwargs):
     if settings.ENCRYPT_DATA_FILES:
         if not settings.ENCRYPTION_KEY:
             raise Exception("No value set for ENCRYPTION_KEY!")
+        from cryptography.fernet import Fernet
+
         fernet = Fernet(settings.ENCRYPTION_KEY)
         _data = bytes(data)
         del data
@@ -49,11 +88,21 @@ def measurement_action_completed_callback(sender, **kwargs):
         assert "data" not in kwargs
         encrypted = fernet.encrypt(_data)
         del _data
-        acquisition.data.save(name, ContentFile(encrypted))
+        set_data_size_and_hash(acquisition, encrypted)
+        acquisition.data.save(name, ContentFile(encrypted), save=False)
         acquisition.data_encrypted = True
     else:
-        acquisition.data.save(name, ContentFile(data))
+        set_data_size_and_hash(acquisition, data)
+        acquisition.data.save(name, ContentFile(data), save=False)
         acquisition.data_encrypted = False
     acquisition.save()
 
     logger.debug(f"Saved new file at {acquisition.data.path}")
+    events.publish(
+        events.ACQUISITION_CREATED,
+        {
+            "schedule_entry": schedule_entry_name,
+            "task_id": task_id,
+            "recording_id": recording_id,
+        },
+    )
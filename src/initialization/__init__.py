@@ -3,25 +3,29 @@ import logging
 import time
 from os import path
 from pathlib import Path
-from typing import Optional, Union
+from typing import TYPE_CHECKING, Optional, Union
 
 from django.conf import settings
-from its_preselector.configuration_exception import ConfigurationException
-from its_preselector.controlbyweb_web_relay import ControlByWebWebRelay
-from its_preselector.preselector import Preselector
 from scos_actions.calibration.differential_calibration import DifferentialCalibration
 from scos_actions.calibration.sensor_calibration import SensorCalibration
 from scos_actions.hardware.utils import power_cycle_sigan
 from scos_actions.utils import load_from_json
 
+from sensor import startup_profile
 from utils.signals import register_component_with_status
 
 from .action_loader import ActionLoader
+from .calibration_cache import CalibrationWatcher, load_cached_calibration
 from .capabilities_loader import CapabilitiesLoader
-from .sensor_loader import SensorLoader
+from .component_loader import ComponentLoader
+from .recovery import attach_signal_analyzer, is_healthy, recover_signal_analyzer
+from .sensor_loader import SensorLoader, load_gps, load_signal_analyzer
 from .status_monitor import StatusMonitor
 from .utils import get_usb_device_exists, set_container_unhealthy
 
+if TYPE_CHECKING:
+    from its_preselector.preselector import Preselector
+
 logger = logging.getLogger(__name__)
 
 status_monitor = StatusMonitor()
@@ -33,6 +37,8 @@ def load_preselector_from_file(
     if preselector_config_file is None:
         return None
     else:
+        from its_preselector.configuration_exception import ConfigurationException
+
         try:
             preselector_config = load_from_json(preselector_config_file)
             return load_preselector(
@@ -50,7 +56,7 @@ def load_preselector(
     module: str,
     preselector_class_name: str,
     sensor_definition: dict,
-) -> Preselector:
+) -> "Preselector":
     logger.debug(
         f"loading {preselector_class_name} from {module} with config: {preselector_config}"
     )
@@ -70,6 +76,9 @@ def load_switches(switch_dir: Path) -> dict:
     switch_dict = {}
     try:
         if switch_dir is not None and switch_dir.is_dir():
+            from its_preselector.configuration_exception import ConfigurationException
+            from its_preselector.controlbyweb_web_relay import ControlByWebWebRelay
+
             for f in switch_dir.iterdir():
                 file_path = f.resolve()
                 logger.debug(f"loading switch config {file_path}")
@@ -119,12 +128,12 @@ def get_calibration(
             logger.error(f"{cal_file_path} does not exist, reverting to none.")
         else:
             logger.debug(f"Loading calibration file: {cal_file_path}")
-            # Create calibration object
+            # Create calibration object, from the cache if the file is unchanged
             cal_file_path = Path(cal_file_path)
             if cal_type.lower() in ["sensor", "onboard"]:
-                cal = SensorCalibration.from_json(cal_file_path)
+                cal = load_cached_calibration(SensorCalibration, cal_file_path)
             elif cal_type.lower() == "differential":
-                cal = DifferentialCalibration.from_json(cal_file_path)
+                cal = load_cached_calibration(DifferentialCalibration, cal_file_path)
             else:
                 logger.error(f"Unknown calibration type: {cal_type}")
                 raise ValueError
@@ -138,72 +147,169 @@ def get_calibration(
         return cal
 
 
+def apply_calibrations(sensor, onboard_cal, sensor_cal, differential_cal):
+    # Load the onboard cal file as the sensor calibration, if it exists
+    if onboard_cal is not None:
+        sensor.sensor_calibration = onboard_cal
+    else:
+        # Otherwise, try using the sensor calibration file
+        if sensor_cal is not None:
+            sensor.sensor_calibration = sensor_cal
+
+    # Now load the differential calibration, if it exists
+    sensor.differential_calibration = differential_cal
+
+
+def reload_calibrations() -> bool:
+    """
+    Load changed calibration files into the sensor.
+
+    :return: False if an existing calibration file couldn't be loaded, in
+        which case the sensor's calibrations are left unchanged.
+    """
+    calibrations = []
+    for cal_file_path, cal_type in (
+        (settings.ONBOARD_CALIBRATION_FILE, "sensor"),
+        (settings.SENSOR_CALIBRATION_FILE, "sensor"),
+        (settings.DIFFERENTIAL_CALIBRATION_FILE, "differential"),
+    ):
+        cal = get_calibration(cal_file_path, cal_type)
+        if cal is None and cal_file_path and path.exists(cal_file_path):
+            return False
+        calibrations.append(cal)
+
+    apply_calibrations(sensor_loader.sensor, *calibrations)
+    logger.info("Reloaded calibrations")
+    return True
+
+
 try:
     sensor_loader = None
     register_component_with_status.connect(status_registration_handler)
-    action_loader = ActionLoader()
+    with startup_profile.phase("actions"):
+        action_loader = ActionLoader()
     logger.debug(f"Actions ActionLoader has {len(action_loader.actions)} actions")
-    capabilities_loader = CapabilitiesLoader()
-    switches = load_switches(settings.SWITCH_CONFIGS_DIR)
-    preselector = load_preselector(
+    with startup_profile.phase("capabilities"):
+        capabilities_loader = CapabilitiesLoader()
+
+    # Hardware and calibration files are loaded concurrently, each within
+    # INIT_TIMEOUT seconds of starting. Slower components are attached once
+    # ready.
+    startup_profile.begin("sensor")
+    components = ComponentLoader(settings.INIT_TIMEOUT)
+    components.submit("switches", load_switches, settings.SWITCH_CONFIGS_DIR)
+    components.submit(
+        "preselector",
+        load_preselector,
         settings.PRESELECTOR_CONFIG,
         settings.PRESELECTOR_MODULE,
         settings.PRESELECTOR_CLASS,
         capabilities_loader.capabilities["sensor"],
     )
-
-    if get_usb_device_exists():
-        logger.debug("Initializing Sensor...")
-        sensor_loader = SensorLoader(
-            capabilities_loader.capabilities, switches, preselector
+    components.submit("gps", load_gps)
+    # caches lsusb output for creating the signal analyzer
+    components.submit("usb_device", get_usb_device_exists)
+    load_calibrations = not settings.RUNNING_MIGRATIONS and not settings.RUNNING_TESTS
+    if load_calibrations:
+        components.submit(
+            "onboard_calibration",
+            get_calibration,
+            settings.ONBOARD_CALIBRATION_FILE,
+            "sensor",
+        )
+        components.submit(
+            "sensor_calibration",
+            get_calibration,
+            settings.SENSOR_CALIBRATION_FILE,
+            "sensor",
         )
+        components.submit(
+            "differential_calibration",
+            get_calibration,
+            settings.DIFFERENTIAL_CALIBRATION_FILE,
+            "differential",
+        )
+
+    # The signal analyzer and sensor share this dict, so switches loaded late
+    # are still used to power cycle the signal analyzer
+    switches = {}
+    switches.update(components.get("switches", default={}))
+    components.when_ready("switches", switches.update)
+    preselector = components.get("preselector")
+    components.get("usb_device")
 
+    sigan = None
+    if not settings.RUNNING_MIGRATIONS:
+        # a missing or unhealthy signal analyzer is recovered below
+        components.submit(
+            "signal_analyzer", load_signal_analyzer, switches, register=False
+        )
+        sigan = components.get("signal_analyzer")
+        if sigan is not None:
+            register_component_with_status.send(sigan, component=sigan)
     else:
-        logger.debug("Power cycling sigan")
-        try:
-            power_cycle_sigan(switches)
-        except Exception as power_cycle_exception:
-            logger.error(f"Unable to power cycle sigan: {power_cycle_exception}")
-        set_container_unhealthy()
-        time.sleep(60)
+        logger.info("Running migrations. Not loading signal analyzer.")
+
+    logger.debug("Initializing Sensor...")
+    sensor_loader = SensorLoader(
+        capabilities_loader.capabilities,
+        switches,
+        preselector,
+        components.get("gps"),
+        sigan,
+    )
+    sensor = sensor_loader.sensor
+    components.when_ready("preselector", lambda p: setattr(sensor, "preselector", p))
+    components.when_ready("gps", lambda gps: setattr(sensor, "gps", gps))
+    components.when_ready(
+        "signal_analyzer", lambda late: attach_signal_analyzer(sensor, late)
+    )
+    startup_profile.end("sensor")
 
     if not settings.RUNNING_MIGRATIONS:
-        if (
-            sensor_loader.sensor.signal_analyzer is None
-            or not sensor_loader.sensor.signal_analyzer.healthy()
-        ):
-            try:
-                power_cycle_sigan(switches)
-            except Exception as power_cycle_exception:
-                logger.error(f"Unable to power cycle sigan: {power_cycle_exception}")
-            set_container_unhealthy()
-            time.sleep(60)
+        if not is_healthy(sensor_loader.sensor.signal_analyzer):
+            # The signal analyzer is missing or unhealthy, e.g. the USB device
+            # was not found. Try to bring it back before asking for a restart.
+            if not recover_signal_analyzer(sensor_loader.sensor, switches):
+                try:
+                    power_cycle_sigan(switches)
+                except Exception as power_cycle_exception:
+                    logger.error(
+                        f"Unable to power cycle sigan: {power_cycle_exception}"
+                    )
+                set_container_unhealthy()
+                time.sleep(60)
 
         # Calibration loading
-        if not settings.RUNNING_TESTS:
-            # Load the onboard cal file as the sensor calibration, if it exists
-            onboard_cal = get_calibration(settings.ONBOARD_CALIBRATION_FILE, "sensor")
-            if onboard_cal is not None:
-                sensor_loader.sensor.sensor_calibration = onboard_cal
-            else:
-                # Otherwise, try using the sensor calibration file
-                sensor_cal = get_calibration(settings.SENSOR_CALIBRATION_FILE, "sensor")
-                if sensor_cal is not None:
-                    sensor_loader.sensor.sensor_calibration = sensor_cal
-
-            # Now load the differential calibration, if it exists
-            differential_cal = get_calibration(
-                settings.DIFFERENTIAL_CALIBRATION_FILE,
-                "differential",
+        if load_calibrations:
+            with startup_profile.phase("calibration"):
+                apply_calibrations(
+                    sensor_loader.sensor,
+                    components.get("onboard_calibration"),
+                    components.get("sensor_calibration"),
+                    components.get("differential_calibration"),
+                )
+
+            # Calibration files changed after startup are loaded into the sensor
+            calibration_watcher = CalibrationWatcher(
+                [
+                    settings.ONBOARD_CALIBRATION_FILE,
+                    settings.SENSOR_CALIBRATION_FILE,
+                    settings.DIFFERENTIAL_CALIBRATION_FILE,
+                ],
+                reload_calibrations,
+                settings.CALIBRATION_WATCH_INTERVAL,
             )
-            sensor_loader.sensor.differential_calibration = differential_cal
+            calibration_watcher.start()
 
-        import ray
+        if settings.RAY_INIT:
+            import ray
 
-        if settings.RAY_INIT and not ray.is_initialized():
-            # Dashboard is only enabled if ray[default] is installed
-            logger.debug("Initializing ray.")
-            ray.init()
+            if not ray.is_initialized():
+                # Dashboard is only enabled if ray[default] is installed
+                logger.debug("Initializing ray.")
+                with startup_profile.phase("ray"):
+                    ray.init()
 except BaseException as error:
     logger.exception(f"Error during initialization: {error}")
     set_container_unhealthy()
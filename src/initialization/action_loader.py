@@ -1,17 +1,23 @@
 import importlib
-import json
 import logging
-import os
 import pkgutil
-import shutil
+import threading
+from collections.abc import MutableMapping
 
 from django.conf import settings
 from scos_actions.actions import action_classes
 from scos_actions.actions.interfaces.action import Action
 from scos_actions.discover import init, test_actions
 
+from .action_manifest import get_fingerprint, load_manifest, save_manifest
+from .driver_sync import COPIED, FAILED, MISSING, UNCHANGED, sync_driver_files
+
 logger = logging.getLogger(__name__)
 
+# Action sources besides plugin package names
+SCOS_ACTIONS = "scos_actions"
+YAML = "yaml"
+
 
 class ActionLoader:
     """
@@ -51,81 +57,188 @@ class ActionLoader:
         """
         return self._actions
 
+    def get_description(self, name: str) -> str:
+        """
+        Returns an action's description without importing it, if possible.
+        """
+        return self._actions.get_description(name)
+
+
+class LazyActions(MutableMapping):
+    """
+    Sensor actions by name, imported from their plugin on first use.
+
+    The names, sources and descriptions of all actions come from the action
+    manifest, so listing actions doesn't import any plugin.
+    """
+
+    def __init__(self, manifest: dict, mock_sigan: bool, action_dir: str, loaded=None):
+        self._plugins = manifest["plugins"]
+        self._sources = {}
+        self._descriptions = {}
+        for name, entry in manifest["actions"].items():
+            self._sources[name] = entry["source"]
+            self._descriptions[name] = entry.get("description")
+        self._mock_sigan = mock_sigan
+        self._action_dir = action_dir
+        self._loaded = dict(loaded or {})
+        self._loaded_sources = set()
+        if loaded is not None:
+            self._loaded_sources.update(self._sources.values())
+        self._lock = threading.RLock()
+
+    def __getitem__(self, name: str) -> Action:
+        with self._lock:
+            if name not in self._loaded:
+                self._load_source(self._sources[name])
+                if name not in self._loaded:
+                    logger.warning(f"{name} not found in {self._sources[name]}")
+                    raise KeyError(name)
+            return self._loaded[name]
+
+    def __setitem__(self, name: str, action: Action):
+        with self._lock:
+            self._loaded[name] = action
+            self._sources[name] = None
+            self._descriptions.pop(name, None)
+
+    def __delitem__(self, name: str):
+        with self._lock:
+            del self._sources[name]
+            self._loaded.pop(name, None)
+            self._descriptions.pop(name, None)
+
+    def __contains__(self, name) -> bool:
+        return name in self._sources
+
+    def __iter__(self):
+        return iter(list(self._sources))
+
+    def __len__(self) -> int:
+        return len(self._sources)
+
+    def get_description(self, name: str) -> str:
+        if name not in self._loaded and name in self._descriptions:
+            return self._descriptions[name]
+        return self[name].description
+
+    def _load_source(self, source: str):
+        if source is None or source in self._loaded_sources:
+            return
+
+        logger.debug(f"Loading actions from {source}")
+        if source == SCOS_ACTIONS:
+            actions = test_actions
+        elif source == YAML:
+            # YAML actions are built from the action classes of every plugin
+            for plugin in self._plugins:
+                self._load_source(plugin)
+            actions = load_yaml_actions(self._action_dir, self._mock_sigan)
+        else:
+            actions = load_plugin_actions(source, self._mock_sigan)
+
+        for name, action in actions.items():
+            if self._sources.get(name) == source:
+                self._loaded[name] = action
+        self._loaded_sources.add(source)
+
 
 def copy_driver_files(driver_dir: str):
-    """Copy driver files where they need to go"""
+    """Copy driver files where they need to go, skipping unchanged files"""
     logger.debug(f"Copying driver files in {driver_dir}")
-    for root, dirs, files in os.walk(driver_dir):
-        for filename in files:
-            name_without_ext, ext = os.path.splitext(filename)
-            if ext.lower() == ".json":
-                json_data = {}
-                file_path = os.path.join(root, filename)
-                with open(file_path) as json_file:
-                    json_data = json.load(json_file)
-                if type(json_data) == dict and "scos_files" in json_data:
-                    scos_files = json_data["scos_files"]
-                    for scos_file in scos_files:
-                        source_path = os.path.join(driver_dir, scos_file["source_path"])
-                        if not os.path.isfile(source_path):
-                            logger.error(f"Unable to find file at {source_path}")
-                            continue
-                        dest_path = scos_file["dest_path"]
-                        dest_dir = os.path.dirname(dest_path)
-                        try:
-                            if not os.path.isdir(dest_dir):
-                                os.makedirs(dest_dir)
-                            logger.debug(f"copying {source_path} to {dest_path}")
-                            shutil.copyfile(source_path, dest_path)
-                        except Exception as e:
-                            logger.error(f"Failed to copy {source_path} to {dest_path}")
-                            logger.error(e)
+    results = sync_driver_files(driver_dir)
+    for dest_path in results[COPIED]:
+        logger.info(f"Updated driver file {dest_path}")
+    logger.debug(
+        f"{len(results[COPIED])} driver files copied, "
+        f"{len(results[UNCHANGED])} unchanged, "
+        f"{len(results[FAILED]) + len(results[MISSING])} failed"
+    )
+    return results
 
 
-def load_actions(
-    mock_sigan: bool, running_tests: bool, driver_dir: str, action_dir: str
-):
-    logger.debug("********** Initializing actions **********")
-    copy_driver_files(driver_dir)  # copy driver files before loading plugins
-    discovered_plugins = {
-        name: importlib.import_module(name)
-        for finder, name, ispkg in pkgutil.iter_modules()
-        if name.startswith("scos_") and name != "scos_actions"
-    }
-    logger.debug(discovered_plugins)
+def load_plugin_actions(name: str, mock_sigan: bool) -> dict:
+    """Import a plugin's actions and register its action classes."""
+    module = importlib.import_module(name)
+    logger.debug("Looking for actions in " + name + ": " + str(module))
+    discover = importlib.import_module(name + ".discover")
     actions = {}
-    if running_tests:
-        logger.debug(f"Loading {len(test_actions)} test actions.")
-        actions.update(test_actions)
-    else:
-        # load scos-actions test_actions
-        if mock_sigan:
-            logger.debug(f"Loading {len(test_actions)} test actions.")
-            actions.update(test_actions)
-        # load other plugin actions
-        for name, module in discovered_plugins.items():
-            logger.debug("Looking for actions in " + name + ": " + str(module))
-            discover = importlib.import_module(name + ".discover")
-            if mock_sigan and hasattr(discover, "test_actions"):
-                logger.debug(f"loading {len(discover.test_actions)} test actions.")
-                actions.update(discover.test_actions)
-            elif hasattr(discover, "actions"):
-                logger.debug(f"loading {len(discover.actions)} actions.")
-                actions.update(discover.actions)
-            if (
-                hasattr(discover, "action_classes")
-                and discover.action_classes is not None
-            ):
-                action_classes.update(discover.action_classes)
-
-    # load scos-sensor configs/actions
+    if mock_sigan and hasattr(discover, "test_actions"):
+        logger.debug(f"loading {len(discover.test_actions)} test actions.")
+        actions = discover.test_actions
+    elif hasattr(discover, "actions"):
+        logger.debug(f"loading {len(discover.actions)} actions.")
+        actions = discover.actions
+    if hasattr(discover, "action_classes") and discover.action_classes is not None:
+        action_classes.update(discover.action_classes)
+    return actions
+
+
+def load_yaml_actions(action_dir: str, mock_sigan: bool) -> dict:
+    """Load scos-sensor configs/actions using the registered action classes."""
     logger.debug(f"Loading actions in {action_dir}")
     yaml_actions, yaml_test_actions = init(
         action_classes=action_classes, yaml_dir=action_dir
     )
-    if mock_sigan:
-        actions.update(yaml_test_actions)
-    else:
-        actions.update(yaml_actions)
+    return yaml_test_actions if mock_sigan else yaml_actions
+
+
+def discover_actions(mock_sigan: bool, running_tests: bool, action_dir: str):
+    """
+    Import every plugin and load all actions.
+
+    :return: the actions by name, and the manifest recording where each action
+        was loaded from
+    """
+    plugins = [
+        name
+        for finder, name, ispkg in pkgutil.iter_modules()
+        if name.startswith("scos_") and name != "scos_actions"
+    ]
+    logger.debug(plugins)
+    actions = {}
+    sources = {}
+
+    def add(source, new_actions):
+        actions.update(new_actions)
+        sources.update(dict.fromkeys(new_actions, source))
+
+    # load scos-actions test_actions
+    if running_tests or mock_sigan:
+        logger.debug(f"Loading {len(test_actions)} test actions.")
+        add(SCOS_ACTIONS, test_actions)
+    if running_tests:
+        plugins = []
+    # load other plugin actions
+    for name in plugins:
+        add(name, load_plugin_actions(name, mock_sigan))
+    add(YAML, load_yaml_actions(action_dir, mock_sigan))
+
+    manifest = {
+        "plugins": plugins,
+        "actions": {
+            name: {
+                "source": sources[name],
+                "description": getattr(action, "description", None),
+            }
+            for name, action in actions.items()
+        },
+    }
+    return actions, manifest
+
+
+def load_actions(
+    mock_sigan: bool, running_tests: bool, driver_dir: str, action_dir: str
+) -> LazyActions:
+    logger.debug("********** Initializing actions **********")
+    copy_driver_files(driver_dir)  # copy driver files before loading plugins
+    fingerprint = get_fingerprint(mock_sigan, running_tests, action_dir)
+    manifest = load_manifest(fingerprint)
+    if manifest is not None:
+        logger.debug("Using cached action manifest, actions are loaded on first use")
+        return LazyActions(manifest, mock_sigan, action_dir)
+
+    actions, manifest = discover_actions(mock_sigan, running_tests, action_dir)
+    save_manifest(fingerprint, manifest)
     logger.debug("Finished loading and registering actions")
-    return actions
+    return LazyActions(manifest, mock_sigan, action_dir, loaded=actions)
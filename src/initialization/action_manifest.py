@@ -0,0 +1,99 @@
+import hashlib
+import json
+import logging
+import os
+from importlib import metadata
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+YAML_EXTENSIONS = (".yml", ".yaml")
+
+
+def get_plugin_versions() -> dict:
+    """
+    Return the version of each installed scos distribution, by name.
+
+    Installing, removing or upgrading a plugin changes the result.
+    """
+    versions = {}
+    for dist in metadata.distributions():
+        name = (dist.metadata["Name"] or "").lower().replace("-", "_")
+        if name.startswith("scos_"):
+            versions[name] = dist.version
+    return dict(sorted(versions.items()))
+
+
+def get_yaml_hashes(action_dir: str) -> dict:
+    """Return the SHA-256 of each action configuration file, by relative path."""
+    hashes = {}
+    for root, dirs, files in os.walk(action_dir):
+        for filename in files:
+            if not filename.lower().endswith(YAML_EXTENSIONS):
+                continue
+            file_path = os.path.join(root, filename)
+            with open(file_path, "rb") as f:
+                digest = hashlib.sha256(f.read()).hexdigest()
+            hashes[os.path.relpath(file_path, action_dir)] = digest
+    return dict(sorted(hashes.items()))
+
+
+def get_fingerprint(mock_sigan: bool, running_tests: bool, action_dir: str) -> dict:
+    """Return everything that can change the discovered actions."""
+    return {
+        "version": MANIFEST_VERSION,
+        "mock_sigan": mock_sigan,
+        "running_tests": running_tests,
+        "plugins": get_plugin_versions(),
+        "yaml": get_yaml_hashes(action_dir),
+    }
+
+
+def load_manifest(fingerprint: dict, manifest_file: str = None):
+    """
+    Load the cached action manifest.
+
+    :return: a dict with the ``plugins`` to import and ``actions``, mapping
+        each action name to the ``source`` it is loaded from and its
+        ``description``, or ``None`` if there is no manifest or it was made for
+        a different fingerprint.
+    """
+    manifest_file = manifest_file or settings.ACTION_MANIFEST_FILE
+    if not manifest_file:
+        return None
+
+    try:
+        with open(manifest_file) as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as err:
+        logger.warning(f"Unable to load action manifest: {err}")
+        return None
+
+    if manifest.get("fingerprint") != fingerprint:
+        logger.info("Installed plugins or action configs changed, discovering actions")
+        return None
+
+    try:
+        return {"plugins": manifest["plugins"], "actions": manifest["actions"]}
+    except KeyError as err:
+        logger.warning(f"Ignoring malformed action manifest, missing {err}")
+        return None
+
+
+def save_manifest(fingerprint: dict, manifest: dict, manifest_file: str = None):
+    manifest_file = manifest_file or settings.ACTION_MANIFEST_FILE
+    if not manifest_file:
+        return
+
+    manifest = {"fingerprint": fingerprint, **manifest}
+    tmp_file = f"{manifest_file}.tmp"
+    try:
+        with open(tmp_file, "w") as f:
+            json.dump(manifest, f, indent=4)
+        os.replace(tmp_file, manifest_file)
+    except OSError as err:
+        logger.warning(f"Unable to save action manifest: {err}")
@@ -0,0 +1,135 @@
+"""Cache parsed calibration files and reload them when they change.
+
+Parsing a calibration JSON file gets slower as calibration points are added,
+so the parsed calibration is pickled to CALIBRATION_CACHE_DIR. The cache is
+used as long as the JSON file's size and modification time and the
+scos_actions version are unchanged, and is otherwise regenerated.
+
+:class:`CalibrationWatcher` polls the calibration files so that changes are
+loaded into the running sensor without restarting the API.
+
+"""
+
+import hashlib
+import logging
+import os
+import pickle
+import threading
+from pathlib import Path
+
+from django.conf import settings
+from scos_actions import __version__ as SCOS_ACTIONS_VERSION
+
+logger = logging.getLogger(__name__)
+
+CACHE_VERSION = 1
+
+
+def get_file_signature(file_path) -> tuple:
+    """Return the size and modification time of a file, or None if missing."""
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+def get_cache_path(cal_file_path, cache_dir: str) -> str:
+    digest = hashlib.sha256(str(Path(cal_file_path).resolve()).encode()).hexdigest()
+    return os.path.join(cache_dir, f"{Path(cal_file_path).stem}-{digest[:16]}.pickle")
+
+
+def load_cached_calibration(cal_class, cal_file_path, cache_dir: str = None):
+    """
+    Load a calibration file, using the cached calibration if it is current.
+
+    :param cal_class: the calibration class used to parse the JSON file
+    :param cal_file_path: path to the JSON calibration file
+    :param cache_dir: defaults to CALIBRATION_CACHE_DIR, no cache if empty
+    :return: the calibration object
+    """
+    cache_dir = settings.CALIBRATION_CACHE_DIR if cache_dir is None else cache_dir
+    if not cache_dir:
+        return cal_class.from_json(Path(cal_file_path))
+
+    key = (
+        CACHE_VERSION,
+        SCOS_ACTIONS_VERSION,
+        cal_class.__qualname__,
+        get_file_signature(cal_file_path),
+    )
+    cache_path = get_cache_path(cal_file_path, cache_dir)
+    try:
+        with open(cache_path, "rb") as f:
+            cached_key, calibration = pickle.load(f)
+        if cached_key == key:
+            logger.debug(f"Using cached calibration for {cal_file_path}")
+            return calibration
+    except FileNotFoundError:
+        pass
+    except Exception as err:
+        logger.warning(f"Ignoring calibration cache {cache_path}: {err}")
+
+    calibration = cal_class.from_json(Path(cal_file_path))
+    tmp_path = f"{cache_path}.tmp"
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            pickle.dump((key, calibration), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except Exception as err:
+        logger.warning(f"Unable to cache calibration {cal_file_path}: {err}")
+    return calibration
+
+
+class CalibrationWatcher:
+    """
+    Calls `reload` when any of the watched calibration files change.
+
+    Files are polled every `interval` seconds. If `reload` returns False, e.g.
+    because a file was read while being written, it is called again on the
+    next poll.
+    """
+
+    def __init__(self, file_paths: list, reload, interval: float):
+        self.file_paths = [f for f in file_paths if f]
+        self.reload = reload
+        self.interval = interval
+        self._signatures = self._get_signatures()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _get_signatures(self) -> dict:
+        return {f: get_file_signature(f) for f in self.file_paths}
+
+    def check(self) -> bool:
+        """Reload if a file changed, returning True if it was reloaded."""
+        signatures = self._get_signatures()
+        if signatures == self._signatures:
+            return False
+
+        changed = [f for f in self.file_paths if signatures[f] != self._signatures[f]]
+        logger.info(f"Calibration files changed: {', '.join(changed)}")
+        try:
+            reloaded = self.reload()
+        except Exception:
+            logger.exception("Unable to reload calibration")
+            reloaded = False
+        if reloaded is not False:
+            self._signatures = signatures
+        return reloaded is not False
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def start(self):
+        if self.interval <= 0 or not self.file_paths or self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="CalibrationWatcher", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
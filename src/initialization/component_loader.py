@@ -0,0 +1,92 @@
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+logger = logging.getLogger(__name__)
+
+
+class ComponentLoader:
+    """
+    Loads independent sensor components concurrently at startup.
+
+    Each component is loaded in its own thread and given `timeout` seconds
+    from when its loading started, so startup takes as long as the slowest
+    component rather than the sum of all of them, and a component never times
+    out waiting for a thread. A component that is not ready in time is
+    replaced by a default (degraded mode) and keeps loading in the background,
+    where callbacks registered with :meth:`when_ready` attach it once it is
+    ready.
+    """
+
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        self._futures = {}
+        self._started = {}
+        self._deadlines = {}
+        self._late = set()
+
+    def submit(self, name: str, fn, *args, **kwargs) -> None:
+        future = Future()
+        started = threading.Event()
+
+        def load():
+            self._deadlines[name] = time.monotonic() + self.timeout
+            started.set()
+            future.set_running_or_notify_cancel()
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except Exception as err:
+                future.set_exception(err)
+
+        self._futures[name] = future
+        self._started[name] = started
+        # daemon threads, so a hung component doesn't keep the process alive
+        threading.Thread(
+            target=load, name=f"ComponentLoader-{name}", daemon=True
+        ).start()
+
+    def get(self, name: str, default=None):
+        """
+        Wait for a component until its deadline.
+
+        :param name: the name the component was submitted as
+        :param default: returned if the component is not ready in time or
+            failed to load
+        :return: the component, or `default`
+        """
+        future = self._futures[name]
+        self._started[name].wait()
+        remaining = max(self._deadlines[name] - time.monotonic(), 0)
+        try:
+            return future.result(timeout=remaining)
+        except FutureTimeoutError:
+            logger.warning(
+                f"{name} not ready after {self.timeout} s, loading in background"
+            )
+            self._late.add(name)
+        except Exception:
+            logger.exception(f"Unable to load {name}")
+        return default
+
+    def when_ready(self, name: str, callback) -> None:
+        """
+        Call `callback` with a component that was not ready in :meth:`get`.
+
+        Does nothing for components that were ready in time or failed.
+        """
+        if name not in self._late:
+            return
+
+        def attach(future):
+            if future.exception() is not None:
+                logger.error(f"Unable to load {name}: {future.exception()}")
+                return
+            logger.info(f"{name} finished loading in the background")
+            try:
+                callback(future.result())
+            except Exception:
+                logger.exception(f"Unable to attach {name}")
+
+        self._futures[name].add_done_callback(attach)
@@ -0,0 +1,206 @@
+"""Copy driver files listed in the driver JSON files where they need to go.
+
+A manifest records the size, modification time and SHA-256 of each copied
+file, so unchanged files are skipped on later startups without being read.
+Files whose size or modification time changed are hashed, and only copied if
+their contents differ. Copies are made in parallel and written to a temporary
+file that replaces the destination, so a destination is never left partially
+written.
+
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+CHUNK_SIZE = 1024 * 1024
+
+# Sync results
+COPIED = "copied"
+UNCHANGED = "unchanged"
+FAILED = "failed"
+MISSING = "missing"
+
+
+def get_scos_files(driver_dir: str) -> list[tuple[str, str]]:
+    """Return the (source, destination) path of each file listed in driver_dir."""
+    scos_files = []
+    for root, dirs, files in os.walk(driver_dir):
+        for filename in files:
+            name_without_ext, ext = os.path.splitext(filename)
+            if ext.lower() != ".json":
+                continue
+            file_path = os.path.join(root, filename)
+            try:
+                with open(file_path) as json_file:
+                    json_data = json.load(json_file)
+            except (OSError, ValueError) as err:
+                logger.error(f"Unable to read {file_path}: {err}")
+                continue
+            if type(json_data) == dict and "scos_files" in json_data:
+                for scos_file in json_data["scos_files"]:
+                    source_path = os.path.join(driver_dir, scos_file["source_path"])
+                    scos_files.append((source_path, scos_file["dest_path"]))
+    return scos_files
+
+
+def get_file_hash(file_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def get_file_info(file_path: str, sha256: str = None) -> dict:
+    stat = os.stat(file_path)
+    return {
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": sha256 or get_file_hash(file_path),
+    }
+
+
+def same_stat(file_path: str, info: dict) -> bool:
+    """Return True if the file's size and modification time match `info`."""
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return False
+    return (
+        info is not None
+        and stat.st_size == info.get("size")
+        and stat.st_mtime_ns == info.get("mtime_ns")
+    )
+
+
+def copy_atomic(source_path: str, dest_path: str) -> None:
+    """Copy a file to a temporary file next to dest_path, then replace it."""
+    dest_dir = os.path.dirname(dest_path)
+    if dest_dir and not os.path.isdir(dest_dir):
+        os.makedirs(dest_dir, exist_ok=True)
+    tmp_path = f"{dest_path}.tmp"
+    try:
+        shutil.copyfile(source_path, tmp_path)
+        os.replace(tmp_path, dest_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def sync_file(source_path: str, dest_path: str, record: dict = None):
+    """
+    Copy one driver file if it changed.
+
+    :param record: the manifest entry from the last sync of dest_path
+    :return: the sync result and the new manifest entry
+    """
+    if not os.path.isfile(source_path):
+        logger.error(f"Unable to find file at {source_path}")
+        return MISSING, record
+
+    try:
+        if (
+            record is not None
+            and record.get("source_path") == source_path
+            and same_stat(source_path, record.get("source"))
+            and same_stat(dest_path, record.get("dest"))
+        ):
+            return UNCHANGED, record
+
+        source = get_file_info(source_path)
+        if os.path.isfile(dest_path):
+            if record is not None and same_stat(dest_path, record.get("dest")):
+                dest_hash = record["dest"]["sha256"]
+            else:
+                dest_hash = get_file_hash(dest_path)
+            if dest_hash == source["sha256"]:
+                dest = get_file_info(dest_path, sha256=dest_hash)
+                return UNCHANGED, {
+                    "source_path": source_path,
+                    "source": source,
+                    "dest": dest,
+                }
+
+        logger.debug(f"copying {source_path} to {dest_path}")
+        copy_atomic(source_path, dest_path)
+        dest = get_file_info(dest_path, sha256=source["sha256"])
+        return COPIED, {"source_path": source_path, "source": source, "dest": dest}
+    except Exception as e:
+        logger.error(f"Failed to copy {source_path} to {dest_path}")
+        logger.error(e)
+        return FAILED, None
+
+
+def load_manifest(manifest_file: str) -> dict:
+    if not manifest_file:
+        return {}
+    try:
+        with open(manifest_file) as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as err:
+        logger.warning(f"Unable to load driver manifest: {err}")
+        return {}
+    if manifest.get("version") != MANIFEST_VERSION:
+        return {}
+    return manifest.get("files", {})
+
+
+def save_manifest(manifest_file: str, files: dict) -> None:
+    if not manifest_file:
+        return
+    tmp_file = f"{manifest_file}.tmp"
+    try:
+        with open(tmp_file, "w") as f:
+            json.dump({"version": MANIFEST_VERSION, "files": files}, f, indent=4)
+        os.replace(tmp_file, manifest_file)
+    except OSError as err:
+        logger.warning(f"Unable to save driver manifest: {err}")
+
+
+def sync_driver_files(
+    driver_dir: str, manifest_file: str = None, max_workers: int = None
+) -> dict[str, list[str]]:
+    """
+    Copy the driver files that changed since the last sync.
+
+    :param driver_dir: the directory containing the driver JSON files
+    :param manifest_file: where file information is kept between syncs,
+        defaults to DRIVER_MANIFEST_FILE
+    :param max_workers: the maximum number of files copied at once
+    :return: the destination paths by sync result
+    """
+    if manifest_file is None:
+        manifest_file = settings.DRIVER_MANIFEST_FILE
+    records = load_manifest(manifest_file)
+    # the last listing of a destination wins, as when copied in order
+    scos_files = {dest: source for source, dest in get_scos_files(driver_dir)}
+
+    results = {COPIED: [], UNCHANGED: [], FAILED: [], MISSING: []}
+    files = {}
+    if scos_files:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                dest: executor.submit(sync_file, source, dest, records.get(dest))
+                for dest, source in scos_files.items()
+            }
+        for dest, future in futures.items():
+            result, record = future.result()
+            results[result].append(dest)
+            if record is not None:
+                files[dest] = record
+
+    if files != records:
+        save_manifest(manifest_file, files)
+    return results
@@ -0,0 +1,122 @@
+"""Recover the signal analyzer without restarting the API container.
+
+The signal analyzer is power cycled through the sensor's switches and then
+re-created, retrying with exponential backoff. Other threads keep running
+meanwhile, so the API stays available. Restarting the container is left as
+the fallback when recovery fails.
+
+"""
+
+import logging
+import threading
+import time
+
+from django.conf import settings
+from scos_actions.hardware.sensor import Sensor
+from scos_actions.hardware.utils import power_cycle_sigan
+
+from .sensor_loader import load_signal_analyzer
+from .status_monitor import StatusMonitor
+from .utils import clear_usb_devices_cache
+
+logger = logging.getLogger(__name__)
+
+_recovery_lock = threading.Lock()
+
+
+def is_healthy(sigan) -> bool:
+    if sigan is None:
+        return False
+    try:
+        return bool(sigan.healthy())
+    except Exception as err:
+        logger.warning(f"Signal analyzer health check failed: {err}")
+        return False
+
+
+def recover_signal_analyzer(
+    sensor: Sensor, switches: dict, attempts: int = None, sleep=time.sleep
+) -> bool:
+    """
+    Power cycle and re-create the signal analyzer until it is healthy.
+
+    The first attempt waits RECOVERY_BACKOFF seconds after power cycling,
+    doubling after each failed attempt up to RECOVERY_MAX_BACKOFF. If another
+    thread is already recovering, wait for it instead of starting over.
+
+    :param sensor: the sensor whose signal analyzer is replaced
+    :param switches: the switches used to power cycle the signal analyzer
+    :param attempts: the number of attempts, defaults to RECOVERY_ATTEMPTS
+    :param sleep: function used to wait between power cycling and reconnecting
+    :return: ``True`` if the sensor has a healthy signal analyzer
+    """
+    if not _recovery_lock.acquire(blocking=False):
+        logger.info("Waiting for signal analyzer recovery in progress")
+        with _recovery_lock:
+            return is_healthy(sensor.signal_analyzer)
+
+    try:
+        attempts = settings.RECOVERY_ATTEMPTS if attempts is None else attempts
+        delay = settings.RECOVERY_BACKOFF
+        # release the device so the new signal analyzer can connect to it
+        close_signal_analyzer(sensor.signal_analyzer)
+        for attempt in range(1, attempts + 1):
+            logger.warning(
+                f"Recovering signal analyzer, attempt {attempt} of {attempts}"
+            )
+            try:
+                power_cycle_sigan(switches)
+            except Exception as power_cycle_exception:
+                logger.error(f"Unable to power cycle sigan: {power_cycle_exception}")
+            sleep(delay)
+
+            clear_usb_devices_cache()
+            sigan = load_signal_analyzer(switches, register=False)
+            if is_healthy(sigan):
+                replace_signal_analyzer(sensor, sigan)
+                logger.info(f"Signal analyzer recovered after {attempt} attempts")
+                return True
+
+            close_signal_analyzer(sigan)
+            delay = min(delay * 2, settings.RECOVERY_MAX_BACKOFF)
+
+        logger.error(f"Unable to recover signal analyzer in {attempts} attempts")
+        return False
+    finally:
+        _recovery_lock.release()
+
+
+def attach_signal_analyzer(sensor: Sensor, sigan) -> None:
+    """
+    Use a signal analyzer that finished loading after INIT_TIMEOUT.
+
+    It replaces the sensor's signal analyzer unless that one is healthy, e.g.
+    because it was recovered meanwhile, in which case it is closed instead.
+    """
+    with _recovery_lock:
+        if is_healthy(sensor.signal_analyzer) or not is_healthy(sigan):
+            close_signal_analyzer(sigan)
+            return
+
+        replace_signal_analyzer(sensor, sigan)
+        logger.info("Attached signal analyzer loaded in the background")
+
+
+def close_signal_analyzer(sigan) -> None:
+    """Close the signal analyzer's connection if it can be closed."""
+    close = getattr(sigan, "close", None)
+    if close is None:
+        return
+    try:
+        close()
+    except Exception as err:
+        logger.warning(f"Unable to close signal analyzer: {err}")
+
+
+def replace_signal_analyzer(sensor: Sensor, sigan) -> None:
+    """Swap the sensor's signal analyzer and report the new one's status."""
+    status_monitor = StatusMonitor()
+    if sensor.signal_analyzer is not None:
+        status_monitor.remove_component(sensor.signal_analyzer)
+    sensor.signal_analyzer = sigan
+    status_monitor.add_component(sigan)
@@ -1,15 +1,18 @@
 import importlib
 import logging
+from typing import TYPE_CHECKING
 
 from django.conf import settings
 from environs import Env
-from its_preselector.preselector import Preselector
 from scos_actions.hardware.sensor import Sensor
 from scos_actions.metadata.utils import construct_geojson_point
 
 from utils.signals import register_component_with_status
 
-from .utils import get_usb_device_exists, set_container_unhealthy
+from .utils import get_usb_device_exists
+
+if TYPE_CHECKING:
+    from its_preselector.preselector import Preselector
 
 logger = logging.getLogger(__name__)
 env = Env()
@@ -19,16 +22,28 @@ class SensorLoader:
     _instance = None
 
     def __init__(
-        self, sensor_capabilities: dict, switches: dict, preselector: Preselector
+        self,
+        sensor_capabilities: dict,
+        switches: dict,
+        preselector: "Preselector",
+        gps=None,
+        signal_analyzer=None,
     ):
         if not hasattr(self, "sensor"):
             logger.debug("Sensor has not been loaded. Loading...")
-            self._sensor = load_sensor(sensor_capabilities, switches, preselector)
+            self._sensor = load_sensor(
+                sensor_capabilities, switches, preselector, gps, signal_analyzer
+            )
         else:
             logger.debug("Already loaded sensor. ")
 
     def __new__(
-        cls, sensor_capabilities: dict, switches: dict, preselector: Preselector
+        cls,
+        sensor_capabilities: dict,
+        switches: dict,
+        preselector: "Preselector",
+        gps=None,
+        signal_analyzer=None,
     ):
         if cls._instance is None:
             logger.debug("Creating the SensorLoader")
@@ -41,7 +56,11 @@ class SensorLoader:
 
 
 def load_sensor(
-    sensor_capabilities: dict, switches: dict, preselector: Preselector
+    sensor_capabilities: dict,
+    switches: dict,
+    preselector: "Preselector",
+    gps=None,
+    sigan=None,
 ) -> Sensor:
     location = None
     if not settings.RUNNING_TESTS:
@@ -56,28 +75,24 @@ def load_sensor(
                 sensor_loc["z"] if "z" in sensor_loc else None,
             )
 
-    sigan = None
-    gps = None
-    try:
-        if not settings.RUNNING_MIGRATIONS:
-            if get_usb_device_exists():
-                check_for_required_sigan_settings()
-                sigan_module_setting = settings.SIGAN_MODULE
-                sigan_module = importlib.import_module(sigan_module_setting)
-                logger.info(
-                    f"Creating {settings.SIGAN_CLASS} from {settings.SIGAN_MODULE}"
-                )
-                sigan_constructor = getattr(sigan_module, settings.SIGAN_CLASS)
-                sigan = sigan_constructor(switches=switches)
-                register_component_with_status.send(sigan, component=sigan)
-            else:
-                logger.warning("Required USB Device does not exist.")
-        else:
-            logger.info("Running migrations. Not loading signal analyzer.")
-    except BaseException as ex:
-        logger.warning(f"unable to create signal analyzer: {ex}")
-        set_container_unhealthy()
+    # Create sensor before handling calibrations
+    sensor = Sensor(
+        signal_analyzer=sigan,
+        # TODO GPS Not Implemented
+        capabilities=sensor_capabilities,
+        preselector=preselector,
+        switches=switches,
+        location=location,
+        gps=gps,
+        sensor_cal=None,
+        differential_cal=None,
+    )
+    return sensor
+
 
+def load_gps():
+    """Create the GPS configured by GPS_MODULE and GPS_CLASS, if any."""
+    gps = None
     try:
         if settings.GPS_MODULE and settings.GPS_CLASS:
             gps_module_setting = settings.GPS_MODULE
@@ -91,20 +106,33 @@ def load_sensor(
             logger.info("GPS_MODULE and/or GPS_CLASS not specified. Not loading GPS.")
     except BaseException as ex:
         logger.warning(f"unable to create GPS: {ex}")
+    return gps
 
-    # Create sensor before handling calibrations
-    sensor = Sensor(
-        signal_analyzer=sigan,
-        # TODO GPS Not Implemented
-        capabilities=sensor_capabilities,
-        preselector=preselector,
-        switches=switches,
-        location=location,
-        gps=gps,
-        sensor_cal=None,
-        differential_cal=None,
-    )
-    return sensor
+
+def load_signal_analyzer(switches: dict, register: bool = True):
+    """Create the signal analyzer configured by SIGAN_MODULE and SIGAN_CLASS.
+
+    :param switches: the switches used to control the signal analyzer
+    :param register: register the signal analyzer to report its status
+    :return: the signal analyzer, or ``None`` if it could not be created
+    """
+    try:
+        if not get_usb_device_exists():
+            logger.warning("Required USB Device does not exist.")
+            return None
+
+        check_for_required_sigan_settings()
+        sigan_module = importlib.import_module(settings.SIGAN_MODULE)
+        logger.info(f"Creating {settings.SIGAN_CLASS} from {settings.SIGAN_MODULE}")
+        sigan_constructor = getattr(sigan_module, settings.SIGAN_CLASS)
+        sigan = sigan_constructor(switches=switches)
+    except BaseException as ex:
+        logger.warning(f"unable to create signal analyzer: {ex}")
+        return None
+
+    if register:
+        register_component_with_status.send(sigan, component=sigan)
+    return sigan
 
 
 def check_for_required_sigan_settings():
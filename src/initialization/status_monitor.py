@@ -40,3 +40,14 @@ class StatusMonitor:
                 "Provided component has no `get_status` method and was not registered"
                 + f" with the status monitor: {component}"
             )
+
+    def remove_component(self, component):
+        """
+        Stop reporting the status of a component, e.g. one that was replaced.
+
+        :param component: the object to remove from the list of status providing
+            objects.
+        """
+        self._status_components = [
+            c for c in self._status_components if c is not component
+        ]
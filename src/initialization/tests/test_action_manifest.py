@@ -0,0 +1,74 @@
+from types import SimpleNamespace
+
+from initialization import action_loader as loader_module
+from initialization.action_loader import YAML, LazyActions
+from initialization.action_manifest import get_fingerprint, load_manifest, save_manifest
+
+MANIFEST = {
+    "plugins": ["scos_plugin"],
+    "actions": {
+        "plugin_action": {"source": "scos_plugin", "description": "From plugin"},
+        "yaml_action": {"source": YAML, "description": "From yaml\nMore details"},
+    },
+}
+
+
+def test_fingerprint_changes_with_action_configs(tmp_path):
+    action_file = tmp_path / "action.yml"
+    action_file.write_text("action: {}\n")
+    fingerprint = get_fingerprint(False, False, str(tmp_path))
+    assert get_fingerprint(False, False, str(tmp_path)) == fingerprint
+
+    action_file.write_text("action: {frequency: 1}\n")
+    assert get_fingerprint(False, False, str(tmp_path)) != fingerprint
+    assert get_fingerprint(True, False, str(tmp_path)) != fingerprint
+
+
+def test_manifest_round_trip(tmp_path):
+    manifest_file = str(tmp_path / "manifest.json")
+    fingerprint = get_fingerprint(False, False, str(tmp_path))
+    save_manifest(fingerprint, MANIFEST, manifest_file)
+    assert load_manifest(fingerprint, manifest_file) == MANIFEST
+
+    changed = {**fingerprint, "yaml": {"new.yml": "abc"}}
+    assert load_manifest(changed, manifest_file) is None
+
+
+def test_actions_loaded_on_first_use(monkeypatch):
+    loaded = []
+
+    def load_plugin_actions(name, mock_sigan):
+        loaded.append(name)
+        return {"plugin_action": SimpleNamespace(description="From plugin")}
+
+    def load_yaml_actions(action_dir, mock_sigan):
+        loaded.append(YAML)
+        return {"yaml_action": SimpleNamespace(description="From yaml")}
+
+    monkeypatch.setattr(loader_module, "load_plugin_actions", load_plugin_actions)
+    monkeypatch.setattr(loader_module, "load_yaml_actions", load_yaml_actions)
+    actions = LazyActions(MANIFEST, mock_sigan=False, action_dir="")
+
+    assert set(actions) == {"plugin_action", "yaml_action"}
+    assert "yaml_action" in actions
+    assert actions.get_description("yaml_action").startswith("From yaml")
+    assert loaded == []
+
+    # yaml actions need the action classes registered by each plugin
+    assert actions["yaml_action"].description == "From yaml"
+    assert loaded == ["scos_plugin", YAML]
+    assert actions["plugin_action"].description == "From plugin"
+    assert loaded == ["scos_plugin", YAML]
+
+
+def test_assigned_actions_are_not_loaded(monkeypatch):
+    monkeypatch.setattr(loader_module, "load_plugin_actions", None)
+    actions = LazyActions(MANIFEST, mock_sigan=False, action_dir="")
+    action = SimpleNamespace(description="Assigned")
+    actions["plugin_action"] = action
+    assert actions["plugin_action"] is action
+    assert actions.get_description("plugin_action") == "Assigned"
+
+    del actions["plugin_action"]
+    assert "plugin_action" not in actions
+    assert len(actions) == 1
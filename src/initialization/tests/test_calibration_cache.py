@@ -0,0 +1,66 @@
+import json
+import os
+
+from initialization.calibration_cache import CalibrationWatcher, load_cached_calibration
+
+
+class FakeCalibration:
+    parsed = 0
+
+    def __init__(self, data):
+        self.data = data
+
+    @classmethod
+    def from_json(cls, file_path):
+        cls.parsed += 1
+        with open(file_path) as f:
+            return cls(json.load(f))
+
+
+def write_json(file_path, data, mtime_ns=None):
+    file_path.write_text(json.dumps(data))
+    if mtime_ns is not None:
+        os.utime(file_path, ns=(mtime_ns, mtime_ns))
+
+
+def test_cached_calibration_regenerated_when_file_changes(tmp_path):
+    cal_file = tmp_path / "sensor_calibration.json"
+    cache_dir = str(tmp_path / "cache")
+    write_json(cal_file, {"gain": 1}, mtime_ns=1_000_000_000)
+    FakeCalibration.parsed = 0
+
+    assert load_cached_calibration(FakeCalibration, cal_file, cache_dir).data == {
+        "gain": 1
+    }
+    assert load_cached_calibration(FakeCalibration, cal_file, cache_dir).data == {
+        "gain": 1
+    }
+    assert FakeCalibration.parsed == 1
+
+    write_json(cal_file, {"gain": 2}, mtime_ns=2_000_000_000)
+    assert load_cached_calibration(FakeCalibration, cal_file, cache_dir).data == {
+        "gain": 2
+    }
+    assert FakeCalibration.parsed == 2
+
+
+def test_watcher_reloads_changed_files(tmp_path):
+    cal_file = tmp_path / "sensor_calibration.json"
+    write_json(cal_file, {"gain": 1}, mtime_ns=1_000_000_000)
+    results = [False, True]
+    reloads = []
+
+    def reload():
+        reloads.append(1)
+        return results.pop(0)
+
+    watcher = CalibrationWatcher([str(cal_file), None], reload, interval=1)
+    assert not watcher.check()
+    assert reloads == []
+
+    write_json(cal_file, {"gain": 2}, mtime_ns=2_000_000_000)
+    # retried after a failed reload, then not reloaded until changed again
+    assert not watcher.check()
+    assert watcher.check()
+    assert not watcher.check()
+    assert len(reloads) == 2
@@ -0,0 +1,59 @@
+import threading
+
+from initialization.component_loader import ComponentLoader
+
+
+def wait_for(event, value):
+    """Return `value` after waiting on an event or barrier."""
+    event.wait(5)
+    return value
+
+
+def test_components_load_concurrently():
+    barrier = threading.Barrier(2, timeout=5)
+    loader = ComponentLoader(timeout=5)
+    # would time out waiting on each other if loaded one at a time
+    loader.submit("a", wait_for, barrier, "a")
+    loader.submit("b", wait_for, barrier, "b")
+    assert loader.get("a") == "a"
+    assert loader.get("b") == "b"
+
+
+def test_slow_component_attached_when_ready():
+    release = threading.Event()
+    attached = threading.Event()
+    components = {}
+
+    def attach(component):
+        components["slow"] = component
+        attached.set()
+
+    loader = ComponentLoader(timeout=0.01)
+    loader.submit("slow", wait_for, release, "slow")
+    assert loader.get("slow", default="degraded") == "degraded"
+    loader.when_ready("slow", attach)
+    release.set()
+    assert attached.wait(5)
+    assert components == {"slow": "slow"}
+
+
+def test_failed_component_uses_default():
+    def fail():
+        raise RuntimeError("unreachable")
+
+    attached = []
+    loader = ComponentLoader(timeout=5)
+    loader.submit("failing", fail)
+    assert loader.get("failing", default={}) == {}
+    loader.when_ready("failing", attached.append)
+    assert attached == []
+
+
+def test_every_component_starts_at_once():
+    # more components than a default sized thread pool runs at once
+    count = 32
+    barrier = threading.Barrier(count, timeout=5)
+    loader = ComponentLoader(timeout=5)
+    for i in range(count):
+        loader.submit(str(i), wait_for, barrier, i)
+    assert [loader.get(str(i)) for i in range(count)] == list(range(count))
@@ -0,0 +1,64 @@
+import json
+import os
+
+from initialization.driver_sync import COPIED, MISSING, UNCHANGED, sync_driver_files
+
+
+def write_driver(driver_dir, dest_dir, names):
+    scos_files = [
+        {"source_path": name, "dest_path": str(dest_dir / name)} for name in names
+    ]
+    (driver_dir / "driver.json").write_text(json.dumps({"scos_files": scos_files}))
+
+
+def test_only_changed_files_copied(tmp_path):
+    driver_dir = tmp_path / "drivers"
+    dest_dir = tmp_path / "dest"
+    driver_dir.mkdir()
+    manifest_file = str(tmp_path / "manifest.json")
+    (driver_dir / "a.bin").write_bytes(b"a")
+    (driver_dir / "b.bin").write_bytes(b"b")
+    write_driver(driver_dir, dest_dir, ["a.bin", "b.bin", "missing.bin"])
+
+    results = sync_driver_files(str(driver_dir), manifest_file)
+    assert sorted(results[COPIED]) == [str(dest_dir / "a.bin"), str(dest_dir / "b.bin")]
+    assert results[MISSING] == [str(dest_dir / "missing.bin")]
+    assert (dest_dir / "a.bin").read_bytes() == b"a"
+
+    results = sync_driver_files(str(driver_dir), manifest_file)
+    assert results[COPIED] == []
+    assert len(results[UNCHANGED]) == 2
+
+    (driver_dir / "b.bin").write_bytes(b"new firmware")
+    results = sync_driver_files(str(driver_dir), manifest_file)
+    assert results[COPIED] == [str(dest_dir / "b.bin")]
+    assert (dest_dir / "b.bin").read_bytes() == b"new firmware"
+    assert not os.path.exists(str(dest_dir / "b.bin.tmp"))
+
+
+def test_changed_destination_restored(tmp_path):
+    driver_dir = tmp_path / "drivers"
+    dest_dir = tmp_path / "dest"
+    driver_dir.mkdir()
+    manifest_file = str(tmp_path / "manifest.json")
+    (driver_dir / "a.bin").write_bytes(b"a")
+    write_driver(driver_dir, dest_dir, ["a.bin"])
+    sync_driver_files(str(driver_dir), manifest_file)
+
+    (dest_dir / "a.bin").write_bytes(b"modified")
+    results = sync_driver_files(str(driver_dir), manifest_file)
+    assert results[COPIED] == [str(dest_dir / "a.bin")]
+    assert (dest_dir / "a.bin").read_bytes() == b"a"
+
+
+def test_identical_files_not_copied_without_manifest(tmp_path):
+    driver_dir = tmp_path / "drivers"
+    dest_dir = tmp_path / "dest"
+    driver_dir.mkdir()
+    dest_dir.mkdir()
+    (driver_dir / "a.bin").write_bytes(b"a")
+    (dest_dir / "a.bin").write_bytes(b"a")
+    write_driver(driver_dir, dest_dir, ["a.bin"])
+
+    results = sync_driver_files(str(driver_dir), manifest_file="")
+    assert results[UNCHANGED] == [str(dest_dir / "a.bin")]
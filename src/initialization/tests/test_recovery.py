@@ -0,0 +1,83 @@
+from initialization import recovery
+from initialization.status_monitor import StatusMonitor
+
+
+class FakeSigan:
+    def __init__(self, healthy=True):
+        self._healthy = healthy
+        self.closed = False
+
+    def healthy(self):
+        return self._healthy
+
+    def get_status(self):
+        return {"healthy": self._healthy}
+
+    def close(self):
+        self.closed = True
+
+
+class FakeSensor:
+    def __init__(self, signal_analyzer):
+        self.signal_analyzer = signal_analyzer
+
+
+def patch_hardware(monkeypatch, sigans):
+    """Power cycle nothing and create each of `sigans` in turn."""
+    power_cycles = []
+    monkeypatch.setattr(recovery, "power_cycle_sigan", power_cycles.append)
+    sigans = iter(sigans)
+    monkeypatch.setattr(
+        recovery, "load_signal_analyzer", lambda switches, register: next(sigans)
+    )
+    return power_cycles
+
+
+def test_recovery_retries_with_backoff(monkeypatch, settings):
+    settings.RECOVERY_BACKOFF = 5
+    settings.RECOVERY_MAX_BACKOFF = 60
+    switches = {"switch": object()}
+    power_cycles = patch_hardware(monkeypatch, [None, FakeSigan()])
+    old_sigan = FakeSigan(healthy=False)
+    StatusMonitor().add_component(old_sigan)
+    sensor = FakeSensor(old_sigan)
+    delays = []
+    assert recovery.recover_signal_analyzer(sensor, switches, 3, sleep=delays.append)
+    assert delays == [5, 10]
+    assert power_cycles == [switches, switches]
+    assert sensor.signal_analyzer is not old_sigan
+    assert old_sigan.closed
+    assert not sensor.signal_analyzer.closed
+    assert sensor.signal_analyzer.healthy()
+    assert old_sigan not in StatusMonitor().status_components
+    assert sensor.signal_analyzer in StatusMonitor().status_components
+    StatusMonitor().remove_component(sensor.signal_analyzer)
+
+
+def test_recovery_gives_up(monkeypatch, settings):
+    settings.RECOVERY_BACKOFF = 20
+    settings.RECOVERY_MAX_BACKOFF = 30
+    new_sigans = [FakeSigan(healthy=False) for _ in range(3)]
+    patch_hardware(monkeypatch, new_sigans)
+    old_sigan = FakeSigan(healthy=False)
+    sensor = FakeSensor(old_sigan)
+    delays = []
+    assert not recovery.recover_signal_analyzer(sensor, {}, 3, sleep=delays.append)
+    assert delays == [20, 30, 30]
+    assert sensor.signal_analyzer is old_sigan
+    assert old_sigan.closed
+    assert all(sigan.closed for sigan in new_sigans)
+
+
+def test_late_signal_analyzer_attached_if_needed():
+    sensor = FakeSensor(None)
+    late_sigan = FakeSigan()
+    recovery.attach_signal_analyzer(sensor, late_sigan)
+    assert sensor.signal_analyzer is late_sigan
+    assert late_sigan in StatusMonitor().status_components
+
+    another_sigan = FakeSigan()
+    recovery.attach_signal_analyzer(sensor, another_sigan)
+    assert sensor.signal_analyzer is late_sigan
+    assert another_sigan.closed
+    StatusMonitor().remove_component(late_sigan)
@@ -1,5 +1,7 @@
 import logging
 import sys
+import threading
+import time
 from pathlib import Path
 from subprocess import check_output
 
@@ -7,6 +9,10 @@ from django.conf import settings
 
 logger = logging.getLogger(__name__)
 
+_usb_devices_lock = threading.Lock()
+_usb_devices = None
+_usb_devices_time = 0.0
+
 
 def set_container_unhealthy():
     if settings.IN_DOCKER:
@@ -14,10 +20,28 @@ def set_container_unhealthy():
         Path(settings.SDR_HEALTHCHECK_FILE).touch()
 
 
+def get_usb_devices() -> str:
+    """Return the output of `lsusb`, cached for USB_DEVICES_CACHE_TIMEOUT seconds."""
+    global _usb_devices, _usb_devices_time
+    with _usb_devices_lock:
+        age = time.monotonic() - _usb_devices_time
+        if _usb_devices is None or age > settings.USB_DEVICES_CACHE_TIMEOUT:
+            _usb_devices = check_output("lsusb", timeout=10).decode(sys.stdout.encoding)
+            _usb_devices_time = time.monotonic()
+        return _usb_devices
+
+
+def clear_usb_devices_cache():
+    """Forget the cached USB devices, e.g. after power cycling one."""
+    global _usb_devices
+    with _usb_devices_lock:
+        _usb_devices = None
+
+
 def get_usb_device_exists() -> bool:
     logger.debug("Checking for USB...")
     if not settings.MOCK_SIGAN and settings.USB_DEVICE is not None:
-        usb_devices = check_output("lsusb").decode(sys.stdout.encoding)
+        usb_devices = get_usb_devices()
         logger.debug("Checking for " + settings.USB_DEVICE)
         logger.debug("Found " + usb_devices)
         return settings.USB_DEVICE in usb_devices
@@ -5,6 +5,9 @@ import sys
 
 if __name__ == "__main__":
     os.environ.setdefault("DJANGO_SETTINGS_MODULE", "sensor.settings")
+    from sensor import startup_profile
+
+    startup_profile.start()
     try:
         from django.core.management import execute_from_command_line
     except ImportError:
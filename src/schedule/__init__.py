@@ -1,13 +1,12 @@
 import logging
 
 from initialization import action_loader
-from utils import get_summary
+from utils import summarize
 
 
 def get_action_with_summary(action):
     """Given an action, return the string 'action_name - summary'."""
-    action_fn = action_loader.actions[action]
-    summary = get_summary(action_fn)
+    summary = summarize(action_loader.get_description(action))
     action_with_summary = action
     if summary:
         action_with_summary += f" - {summary}"
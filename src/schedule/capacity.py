@@ -0,0 +1,187 @@
+"""Project sensor utilization from the schedule to admit or reject entries.
+
+Utilization is tracked per lane. When the scheduler runs one task at a time
+the whole sensor is a single lane, otherwise each exclusive resource (sigan,
+preselector, gps) is a lane and software-only actions don't count against
+capacity.
+
+"""
+
+import copy
+import logging
+
+from django.conf import settings
+
+from initialization import action_loader
+from scheduler import utils
+from scheduler.cost_model import DurationModel
+from scheduler.resources import get_action_resources
+
+from .models import ScheduleEntry
+from .models.schedule_entry import next_schedulable_timefn
+
+logger = logging.getLogger(__name__)
+
+SENSOR_LANE = "sensor"
+
+# Admission control modes, see SCHEDULE_ADMISSION_CONTROL
+ADMISSION_OFF = "off"
+ADMISSION_WARN = "warn"
+ADMISSION_REJECT = "reject"
+
+
+def get_lanes(action):
+    """Return the lanes a task of `action` occupies while it runs."""
+    if settings.SCHEDULER_MAX_WORKERS <= 1:
+        return (SENSOR_LANE,)
+
+    resources = get_action_resources(action, action_loader.actions.get(action))
+    return tuple(sorted(resources))
+
+
+def get_entry_lanes(entry):
+    """Return the lanes occupied by each task of `entry`."""
+    lanes = set()
+    for action in entry.get_actions():
+        lanes.update(get_lanes(action))
+
+    return tuple(sorted(lanes))
+
+
+def get_candidate_entry(validated_data, instance=None):
+    """Build an unsaved entry as it would be after applying `validated_data`."""
+    data = {k: v for k, v in validated_data.items() if k != "validate_only"}
+    relative_stop = data.pop("relative_stop", None)
+    if instance is None:
+        entry = ScheduleEntry(relative_stop=relative_stop, **data)
+    else:
+        entry = copy.copy(instance)
+        for field, value in data.items():
+            setattr(entry, field, value)
+        if relative_stop:
+            entry.stop = entry.start + relative_stop
+        # mirror ScheduleEntry.save
+        if entry.start != instance.start or entry.interval != instance.interval:
+            entry.next_task_time = max(entry.start, next_schedulable_timefn())
+        elif entry.is_active and not instance.is_active:
+            entry.next_task_time = max(entry.next_task_time, next_schedulable_timefn())
+
+    return entry
+
+
+def get_projected_schedule(candidate=None, exclude=None, candidates=()):
+    """Return active entries, with candidates added or replacing their namesakes.
+
+    :param candidate: an unsaved entry to add to the schedule
+    :param exclude: names of entries to leave out of the schedule
+    :param candidates: unsaved entries to add, e.g. from a bulk change
+
+    """
+    candidates = list(candidates)
+    if candidate is not None:
+        candidates.append(candidate)
+    exclude = set(exclude or ()) | {c.name for c in candidates}
+
+    entries = list(
+        ScheduleEntry.objects.filter(is_active=True).exclude(name__in=exclude)
+    )
+    entries.extend(c for c in candidates if c.is_active)
+
+    return entries
+
+
+def check_capacity(entries, duration_model=None):
+    """Report the steady-state utilization of each lane.
+
+    Recurring entries use ``estimated duration / interval`` of their lanes and
+    continuous entries use their duty cycle, or all of their lanes if it is
+    unlimited. One-shot entries do not contribute to steady-state utilization.
+
+    :return: a dict with per-entry and per-lane utilization and whether any
+        lane is over capacity
+
+    """
+    duration_model = duration_model or DurationModel()
+    lanes = {}
+    report_entries = []
+    for entry in entries:
+        if not (entry.interval or entry.continuous):
+            continue
+        if not entry.has_remaining_times():
+            continue
+
+        duration = duration_model.estimate_entry(entry)
+        if entry.continuous:
+            utilization = entry.duty_cycle or 1.0
+        else:
+            utilization = duration / entry.interval
+        entry_lanes = get_entry_lanes(entry)
+        for lane in entry_lanes:
+            lanes[lane] = lanes.get(lane, 0) + utilization
+        report_entries.append(
+            {
+                "name": entry.name,
+                "action": entry.action,
+                "interval": entry.interval,
+                "estimated_duration": round(duration, 3),
+                "utilization": round(utilization, 4),
+                "lanes": list(entry_lanes),
+            }
+        )
+
+    overloaded = sorted(lane for lane, u in lanes.items() if u > 1)
+    return {
+        "capacity_exceeded": bool(overloaded),
+        "overloaded_lanes": overloaded,
+        "utilization": {lane: round(u, 4) for lane, u in sorted(lanes.items())},
+        "entries": report_entries,
+    }
+
+
+def get_utilization_timeline(entries, horizon, bin_size, duration_model=None):
+    """Project the busy fraction of each lane over the next `horizon` seconds.
+
+    :param entries: the schedule entries to project
+    :param horizon: seconds from now to project
+    :param bin_size: seconds per timeline bin
+    :return: a list of ``{"start": timestamp, "utilization": {lane: fraction}}``
+
+    """
+    duration_model = duration_model or DurationModel()
+    now = utils.timefn()
+    until = now + horizon
+    nbins = -(-horizon // bin_size)  # ceil
+    busy = [{} for _ in range(nbins)]
+
+    for entry in entries:
+        if entry.continuous:
+            # remaining times are every second, each as busy as the duty cycle
+            duration = entry.duty_cycle or 1.0
+        else:
+            duration = duration_model.estimate_entry(entry)
+        entry_lanes = get_entry_lanes(entry)
+        for t in entry.get_remaining_times(until=until):
+            # spread the task over the bins it overlaps
+            task_start = max(t, now)
+            task_end = min(task_start + duration, until)
+            while task_start < task_end:
+                i = int((task_start - now) // bin_size)
+                bin_end = now + (i + 1) * bin_size
+                overlap_end = min(task_end, bin_end)
+                for lane in entry_lanes:
+                    busy[i][lane] = busy[i].get(lane, 0) + overlap_end - task_start
+                task_start = overlap_end
+
+    timeline = []
+    for i, lanes in enumerate(busy):
+        timeline.append(
+            {
+                "start": now + i * bin_size,
+                "utilization": {
+                    lane: round(seconds / bin_size, 4)
+                    for lane, seconds in sorted(lanes.items())
+                },
+            }
+        )
+
+    return timeline
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.17 on 2026-10-19 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("schedule", "0002_alter_scheduleentry_action"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="scheduleentry",
+            name="tolerance",
+            field=models.PositiveIntegerField(
+                blank=True,
+                help_text=(
+                    "Seconds a task may start after its scheduled time instead of "
+                    "being skipped, or leave blank to run only the most recent "
+                    "late task"
+                ),
+                null=True,
+            ),
+        ),
+    ]
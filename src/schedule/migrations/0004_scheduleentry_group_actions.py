@@ -0,0 +1,24 @@
+# Generated by Django 4.2.17 on 2026-10-19 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("schedule", "0003_scheduleentry_tolerance"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="scheduleentry",
+            name="group_actions",
+            field=models.JSONField(
+                blank=True,
+                default=list,
+                help_text=(
+                    "Actions to run back-to-back after `action` as part of each task"
+                ),
+            ),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 4.2.17 on 2026-10-19 12:00
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("schedule", "0004_scheduleentry_group_actions"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="scheduleentry",
+            name="continuous",
+            field=models.BooleanField(
+                default=False,
+                help_text=(
+                    "Run tasks back-to-back, starting each as soon as the previous "
+                    "one finishes (not valid with interval)"
+                ),
+            ),
+        ),
+        migrations.AddField(
+            model_name="scheduleentry",
+            name="duty_cycle",
+            field=models.FloatField(
+                blank=True,
+                help_text=(
+                    "Maximum fraction of time a continuous entry may keep the "
+                    "sensor busy, or leave blank for no limit"
+                ),
+                null=True,
+                validators=[
+                    django.core.validators.MinValueValidator(0.01),
+                    django.core.validators.MaxValueValidator(1),
+                ],
+            ),
+        ),
+    ]
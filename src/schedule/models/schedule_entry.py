@@ -1,5 +1,4 @@
 import logging
-import sys
 from itertools import count
 
 from django.core.validators import MaxValueValidator, MinValueValidator, ValidationError
@@ -14,9 +13,6 @@ logger.debug(
     "************** scos-sensor/schedule/models/schedule_entry.py *****************"
 )
 
-if sys.version_info.major == 2:
-    range = xrange  # noqa
-
 DEFAULT_PRIORITY = 10
 
 
@@ -37,7 +33,15 @@ class ScheduleEntry(models.Model):
     `interval=None` can be used with either an immediate or future start time.
     If two tasks are scheduled to run at the same time, they will be run in
     order of `priority`. If two tasks are scheduled to run at the same time and
-    have the same `priority`, execution order is undefined.
+    have the same `priority`, execution order is undefined. If the sensor is
+    busy when a task comes due, only the most recent late task is run unless
+    `tolerance` allows tasks to start up to that many seconds late.
+    `group_actions` turns each task into a group which runs `action` and then
+    each of the group actions back-to-back, holding the sensor throughout and
+    recording one task result with a result for each step.
+    A `continuous` entry has no interval; each task starts as soon as the
+    previous one finishes, optionally idling so that the entry keeps the
+    sensor busy at most `duty_cycle` of the time.
     """
 
     # Implementation notes:
@@ -78,6 +82,11 @@ class ScheduleEntry(models.Model):
         max_length=MAX_ACTION_LENGTH,
         help_text="[Required] The name of the action to be scheduled",
     )
+    group_actions = models.JSONField(
+        default=list,
+        blank=True,
+        help_text="Actions to run back-to-back after `action` as part of each task",
+    )
     priority = models.SmallIntegerField(
         default=DEFAULT_PRIORITY,
         validators=(MinValueValidator(-20), MaxValueValidator(19)),
@@ -101,6 +110,30 @@ class ScheduleEntry(models.Model):
         validators=(MinValueValidator(1),),
         help_text="Seconds between tasks, or leave blank to run once",
     )
+    continuous = models.BooleanField(
+        default=False,
+        help_text=(
+            "Run tasks back-to-back, starting each as soon as the previous one "
+            "finishes (not valid with interval)"
+        ),
+    )
+    duty_cycle = models.FloatField(
+        null=True,
+        blank=True,
+        validators=(MinValueValidator(0.01), MaxValueValidator(1)),
+        help_text=(
+            "Maximum fraction of time a continuous entry may keep the sensor "
+            "busy, or leave blank for no limit"
+        ),
+    )
+    tolerance = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        help_text=(
+            "Seconds a task may start after its scheduled time instead of "
+            "being skipped, or leave blank to run only the most recent late task"
+        ),
+    )
     is_active = models.BooleanField(
         default=True,
         editable=True,
@@ -166,8 +199,10 @@ class ScheduleEntry(models.Model):
         # used by .save to detect whether to reset .next_task_times
         self.__start = self.start
         self.__interval = self.interval
-        if self.action not in action_loader.actions:
-            raise ValidationError(self.action + " does not exist")
+        self.__is_active = self.is_active
+        for action in self.get_actions():
+            if action not in action_loader.actions:
+                raise ValidationError(action + " does not exist")
 
     def update(self, *args, **kwargs):
         super().update(*args, **kwargs)
@@ -177,6 +212,10 @@ class ScheduleEntry(models.Model):
             self.next_task_time = max(self.start, next_schedulable_timefn())
             self.__start = self.start
             self.__interval = self.interval
+        elif self.is_active and not self.__is_active:
+            # a reactivated entry doesn't catch up on times missed meanwhile
+            self.next_task_time = max(self.next_task_time, next_schedulable_timefn())
+        self.__is_active = self.is_active
 
         super().save(*args, **kwargs)
 
@@ -212,9 +251,12 @@ class ScheduleEntry(models.Model):
 
         next_time = self.next_task_time
         stop = self.stop
+        # continuous tasks start whenever the sensor is free, so any remaining
+        # second may see one
+        interval = 1 if self.continuous else self.interval
         if until is None and stop is None:
-            if self.interval:
-                return count(next_time, self.interval)  # infinite
+            if interval:
+                return count(next_time, interval)  # infinite
             else:
                 return iter(range(next_time, next_time + 1))  # one-shot
 
@@ -224,9 +266,31 @@ class ScheduleEntry(models.Model):
         if time_slice <= 0:
             return range(0)
 
-        interval = self.interval or time_slice
+        interval = interval or time_slice
         return range(next_time, stop, interval)
 
+    @property
+    def is_group(self):
+        return bool(self.group_actions)
+
+    def get_actions(self):
+        """Return the actions run by each task, in order."""
+        return [self.action, *(self.group_actions or ())]
+
+    def get_idle_time(self, busy_time):
+        """Return seconds to idle after a continuous task of `busy_time` seconds."""
+        if not self.duty_cycle or self.duty_cycle >= 1:
+            return 0
+
+        return busy_time * (1 - self.duty_cycle) / self.duty_cycle
+
+    def get_deadline(self, task_time):
+        """Return the latest time a task scheduled at `task_time` may start."""
+        if self.tolerance is None:
+            return None
+
+        return task_time + self.tolerance
+
     def get_next_task_id(self):
         next_task_id = self.next_task_id
         self.next_task_id += 1
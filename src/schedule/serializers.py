@@ -111,6 +111,11 @@ class ScheduleEntrySerializer(serializers.HyperlinkedModelSerializer):
         choices=CHOICES,
         help_text="[Required] The name of the action to be scheduled",
     )
+    group_actions = serializers.ListField(
+        child=serializers.ChoiceField(choices=CHOICES),
+        required=False,
+        help_text="Actions to run back-to-back after `action` as part of each task",
+    )
     # priority min_value is modified in schedule/views.py based on user
     priority = serializers.IntegerField(
         required=False,
@@ -139,11 +144,15 @@ class ScheduleEntrySerializer(serializers.HyperlinkedModelSerializer):
             "self",
             "name",
             "action",
+            "group_actions",
             "priority",
             "start",
             "stop",
             "relative_stop",
             "interval",
+            "continuous",
+            "duty_cycle",
+            "tolerance",
             "is_active",
             "callback_url",
             "next_task_time",
@@ -208,6 +217,20 @@ class ScheduleEntrySerializer(serializers.HyperlinkedModelSerializer):
                 err = "stop time is not after start"
                 raise serializers.ValidationError(err)
 
+        # a partial update is checked against the entry's current values
+        continuous, interval, duty_cycle = (
+            data[field] if field in data else getattr(self.instance, field, None)
+            for field in ("continuous", "interval", "duty_cycle")
+        )
+
+        if continuous and interval:
+            err = "interval is not valid with continuous"
+            raise serializers.ValidationError(err)
+
+        if duty_cycle is not None and not continuous:
+            err = "duty_cycle is only valid with continuous"
+            raise serializers.ValidationError(err)
+
         if "priority" in data and data["priority"] is None:
             data.pop("priority")
 
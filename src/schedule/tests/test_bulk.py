@@ -0,0 +1,119 @@
+import json
+
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from schedule.models import ScheduleEntry
+from schedule.tests.utils import (
+    TEST_ALTERNATE_SCHEDULE_ENTRY,
+    TEST_SCHEDULE_ENTRY,
+    post_schedule,
+)
+from scheduler import utils
+from sensor import V1
+from sensor.tests.utils import HTTPS_KWARG, validate_response
+
+
+def post_bulk(client, changes, expected_status=status.HTTP_200_OK):
+    url = reverse("schedule-bulk", kwargs=V1)
+    response = client.post(
+        url, data=json.dumps(changes), content_type="application/json", **HTTPS_KWARG
+    )
+    return validate_response(response, expected_status)
+
+
+def sweep_entries(n):
+    return [
+        {"name": f"sweep{i}", "action": "test_monitor_sigan", "interval": 3600}
+        for i in range(n)
+    ]
+
+
+def test_bulk_create(admin_client):
+    rjson = post_bulk(admin_client, {"create": sweep_entries(5)})
+    assert sorted(e["name"] for e in rjson["entries"]) == [
+        f"sweep{i}" for i in range(5)
+    ]
+    assert ScheduleEntry.objects.count() == 5
+    # all entries are created by a single request
+    assert ScheduleEntry.objects.values("request").distinct().count() == 1
+
+
+def test_bulk_invalid_entry_changes_nothing(admin_client):
+    post_schedule(admin_client, TEST_SCHEDULE_ENTRY)
+    entries = sweep_entries(3)
+    entries[1]["action"] = "doesnt_exist"
+    rjson = post_bulk(
+        admin_client,
+        {"create": entries, "delete": [TEST_SCHEDULE_ENTRY["name"]]},
+        status.HTTP_400_BAD_REQUEST,
+    )
+    assert list(rjson["create"]) == ["1"]
+    assert list(ScheduleEntry.objects.values_list("name", flat=True)) == ["test"]
+
+
+def test_bulk_entry_changed_once(admin_client):
+    post_schedule(admin_client, TEST_SCHEDULE_ENTRY)
+    name = TEST_SCHEDULE_ENTRY["name"]
+    rjson = post_bulk(
+        admin_client,
+        {"update": [{"name": name, "priority": 1}], "deactivate": [name]},
+        status.HTTP_400_BAD_REQUEST,
+    )
+    assert "update" in rjson and "deactivate" in rjson
+
+
+def test_bulk_update_delete_and_activate(admin_client):
+    post_schedule(admin_client, TEST_SCHEDULE_ENTRY)
+    post_schedule(admin_client, TEST_ALTERNATE_SCHEDULE_ENTRY)
+    post_bulk(admin_client, {"create": sweep_entries(1)})
+    post_bulk(admin_client, {"deactivate": ["sweep0"]})
+    assert not ScheduleEntry.objects.get(name="sweep0").is_active
+
+    rjson = post_bulk(
+        admin_client,
+        {
+            "update": [{"name": "test", "priority": 1}],
+            "delete": ["test_alternate"],
+            "activate": ["sweep0"],
+        },
+    )
+    assert rjson["deleted"] == ["test_alternate"]
+    assert ScheduleEntry.objects.get(name="test").priority == 1
+    assert ScheduleEntry.objects.get(name="sweep0").is_active
+    assert not ScheduleEntry.objects.filter(name="test_alternate").exists()
+
+
+def test_bulk_validate_only(admin_client):
+    post_bulk(
+        admin_client,
+        {"create": sweep_entries(2), "validate_only": True},
+        status.HTTP_204_NO_CONTENT,
+    )
+    assert not ScheduleEntry.objects.exists()
+
+
+def test_bulk_rejected_when_batch_overloads(admin_client, settings, tmp_path):
+    settings.ACTION_DURATIONS_FILE = str(tmp_path / "action_durations.json")
+    settings.DEFAULT_ACTION_DURATION = 5.0
+    settings.SCHEDULER_MAX_WORKERS = 1
+    settings.SCHEDULE_ADMISSION_CONTROL = "reject"
+    entries = sweep_entries(3)
+    for entry in entries:
+        # each alone uses half of the sensor
+        entry["interval"] = 10
+    post_bulk(admin_client, {"create": entries}, status.HTTP_400_BAD_REQUEST)
+    assert not ScheduleEntry.objects.exists()
+
+
+def test_bulk_activate_skips_missed_times(admin_client):
+    post_bulk(admin_client, {"create": sweep_entries(1)})
+    post_bulk(admin_client, {"deactivate": ["sweep0"]})
+    entry = ScheduleEntry.objects.get(name="sweep0")
+    missed = entry.next_task_time - 10 * 3600
+    ScheduleEntry.objects.filter(name="sweep0").update(next_task_time=missed)
+
+    post_bulk(admin_client, {"activate": ["sweep0"]})
+    entry.refresh_from_db()
+    assert entry.is_active
+    assert entry.next_task_time >= utils.timefn()
@@ -0,0 +1,119 @@
+import datetime
+import json
+
+import pytest
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from schedule.capacity import SENSOR_LANE, check_capacity, get_projected_schedule
+from schedule.models import ScheduleEntry
+from schedule.tests.utils import post_schedule
+from scheduler.cost_model import DurationModel, load_duration_seeds
+from scheduler.tests.utils import create_entry
+from sensor import V1
+from sensor.tests.utils import HTTPS_KWARG, validate_response
+from tasks.models import TaskResult
+
+OVERLOADING_ENTRY = {
+    "name": "overload",
+    "action": "test_monitor_sigan",
+    "interval": 2,
+}
+
+
+@pytest.fixture
+def slow_actions(settings, tmp_path):
+    """Estimate every action without history to take 5 seconds."""
+    settings.ACTION_DURATIONS_FILE = str(tmp_path / "action_durations.json")
+    settings.DEFAULT_ACTION_DURATION = 5.0
+    settings.SCHEDULER_MAX_WORKERS = 1
+
+
+@pytest.mark.django_db
+def test_duration_model_learns_from_history(settings, tmp_path):
+    settings.ACTION_DURATIONS_FILE = str(tmp_path / "action_durations.json")
+    entry = create_entry("t", 1, 1, 100, 5, "test_monitor_sigan")
+    for task_id, seconds in enumerate((2, 4, 6), start=1):
+        TaskResult(
+            schedule_entry=entry,
+            task_id=task_id,
+            duration=datetime.timedelta(seconds=seconds),
+            status="success",
+        ).save()
+
+    model = DurationModel(seeds={"test_monitor_sigan": 100.0})
+    assert model.estimate("test_monitor_sigan") == 4.0
+
+
+@pytest.mark.django_db
+def test_duration_model_falls_back_to_seeds(settings, tmp_path):
+    seeds_file = tmp_path / "action_durations.json"
+    seeds_file.write_text(json.dumps({"test_monitor_sigan": 3.5}))
+    settings.ACTION_DURATIONS_FILE = str(seeds_file)
+    settings.DEFAULT_ACTION_DURATION = 1.0
+    assert load_duration_seeds() == {"test_monitor_sigan": 3.5}
+    model = DurationModel()
+    assert model.estimate("test_monitor_sigan") == 3.5
+    assert model.estimate("unbenchmarked") == 1.0
+
+
+@pytest.mark.django_db
+def test_continuous_entry_uses_duty_cycle(slow_actions):
+    create_entry(
+        "c", 10, None, None, None, "test_monitor_sigan", continuous=True, duty_cycle=0.5
+    )
+    report = check_capacity(get_projected_schedule())
+    assert report["utilization"] == {SENSOR_LANE: 0.5}
+    assert not report["capacity_exceeded"]
+
+
+def test_overloading_entry_rejected(admin_client, settings, slow_actions):
+    settings.SCHEDULE_ADMISSION_CONTROL = "reject"
+    post_schedule(admin_client, OVERLOADING_ENTRY, status.HTTP_400_BAD_REQUEST)
+    assert not ScheduleEntry.objects.exists()
+
+
+def test_overloading_entry_warned(admin_client, settings, slow_actions):
+    settings.SCHEDULE_ADMISSION_CONTROL = "warn"
+    url = reverse("schedule-list", kwargs=V1)
+    response = admin_client.post(
+        url,
+        data=json.dumps(OVERLOADING_ENTRY),
+        content_type="application/json",
+        **HTTPS_KWARG,
+    )
+    validate_response(response, status.HTTP_201_CREATED)
+    assert "exceeds capacity" in response["Warning"]
+
+
+def test_capacity_check_does_not_modify_schedule(admin_client, slow_actions):
+    url = reverse("schedule-capacity", kwargs=V1)
+    response = admin_client.post(
+        url,
+        data=json.dumps(OVERLOADING_ENTRY),
+        content_type="application/json",
+        **HTTPS_KWARG,
+    )
+    rjson = validate_response(response, status.HTTP_200_OK)
+    assert rjson["capacity_exceeded"]
+    assert rjson["utilization"] == {"sensor": 2.5}
+    assert not ScheduleEntry.objects.exists()
+
+
+def test_utilization_timeline(admin_client, settings, slow_actions):
+    settings.SCHEDULE_ADMISSION_CONTROL = "off"
+    post_schedule(admin_client, OVERLOADING_ENTRY)
+    url = reverse("schedule-utilization", kwargs=V1)
+    response = admin_client.get(url, {"horizon": 60, "bin": 10}, **HTTPS_KWARG)
+    rjson = validate_response(response, status.HTTP_200_OK)
+    assert len(rjson["timeline"]) == 6
+    assert rjson["utilization"] == {"sensor": 2.5}
+    assert all(b["utilization"]["sensor"] > 1 for b in rjson["timeline"][1:])
+
+
+def test_utilization_horizon_limited(admin_client, settings):
+    settings.MAX_UTILIZATION_HORIZON = 3600
+    url = reverse("schedule-utilization", kwargs=V1)
+    params = {"horizon": 1000000000, "bin": 1000000}
+    response = admin_client.get(url, params, **HTTPS_KWARG)
+    validate_response(response, status.HTTP_400_BAD_REQUEST)
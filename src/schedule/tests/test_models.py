@@ -139,3 +139,16 @@ def test_defaults():
 
 def test_str():
     str(ScheduleEntry(name="t", action="test_monitor_sigan"))
+
+
+def test_reactivated_entry_skips_missed_times(user):
+    entry = ScheduleEntry(
+        name="t", action="test_monitor_sigan", interval=10, owner=user
+    )
+    entry.save()
+    entry.is_active = False
+    entry.save()
+    entry.next_task_time -= 100
+    entry.is_active = True
+    entry.save()
+    assert entry.next_task_time >= utils.timefn()
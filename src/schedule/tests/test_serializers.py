@@ -144,6 +144,22 @@ def test_valid_user_entries(entry_json, user):
         },
         # Explicit validate_only is valid
         {"name": "test", "action": "test_monitor_sigan", "validate_only": False},
+        # Tasks may start late within a tolerance
+        {"name": "test", "action": "test_monitor_sigan", "tolerance": 5},
+        # Continuous entries run back-to-back, optionally duty cycled
+        {"name": "test", "action": "test_monitor_sigan", "continuous": True},
+        {
+            "name": "test",
+            "action": "test_monitor_sigan",
+            "continuous": True,
+            "duty_cycle": 0.5,
+        },
+        # Actions may be grouped to run back-to-back
+        {
+            "name": "test",
+            "action": "test_monitor_sigan",
+            "group_actions": ["test_monitor_sigan"],
+        },
         # Admin can create private entries
         {"name": "test", "action": "test_monitor_sigan"},
     ],
@@ -229,6 +245,26 @@ def test_invalid_user_entries(entry_json):
         {"name": "test", "action": "test_monitor_sigan", "interval": 0},
         # negative interval
         {"name": "test", "action": "test_monitor_sigan", "interval": -1},
+        # negative tolerance
+        {"name": "test", "action": "test_monitor_sigan", "tolerance": -1},
+        # continuous entries have no interval
+        {
+            "name": "test",
+            "action": "test_monitor_sigan",
+            "continuous": True,
+            "interval": 10,
+        },
+        # duty cycle without continuous
+        {"name": "test", "action": "test_monitor_sigan", "duty_cycle": 0.5},
+        # duty cycle out of range
+        {
+            "name": "test",
+            "action": "test_monitor_sigan",
+            "continuous": True,
+            "duty_cycle": 1.5,
+        },
+        # unknown group action
+        {"name": "test", "action": "test_monitor_sigan", "group_actions": ["none"]},
         # can't interpret both absolute and relative stop
         {
             "name": "test",
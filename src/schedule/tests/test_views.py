@@ -1,8 +1,11 @@
+import json
+
 from rest_framework import status
 from rest_framework.reverse import reverse
 
 from schedule.tests.utils import (
     EMPTY_SCHEDULE_RESPONSE,
+    TEST_ALTERNATE_SCHEDULE_ENTRY,
     TEST_SCHEDULE_ENTRY,
     post_schedule,
     reverse_detail_url,
@@ -85,3 +88,43 @@ def test_delete_entry_with_acquisitions_fails(admin_client, test_scheduler):
 
     response = admin_client.delete(entry_url, **HTTPS_KWARG)
     validate_response(response, expected_status)
+
+
+def test_schedule_conditional_get(admin_client):
+    rjson = post_schedule(admin_client, TEST_SCHEDULE_ENTRY)
+    for url in (reverse("schedule-list", kwargs=V1), reverse_detail_url(rjson["name"])):
+        response = admin_client.get(url, **HTTPS_KWARG)
+        validate_response(response, status.HTTP_200_OK)
+        etag = response["ETag"]
+
+        response = admin_client.get(url, HTTP_IF_NONE_MATCH=etag, **HTTPS_KWARG)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    post_schedule(admin_client, TEST_ALTERNATE_SCHEDULE_ENTRY)
+    url = reverse("schedule-list", kwargs=V1)
+    response = admin_client.get(url, HTTP_IF_NONE_MATCH=etag, **HTTPS_KWARG)
+    validate_response(response, status.HTTP_200_OK)
+
+
+def patch_schedule(client, entry_name, data):
+    url = reverse_detail_url(entry_name)
+    return client.patch(
+        url, data=json.dumps(data), content_type="application/json", **HTTPS_KWARG
+    )
+
+
+def test_patch_duty_cycle_of_continuous_entry(admin_client):
+    entry = dict(TEST_SCHEDULE_ENTRY, continuous=True)
+    rjson = post_schedule(admin_client, entry)
+    response = patch_schedule(admin_client, rjson["name"], {"duty_cycle": 0.5})
+    rjson = validate_response(response, status.HTTP_200_OK)
+    assert rjson["duty_cycle"] == 0.5
+
+
+def test_patch_interval_of_continuous_entry_rejected(admin_client):
+    entry = dict(TEST_SCHEDULE_ENTRY, continuous=True)
+    rjson = post_schedule(admin_client, entry)
+    response = patch_schedule(admin_client, rjson["name"], {"interval": 10})
+    validate_response(response, status.HTTP_400_BAD_REQUEST)
+    response = admin_client.get(reverse_detail_url(rjson["name"]), **HTTPS_KWARG)
+    assert validate_response(response, status.HTTP_200_OK)["interval"] is None
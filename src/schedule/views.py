@@ -1,13 +1,44 @@
-from rest_framework import filters, status
+import logging
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import filters, serializers, status
+from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.settings import api_settings
 from rest_framework.viewsets import ModelViewSet
+from scos_actions.utils import convert_datetime_to_millisecond_iso_format
+
+import events
+from scheduler.cost_model import DurationModel
+from sensor.conditional import ConditionalGetMixin
+from sensor.utils import get_datetime_from_timestamp
 
+from .capacity import (
+    ADMISSION_OFF,
+    ADMISSION_REJECT,
+    check_capacity,
+    get_candidate_entry,
+    get_projected_schedule,
+    get_utilization_timeline,
+)
 from .models import Request, ScheduleEntry
 from .serializers import ScheduleEntrySerializer
 
+logger = logging.getLogger(__name__)
+
+MAX_UTILIZATION_BINS = 1440
+MAX_BULK_ENTRIES = 1000
+BULK_OPERATIONS = ("create", "update", "delete", "activate", "deactivate")
+
+
+# Fields of each entry that change its representation. `modified` isn't
+# updated when the scheduler saves only the next task time or id.
+STAMP_FIELDS = ("name", "modified", "is_active", "next_task_time", "next_task_id")
+
 
-class ScheduleEntryViewSet(ModelViewSet):
+class ScheduleEntryViewSet(ConditionalGetMixin, ModelViewSet):
     """View and modify the schedule.
 
     list:
@@ -28,6 +59,20 @@ class ScheduleEntryViewSet(ModelViewSet):
     delete:
     Deletes the specified schedule entry.
 
+    capacity:
+    Validates an entry and reports the projected sensor utilization if it
+    were added to the schedule, without modifying the schedule.
+
+    bulk:
+    Validates lists of entries to `create` and `update` and names of entries
+    to `delete`, `activate` and `deactivate`, then applies them all at once,
+    or none of them if any is invalid. With `validate_only`, only validates.
+
+    utilization:
+    Returns the projected sensor utilization of the current schedule over
+    the next `horizon` seconds (default 3600) in bins of `bin` seconds
+    (default 60).
+
     """
 
     queryset = ScheduleEntry.objects.all()
@@ -53,20 +98,282 @@ class ScheduleEntryViewSet(ModelViewSet):
         return Response(serializer.data, status=created, headers=headers)
 
     def perform_create(self, serializer):
+        self.check_admission(serializer)
         r = Request()
         r.from_drf_request(self.request)
         serializer.save(request=r, owner=self.request.user)
 
+    def perform_update(self, serializer):
+        self.check_admission(serializer)
+        serializer.save()
+
+    def check_admission(self, serializer=None, candidates=(), exclude=()):
+        """Reject or warn about entries that would overload the sensor.
+
+        :param serializer: a validated serializer of an entry to add or change
+        :param candidates: unsaved entries to add or change, e.g. in bulk
+        :param exclude: names of entries that would be removed or deactivated
+
+        """
+        self.capacity_report = None
+        mode = settings.SCHEDULE_ADMISSION_CONTROL
+        if mode == ADMISSION_OFF:
+            return
+
+        if serializer is not None:
+            candidates = [
+                get_candidate_entry(serializer.validated_data, serializer.instance)
+            ]
+        report = check_capacity(
+            get_projected_schedule(exclude=exclude, candidates=candidates)
+        )
+        if not report["capacity_exceeded"]:
+            return
+
+        msg = "Projected sensor utilization exceeds capacity: {}".format(
+            ", ".join(
+                f"{lane} {report['utilization'][lane]:.0%}"
+                for lane in report["overloaded_lanes"]
+            )
+        )
+        if mode == ADMISSION_REJECT:
+            raise serializers.ValidationError(
+                {"detail": msg, "utilization": report["utilization"]}
+            )
+
+        logger.warning(msg)
+        self.capacity_report = report
+        self.capacity_warning = msg
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if getattr(self, "capacity_report", None):
+            response["Warning"] = f'199 - "{self.capacity_warning}"'
+        return response
+
+    @action(detail=False, methods=("post",))
+    def capacity(self, request, version, format=None):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        candidate = get_candidate_entry(serializer.validated_data)
+        report = check_capacity(get_projected_schedule(candidate))
+        return Response(report)
+
+    @action(detail=False, methods=("post",))
+    def bulk(self, request, version, format=None):
+        """Validate a batch of changes to the schedule and apply them at once."""
+        changes = {}
+        errors = {}
+        for operation in BULK_OPERATIONS:
+            items = request.data.get(operation, [])
+            if not isinstance(items, list):
+                errors[operation] = ["Expected a list."]
+            changes[operation] = items
+        if errors:
+            raise serializers.ValidationError(errors)
+
+        count = sum(len(items) for items in changes.values())
+        if count == 0:
+            raise serializers.ValidationError(
+                f"Provide at least one of {', '.join(BULK_OPERATIONS)}"
+            )
+        if count > MAX_BULK_ENTRIES:
+            raise serializers.ValidationError(
+                f"A batch may change at most {MAX_BULK_ENTRIES} entries"
+            )
+
+        with transaction.atomic():
+            candidates, names, existing = self.validate_bulk(changes)
+            self.check_admission(
+                candidates=candidates.values(), exclude=names["delete"]
+            )
+            if request.data.get("validate_only"):
+                return Response(status=status.HTTP_204_NO_CONTENT)
+
+            self.apply_bulk(candidates, names, existing)
+
+        # the scheduler reads the whole schedule each pass, so it sees either
+        # none or all of the batch
+        events.publish(
+            events.SCHEDULE_CHANGED,
+            {operation: names[operation] for operation in BULK_OPERATIONS},
+        )
+        changed = names["create"] + names["update"] + names["activate"]
+        entries = ScheduleEntry.objects.filter(name__in=changed + names["deactivate"])
+        return Response(
+            {
+                "entries": self.get_serializer(entries, many=True).data,
+                "deleted": names["delete"],
+            }
+        )
+
+    def validate_bulk(self, changes):
+        """Validate every change in a batch, raising all errors at once.
+
+        :return: unsaved entries as they would be after the batch, by name, and
+            the names of the entries for each operation
+
+        """
+        names = {}
+        for operation in BULK_OPERATIONS:
+            if operation in ("create", "update"):
+                names[operation] = [
+                    item.get("name") if isinstance(item, dict) else None
+                    for item in changes[operation]
+                ]
+            else:
+                names[operation] = changes[operation]
+
+        all_names = [
+            name
+            for operation in names.values()
+            for name in operation
+            if isinstance(name, str)
+        ]
+        existing = ScheduleEntry.objects.select_for_update().in_bulk(all_names)
+        duplicates = {name for name in all_names if all_names.count(name) > 1}
+
+        errors = {}
+        candidates = {}
+        for operation in BULK_OPERATIONS:
+            operation_errors = {}
+            for i, item in enumerate(changes[operation]):
+                name = names[operation][i]
+                try:
+                    if name in duplicates:
+                        raise serializers.ValidationError(
+                            {"name": "Entries may only be changed once in a batch"}
+                        )
+                    candidate = self.validate_bulk_item(operation, item, existing)
+                except serializers.ValidationError as err:
+                    operation_errors[i] = err.detail
+                    continue
+                if candidate is not None:
+                    candidates[candidate.name] = candidate
+            if operation_errors:
+                errors[operation] = operation_errors
+        if errors:
+            raise serializers.ValidationError(errors)
+
+        return candidates, names, existing
+
+    def validate_bulk_item(self, operation, item, existing):
+        """Return the entry as it would be after one change in a batch."""
+        if operation == "create":
+            serializer = self.get_serializer(data=item)
+            serializer.is_valid(raise_exception=True)
+            return get_candidate_entry(serializer.validated_data)
+
+        if operation == "update":
+            if not isinstance(item, dict):
+                raise serializers.ValidationError("Expected an entry.")
+            name = item.get("name")
+        else:
+            name = item
+        if not isinstance(name, str):
+            raise serializers.ValidationError({"name": "Expected an entry name."})
+        if name not in existing:
+            raise serializers.ValidationError({"name": f"No entry named {name!r}"})
+        instance = existing[name]
+
+        if operation == "delete":
+            if instance.task_results.exists():
+                raise serializers.ValidationError(
+                    {"name": "Delete the entry's task results first"}
+                )
+            return None
+
+        # (de)activating is validated as a partial update, as with PATCH
+        if operation == "update":
+            data = {k: v for k, v in item.items() if k != "name"}
+        else:
+            data = {"is_active": operation == "activate"}
+        serializer_class = self.get_entry_serializer_class(updating=True)
+        serializer = serializer_class(
+            instance, data=data, partial=True, context=self.get_serializer_context()
+        )
+        serializer.is_valid(raise_exception=True)
+        return get_candidate_entry(serializer.validated_data, instance)
+
+    def apply_bulk(self, candidates, names, existing):
+        """Save a validated batch of changes."""
+        now = timezone.now()
+        if names["create"]:
+            r = Request()
+            r.from_drf_request(self.request)
+            created = [candidates[name] for name in names["create"]]
+            for entry in created:
+                entry.owner = self.request.user
+                entry.request = r
+            ScheduleEntry.objects.bulk_create(created)
+
+        # only write the fields that changed, since the scheduler updates
+        # others, e.g. the next task id, without locking the entry
+        changed_fields = {}
+        for name in names["update"] + names["activate"] + names["deactivate"]:
+            entry = candidates[name]
+            entry.modified = now
+            fields = tuple(
+                field.attname
+                for field in ScheduleEntry._meta.concrete_fields
+                if getattr(entry, field.attname)
+                != getattr(existing[name], field.attname)
+            )
+            changed_fields.setdefault(fields, []).append(entry)
+        for fields, entries in changed_fields.items():
+            ScheduleEntry.objects.bulk_update(entries, fields)
+
+        if names["delete"]:
+            ScheduleEntry.objects.filter(name__in=names["delete"]).delete()
+
+    @action(detail=False)
+    def utilization(self, request, version, format=None):
+        try:
+            horizon = int(request.query_params.get("horizon", 3600))
+            bin_size = int(request.query_params.get("bin", 60))
+        except ValueError:
+            raise serializers.ValidationError("horizon and bin must be integers")
+        if horizon < 1 or bin_size < 1:
+            raise serializers.ValidationError("horizon and bin must be positive")
+        if horizon > settings.MAX_UTILIZATION_HORIZON:
+            raise serializers.ValidationError(
+                f"horizon must not exceed {settings.MAX_UTILIZATION_HORIZON} seconds"
+            )
+        if horizon / bin_size > MAX_UTILIZATION_BINS:
+            raise serializers.ValidationError(
+                f"horizon / bin must not exceed {MAX_UTILIZATION_BINS} bins"
+            )
+
+        duration_model = DurationModel()
+        entries = get_projected_schedule()
+        timeline = get_utilization_timeline(entries, horizon, bin_size, duration_model)
+        for b in timeline:
+            b["start"] = convert_datetime_to_millisecond_iso_format(
+                get_datetime_from_timestamp(b["start"])
+            )
+
+        report = check_capacity(entries, duration_model)
+        report["timeline"] = timeline
+        return Response(report)
+
     def get_queryset(self):
         # .list() does not call .get_object()
         base_queryset = self.filter_queryset(self.queryset)
         return base_queryset.all()
 
+    def get_version_stamp(self):
+        queryset = self.get_queryset()
+        if self.action == "retrieve":
+            queryset = queryset.filter(pk=self.kwargs["pk"])
+        return list(queryset.values_list(*STAMP_FIELDS))
+
     def get_serializer_class(self):
         """Modify the base serializer based on user and request."""
-
         updating = self.action in {"update", "partial_update"}
+        return self.get_entry_serializer_class(updating)
 
+    @staticmethod
+    def get_entry_serializer_class(updating):
         SerializerBaseClass = ScheduleEntrySerializer
 
         ro_fields = SerializerBaseClass.Meta.read_only_fields
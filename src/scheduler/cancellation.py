@@ -0,0 +1,59 @@
+"""Cooperative cancellation of running actions.
+
+Actions that accept a ``cancellation_token`` keyword argument are passed a
+:class:`CancellationToken` when run by the scheduler, e.g.::
+
+    def __call__(self, sensor, schedule_entry, task_id, cancellation_token=None):
+        for segment in segments:
+            cancellation_token.raise_if_cancelled()
+            ...
+
+An action may either raise :class:`TaskCancelled` or return early once the
+token is cancelled. Either way the task result is recorded as "cancelled".
+Actions without the argument run to completion and are never preempted.
+
+"""
+
+import inspect
+import threading
+
+
+class TaskCancelled(Exception):
+    """Raised by an action to stop early after its task was cancelled."""
+
+
+class CancellationToken:
+    """Signal to a running action that it should stop early."""
+
+    def __init__(self):
+        self._event = threading.Event()
+        self.reason = ""
+
+    def cancel(self, reason="cancelled"):
+        if not self._event.is_set():
+            self.reason = reason
+            self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def wait(self, timeout=None):
+        """Sleep up to `timeout` seconds, returning :obj:`True` if cancelled."""
+        return self._event.wait(timeout)
+
+    def raise_if_cancelled(self):
+        if self.cancelled:
+            raise TaskCancelled(self.reason)
+
+
+def accepts_cancellation(action):
+    """Return :obj:`True` if `action` takes a ``cancellation_token`` argument."""
+    try:
+        parameters = inspect.signature(action).parameters.values()
+    except (TypeError, ValueError):
+        return False
+
+    return any(
+        p.name == "cancellation_token" or p.kind is p.VAR_KEYWORD for p in parameters
+    )
@@ -0,0 +1,85 @@
+"""Save scheduler state so that a restarted scheduler can resume quickly.
+
+The checkpoint holds the ``next_task_id`` cursor of each active schedule entry
+and the tasks that were taken from the schedule but had not started yet. It
+is written whenever the pending work changes and when the scheduler stops,
+and is consumed by the next scheduler to start.
+
+"""
+
+import json
+import logging
+import os
+
+from django.conf import settings
+
+from tasks.models import Task
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_VERSION = 1
+
+
+def save_checkpoint(cursors, pending, clean=False, checkpoint_file=None):
+    """Atomically write the scheduler checkpoint.
+
+    :param cursors: ``next_task_id`` by schedule entry name
+    :param pending: tasks taken from the schedule that have not started
+    :param clean: :obj:`True` if the scheduler stopped with no task running
+
+    """
+    checkpoint_file = checkpoint_file or settings.SCHEDULER_CHECKPOINT_FILE
+    if not checkpoint_file:
+        return
+
+    checkpoint = {
+        "version": CHECKPOINT_VERSION,
+        "clean": clean,
+        "cursors": cursors,
+        "pending": [list(task) for task in pending],
+    }
+    tmp_file = f"{checkpoint_file}.tmp"
+    try:
+        with open(tmp_file, "w") as f:
+            json.dump(checkpoint, f)
+        os.replace(tmp_file, checkpoint_file)
+    except OSError as err:
+        logger.warning(f"Unable to save scheduler checkpoint: {err}")
+
+
+def load_checkpoint(checkpoint_file=None):
+    """Load and remove the scheduler checkpoint.
+
+    :return: a dict with ``clean``, ``cursors`` and ``pending`` (a list of
+        :class:`~tasks.models.Task`), or :obj:`None` if there is no usable
+        checkpoint
+
+    """
+    checkpoint_file = checkpoint_file or settings.SCHEDULER_CHECKPOINT_FILE
+    if not checkpoint_file:
+        return None
+
+    try:
+        with open(checkpoint_file) as f:
+            checkpoint = json.load(f)
+        os.remove(checkpoint_file)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as err:
+        logger.warning(f"Unable to load scheduler checkpoint: {err}")
+        return None
+
+    if checkpoint.get("version") != CHECKPOINT_VERSION:
+        logger.info("Ignoring scheduler checkpoint from another version")
+        return None
+
+    try:
+        pending = [Task(*task) for task in checkpoint["pending"]]
+        return {
+            "clean": bool(checkpoint["clean"]),
+            "cursors": dict(checkpoint["cursors"]),
+            "pending": pending,
+        }
+    except (KeyError, TypeError, ValueError) as err:
+        logger.warning(f"Ignoring malformed scheduler checkpoint: {err}")
+        return None
@@ -0,0 +1,90 @@
+"""Estimate how long actions take to run.
+
+Estimates are learned from the durations of recent task results. Actions that
+have not run on this sensor yet fall back to seed values benchmarked with the
+mock signal analyzer (see ``manage.py benchmark_actions``), and then to
+``DEFAULT_ACTION_DURATION``.
+
+"""
+
+import json
+import logging
+from statistics import mean
+
+from django.conf import settings
+
+from tasks.models import TaskResult
+
+logger = logging.getLogger(__name__)
+
+# Results from failed tasks often end early and would underestimate the cost
+COMPLETED_STATUSES = ("success", "notification_failed")
+
+
+def load_duration_seeds(seeds_file=None):
+    """Load benchmarked action durations, in seconds, keyed by action name."""
+    seeds_file = seeds_file or settings.ACTION_DURATIONS_FILE
+    try:
+        with open(seeds_file) as f:
+            seeds = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as err:
+        logger.warning(f"Unable to load action durations from {seeds_file}: {err}")
+        return {}
+
+    return {
+        action: float(duration)
+        for action, duration in seeds.items()
+        if isinstance(duration, (int, float))
+    }
+
+
+def save_duration_seeds(seeds, seeds_file=None):
+    seeds_file = seeds_file or settings.ACTION_DURATIONS_FILE
+    with open(seeds_file, "w") as f:
+        json.dump(seeds, f, indent=4, sort_keys=True)
+
+
+class DurationModel:
+    """Per-action duration estimates, in seconds.
+
+    Estimates are cached for the life of the instance, so create one per
+    request or planning pass.
+
+    """
+
+    def __init__(self, seeds=None):
+        self.seeds = load_duration_seeds() if seeds is None else seeds
+        self.history_size = settings.DURATION_HISTORY_SIZE
+        self.default = settings.DEFAULT_ACTION_DURATION
+        self._estimates = {}
+
+    def get_history(self, action):
+        """Return the durations of the most recent completed tasks of `action`."""
+        durations = (
+            TaskResult.objects.filter(
+                schedule_entry__action=action,
+                schedule_entry__group_actions=[],
+                status__in=COMPLETED_STATUSES,
+            )
+            .order_by("-id")
+            .values_list("duration", flat=True)[: self.history_size]
+        )
+        return [d.total_seconds() for d in durations]
+
+    def estimate(self, action):
+        """Return the expected duration of `action` in seconds."""
+        if action not in self._estimates:
+            history = self.get_history(action)
+            if history:
+                estimate = mean(history)
+            else:
+                estimate = self.seeds.get(action, self.default)
+            self._estimates[action] = estimate
+
+        return self._estimates[action]
+
+    def estimate_entry(self, entry):
+        """Return the expected duration of each task of `entry` in seconds."""
+        return sum(self.estimate(action) for action in entry.get_actions())
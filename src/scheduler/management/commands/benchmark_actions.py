@@ -0,0 +1,99 @@
+import logging
+from time import perf_counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from scos_actions.hardware.mocks.mock_sigan import MockSignalAnalyzer
+from scos_actions.hardware.sensor import Sensor
+from scos_actions.signals import measurement_action_completed
+
+from handlers.measurement_handler import measurement_action_completed_callback
+from initialization import action_loader, capabilities_loader
+from scheduler.cost_model import load_duration_seeds, save_duration_seeds
+
+logger = logging.getLogger(__name__)
+
+
+def get_nominal_duration(action):
+    """Return the capture time in seconds configured for `action`, if any.
+
+    The mock signal analyzer doesn't wait for samples to be captured, so this
+    is a lower bound for the benchmarked duration.
+
+    """
+    parameters = getattr(action, "parameters", None) or {}
+    duration_ms = parameters.get("duration_ms", 0)
+    if isinstance(duration_ms, (list, tuple)):
+        duration_ms = sum(duration_ms)
+    try:
+        return float(duration_ms) / 1000
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class Command(BaseCommand):
+    help = (
+        "Runs each action against the mock signal analyzer and saves its "
+        "duration as a seed for schedule admission control."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("actions", nargs="*", help="Actions to benchmark")
+        parser.add_argument(
+            "--repeat", type=int, default=3, help="Runs per action (default 3)"
+        )
+
+    def handle(self, *args, **options):
+        actions = action_loader.actions
+        names = options["actions"] or sorted(actions)
+        unknown = set(names) - set(actions)
+        if unknown:
+            raise CommandError(f"Unknown actions: {', '.join(sorted(unknown))}")
+
+        sensor = Sensor(
+            signal_analyzer=MockSignalAnalyzer(switches={}),
+            capabilities=capabilities_loader.capabilities,
+            preselector=None,
+            switches={},
+            location=None,
+            gps=None,
+            sensor_cal=None,
+            differential_cal=None,
+        )
+        seeds = load_duration_seeds()
+        # Benchmark results are not stored in the database
+        measurement_action_completed.disconnect(measurement_action_completed_callback)
+        try:
+            for name in names:
+                if name == settings.STARTUP_CALIBRATION_ACTION:
+                    continue
+                duration = self.benchmark(sensor, name, actions[name], options)
+                if duration is not None:
+                    seeds[name] = round(duration, 3)
+                    self.stdout.write(f"{name}: {seeds[name]} s")
+        finally:
+            measurement_action_completed.connect(measurement_action_completed_callback)
+
+        save_duration_seeds(seeds)
+        self.stdout.write(f"Saved action durations to {settings.ACTION_DURATIONS_FILE}")
+
+    def benchmark(self, sensor, name, action, options):
+        schedule_entry_json = {
+            "id": f"benchmark_{name}",
+            "name": f"benchmark_{name}",
+            "priority": 10,
+            "start": None,
+            "stop": None,
+            "interval": None,
+        }
+        durations = []
+        for task_id in range(1, options["repeat"] + 1):
+            start = perf_counter()
+            try:
+                action(sensor, schedule_entry_json, task_id)
+            except Exception as err:
+                self.stderr.write(f"{name} failed: {err}")
+                return None
+            durations.append(perf_counter() - start)
+
+        return max(sum(durations) / len(durations), get_nominal_duration(action))
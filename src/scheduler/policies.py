@@ -0,0 +1,66 @@
+"""Policies deciding the order in which pending tasks are run.
+
+The policy is selected with the ``SCHEDULER_POLICY`` setting.
+
+"""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class SchedulingPolicy:
+    """Order pending tasks for execution."""
+
+    name = None
+
+    def sort_key(self, task):
+        raise NotImplementedError
+
+    def order(self, tasks):
+        """Return `tasks` as a list in the order they should be run."""
+        return sorted(tasks, key=self.sort_key)
+
+
+class PriorityPolicy(SchedulingPolicy):
+    """Run tasks by scheduled time, then by priority.
+
+    This is the original scheduler behavior.
+
+    """
+
+    name = "priority"
+
+    def sort_key(self, task):
+        return (task.time, task.priority)
+
+
+class EarliestDeadlineFirstPolicy(SchedulingPolicy):
+    """Run the task with the least slack first, then by priority.
+
+    Tasks from entries without a `tolerance` must start at their scheduled
+    time, so their deadline is the scheduled time itself. Tasks that can
+    tolerate starting late give way to those that can't.
+
+    """
+
+    name = "edf"
+
+    def sort_key(self, task):
+        deadline = task.time if task.deadline is None else task.deadline
+        return (deadline, task.priority, task.time)
+
+
+POLICIES = {p.name: p for p in (PriorityPolicy, EarliestDeadlineFirstPolicy)}
+
+
+def get_policy(name):
+    """Return an instance of the policy registered as `name`."""
+    try:
+        return POLICIES[name]()
+    except KeyError:
+        logger.error(
+            f"Unknown scheduling policy {name!r}, expected one of {sorted(POLICIES)}."
+            + f" Using {PriorityPolicy.name!r}."
+        )
+        return PriorityPolicy()
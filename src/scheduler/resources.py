@@ -0,0 +1,80 @@
+"""Hardware resources that scheduled actions may claim.
+
+Actions declare the resources they need with a ``resources`` attribute, e.g.
+``resources = ("sigan", "preselector")``. Because most actions are provided by
+plugins, resources can also be assigned per action name with the
+``ACTION_RESOURCES`` setting, which takes precedence over the attribute.
+
+Actions that declare nothing are assumed to need all hardware, so they never
+run alongside another task.
+
+"""
+
+import logging
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+SIGAN = "sigan"
+PRESELECTOR = "preselector"
+GPS = "gps"
+CPU = "cpu"
+
+# Resources that only one task may use at a time. ``cpu`` marks an action as
+# software-only and never conflicts with another task.
+EXCLUSIVE_RESOURCES = frozenset((SIGAN, PRESELECTOR, GPS))
+RESOURCES = EXCLUSIVE_RESOURCES | {CPU}
+
+
+def get_action_resources(action_name, action=None):
+    """Return the set of exclusive resources claimed by an action.
+
+    :param action_name: the name the action is registered under
+    :param action: the action object, if already looked up
+    :return: a frozenset of resource names from :data:`EXCLUSIVE_RESOURCES`
+
+    """
+    declared = settings.ACTION_RESOURCES.get(action_name)
+    if declared is None and action is not None:
+        declared = getattr(action, "resources", None)
+    if declared is None:
+        return EXCLUSIVE_RESOURCES
+
+    if isinstance(declared, str):
+        declared = (declared,)
+    declared = frozenset(r.lower() for r in declared)
+    unknown = declared - RESOURCES
+    if unknown:
+        logger.warning(
+            f"Ignoring unknown resources {sorted(unknown)} declared by {action_name}"
+        )
+
+    return declared & EXCLUSIVE_RESOURCES
+
+
+class ResourceLanes:
+    """Track which exclusive resources are held by running tasks.
+
+    Not thread-safe on its own; callers hold the scheduler's dispatch lock.
+
+    """
+
+    def __init__(self):
+        self._held = {}
+
+    def is_free(self, resources):
+        """Return :obj:`True` if none of `resources` are currently held."""
+        return not any(r in self._held for r in resources)
+
+    def acquire(self, resources, owner):
+        for r in resources:
+            self._held[r] = owner
+
+    def release(self, resources):
+        for r in resources:
+            self._held.pop(r, None)
+
+    def holder(self, resource):
+        """Return the owner holding `resource`, or :obj:`None`."""
+        return self._held.get(resource)
@@ -3,16 +3,24 @@
 import json
 import logging
 import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, wait
 from contextlib import contextmanager
+from functools import partial
 from pathlib import Path
-from time import perf_counter
+from time import monotonic, perf_counter
 
 import requests
 from django.conf import settings
+from django.db import close_old_connections, connection
+from django.db.models import Max
 from django.utils import timezone
 from scos_actions.hardware.sensor import Sensor
 from scos_actions.signals import trigger_api_restart
+from scos_actions.utils import convert_datetime_to_millisecond_iso_format
 
+import events
+from handlers.measurement_handler import task_group_step
 from initialization import action_loader, sensor_loader
 from schedule.models import ScheduleEntry
 from tasks.consts import MAX_DETAIL_LEN
@@ -21,6 +29,10 @@ from tasks.serializers import TaskResultSerializer
 from tasks.task_queue import TaskQueue
 
 from . import utils
+from .cancellation import CancellationToken, TaskCancelled, accepts_cancellation
+from .checkpoint import load_checkpoint, save_checkpoint
+from .policies import get_policy
+from .resources import ResourceLanes, get_action_resources
 
 logger = logging.getLogger(__name__)
 
@@ -34,18 +46,44 @@ class Scheduler(threading.Thread):
         self.timefn = utils.timefn
         self.delayfn = utils.delayfn
         self.task_queue = TaskQueue()
+        self.policy = get_policy(settings.SCHEDULER_POLICY)
         # scheduler looks ahead `interval_multiplier` times the shortest
         # interval in the schedule in order to keep memory-usage low
         self.interval_multiplier = 10
         self.name = "Scheduler"
         self.running = False
         self.interrupt_flag = threading.Event()
-        # Cache the currently running task state
-        self.entry = None  # ScheduleEntry that created the current task
-        self.task = None  # Task object describing current task
         self.last_status = ""
         self.consecutive_failures = 0
+        # set while the hardware is being recovered, no task starts meanwhile
+        self.dispatch_paused = threading.Event()
         self._sensor = sensor_loader.sensor
+        # Tasks whose resources do not conflict may run concurrently when
+        # SCHEDULER_MAX_WORKERS > 1, otherwise tasks run one at a time in the
+        # scheduler thread.
+        self.max_workers = settings.SCHEDULER_MAX_WORKERS
+        self.executor = None
+        if self.max_workers > 1:
+            self.executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="SchedulerTask"
+            )
+        self.dispatch_lock = threading.RLock()
+        self.lanes = ResourceLanes()
+        self.backlog = []  # pending tasks waiting for their resources
+        self.futures = set()  # tasks handed to the executor
+        self.busy_entries = Counter()  # backlogged or running tasks per entry
+        self.prepared_task = None  # (entry name, time) of last tune-ahead
+        self.entry_actions = {}  # actions run by each task of an entry
+        # continuous entries that have started, and the monotonic time each
+        # may run again to respect its duty cycle
+        self.continuous_entries = {}
+        # cancellable tasks by (entry name, task id), see PREEMPTION_SLICE
+        self.running_tasks = {}
+        self.preemption_monitor = None
+        self.pending_tasks = []  # taken tasks yet to run in this thread
+        self.restored_tasks = {}  # pending tasks from the last checkpoint
+        self.checkpoint_has_pending = False
+        self.last_checkpoint = None  # (cursors, pending, clean) last saved
 
     @property
     def sensor(self):
@@ -72,9 +110,19 @@ class Scheduler(threading.Thread):
         entry.is_active = False
         entry.save(update_fields=("is_active",))
 
-    def stop(self):
-        """Complete the current task, then return control."""
+    def stop(self, cancel=False):
+        """Complete the current task, then return control.
+
+        :param cancel: ask running tasks whose actions support cancellation to
+            stop early
+
+        """
         self.interrupt_flag.set()
+        if cancel:
+            with self.dispatch_lock:
+                running = list(self.running_tasks.values())
+            for task, token in running:
+                token.cancel("scheduler stopped")
 
     def start(self):
         """Run the scheduler in its own thread and return control."""
@@ -102,6 +150,9 @@ class Scheduler(threading.Thread):
                 if not blocking or self.interrupt_flag.is_set():
                     logger.info("scheduler interrupted")
                     break
+
+            self._wait_for_running_tasks()
+            self._save_checkpoint(clean=True)
         except Exception as err:
             logger.warning("scheduler dead")
             logger.exception(err)
@@ -109,16 +160,20 @@ class Scheduler(threading.Thread):
                 Path(settings.SCHEDULER_HEALTHCHECK_FILE).touch()
 
     def _consume_schedule(self, blocking):
-        while self.schedule_has_entries:
-            with minimum_duration(blocking):
+        while self.schedule_has_entries or self.restored_tasks:
+            with minimum_duration(blocking, until=self._continuous_task_ready):
                 self.running = True
                 schedule_snapshot = self.schedule
                 pending_task_queue = self._queue_tasks(schedule_snapshot)
                 self._consume_task_queue(pending_task_queue)
+                self._prepare_next_task()
 
+            if not blocking:
+                self._wait_for_running_tasks()
             if not blocking or self.interrupt_flag.is_set():
                 break
         else:
+            self._wait_for_running_tasks()
             self.task_queue.clear()
             if self.running:
                 logger.info("all scheduled tasks completed")
@@ -126,36 +181,357 @@ class Scheduler(threading.Thread):
         self.running = False
 
     def _queue_tasks(self, schedule_snapshot):
+        with self.dispatch_lock:
+            # forget continuous entries that were deactivated or removed
+            continuous = {e.name for e in schedule_snapshot if e.continuous}
+            for name in set(self.continuous_entries) - continuous:
+                del self.continuous_entries[name]
+
         pending_task_queue = self._queue_pending_tasks(schedule_snapshot)
         self.task_queue = self._queue_upcoming_tasks(schedule_snapshot)
 
         return pending_task_queue
 
     def _consume_task_queue(self, pending_task_queue):
-        for task in pending_task_queue.to_list():
-            entry_name = task.schedule_entry_name
-            self.task = task
-            self.entry = ScheduleEntry.objects.get(name=entry_name)
-            task_result = self._initialize_task_result()
-            started = timezone.now()
-            status, detail = self._call_task_action()
-            finished = timezone.now()
-            if settings.ASYNC_CALLBACK:
-                finalize_task_thread = threading.Thread(
-                    target=self._finalize_task_result,
-                    args=(task_result, started, finished, status, detail),
-                    daemon=True,
+        if self.executor is None:
+            self.pending_tasks = self.policy.order(pending_task_queue.to_list())
+            self._save_checkpoint()
+            while self.pending_tasks and self._wait_while_paused():
+                task = self.pending_tasks.pop(0)
+                if self._missed_deadline(task, self.timefn()):
+                    continue
+                self._run_task(task)
+        else:
+            with self.dispatch_lock:
+                for task in pending_task_queue.to_list():
+                    self.backlog.append(task)
+                    self.busy_entries[task.schedule_entry_name] += 1
+            self._save_checkpoint()
+            self._dispatch_backlog()
+
+    def _save_checkpoint(self, clean=False):
+        """Save pending tasks and task id cursors, see :mod:`.checkpoint`.
+
+        Nothing is written while there is no pending work to save, unless the
+        previous checkpoint had some or the scheduler is stopping, or if the
+        pending tasks and cursors are unchanged since the last write.
+
+        """
+        if not settings.SCHEDULER_CHECKPOINT_FILE:
+            return
+
+        with self.dispatch_lock:
+            pending = self.pending_tasks + self.backlog
+        if not (pending or self.checkpoint_has_pending or clean):
+            return
+
+        cursors = dict(
+            ScheduleEntry.objects.filter(is_active=True).values_list(
+                "name", "next_task_id"
+            )
+        )
+        # only write when the state changed, to limit writes to the SD card
+        checkpoint = (cursors, [tuple(task) for task in pending], clean)
+        if checkpoint == self.last_checkpoint:
+            return
+
+        save_checkpoint(cursors, pending, clean=clean)
+        self.last_checkpoint = checkpoint
+        self.checkpoint_has_pending = bool(pending)
+
+    def _dispatch_backlog(self):
+        """Hand each backlogged task whose resources are free to the executor.
+
+        Tasks are considered in the order given by the scheduling policy. A
+        task is held back if an earlier task is still waiting on one of its
+        resources, which keeps that ordering within each resource lane.
+
+        """
+        started = []
+        if self.dispatch_paused.is_set():
+            # dispatched again once the hardware is recovered
+            return
+
+        with self.dispatch_lock:
+            now = self.timefn()
+            waiting = set()
+            for task in self.policy.order(self.backlog):
+                if self._missed_deadline(task, now):
+                    self.backlog.remove(task)
+                    self._release_entry(task.schedule_entry_name)
+                    continue
+                resources = self._get_task_resources(task)
+                if self.lanes.is_free(resources) and not resources & waiting:
+                    self.lanes.acquire(resources, task)
+                    future = self.executor.submit(self._run_worker_task, task)
+                    self.futures.add(future)
+                    started.append((task, resources, future))
+                else:
+                    waiting |= resources
+
+            self.backlog = [
+                t for t in self.backlog if not any(t is s[0] for s in started)
+            ]
+
+        # Add callbacks outside of the lock, a callback runs immediately if the
+        # task has already finished and dispatches again itself.
+        for task, resources, future in started:
+            future.add_done_callback(partial(self._task_done, task, resources))
+
+    def _task_done(self, task, resources, future):
+        err = future.exception()
+        if err is not None:
+            logger.error(f"task {task.schedule_entry_name}/{task.task_id} failed")
+            logger.exception(err)
+
+        with self.dispatch_lock:
+            self.lanes.release(resources)
+            self.futures.discard(future)
+            self._release_entry(task.schedule_entry_name)
+
+        if not self.interrupt_flag.is_set():
+            self._dispatch_backlog()
+
+    def _release_entry(self, entry_name):
+        """Count one less backlogged or running task of an entry."""
+        with self.dispatch_lock:
+            self.busy_entries[entry_name] -= 1
+            if self.busy_entries[entry_name] <= 0:
+                del self.busy_entries[entry_name]
+
+    @staticmethod
+    def _missed_deadline(task, now):
+        """Return True if `task` may no longer start within its tolerance."""
+        if task.deadline is None or task.deadline >= now:
+            return False
+
+        msg = "skipping {}/{}, its deadline passed while waiting to run"
+        logger.warning(msg.format(task.schedule_entry_name, task.task_id))
+        return True
+
+    def _wait_for_running_tasks(self):
+        """Block until backlogged and running tasks have completed."""
+        if self.executor is None:
+            return
+
+        while True:
+            with self.dispatch_lock:
+                futures = list(self.futures)
+                if not futures and self.backlog:
+                    # resources were released while interrupted
+                    self._dispatch_backlog()
+                    futures = list(self.futures)
+            if not futures:
+                break
+            wait(futures)
+
+    def _get_task_resources(self, task):
+        names = self.entry_actions.get(task.schedule_entry_name, (task.action,))
+        resources = set()
+        for name in names:
+            action = action_loader.actions.get(name)
+            resources.update(get_action_resources(name, action))
+
+        return frozenset(resources)
+
+    def _run_task(self, task):
+        entry = ScheduleEntry.objects.get(name=task.schedule_entry_name)
+        task_result = self._initialize_task_result(task, entry)
+        token = self._register_running_task(task, entry)
+        started = timezone.now()
+        events.publish(
+            events.TASK_STARTED,
+            {
+                "schedule_entry": entry.name,
+                "task_id": task.task_id,
+                "started": convert_datetime_to_millisecond_iso_format(started),
+            },
+        )
+        try:
+            if entry.is_group:
+                status, detail, task_result.steps = self._call_task_group(
+                    task, entry, token
                 )
-                finalize_task_thread.start()
             else:
-                self._finalize_task_result(
-                    task_result, started, finished, status, detail
+                status, detail = self._call_task_action(task, entry, token=token)
+        finally:
+            with self.dispatch_lock:
+                self.running_tasks.pop((task.schedule_entry_name, task.task_id), None)
+        finished = timezone.now()
+        if entry.continuous:
+            idle_time = entry.get_idle_time((finished - started).total_seconds())
+            with self.dispatch_lock:
+                self.continuous_entries[entry.name] = monotonic() + idle_time
+        if settings.ASYNC_CALLBACK:
+            finalize_task_thread = threading.Thread(
+                target=self._finalize_task_result,
+                args=(task_result, started, finished, status, detail),
+                daemon=True,
+            )
+            finalize_task_thread.start()
+        else:
+            self._finalize_task_result(task_result, started, finished, status, detail)
+
+    def _run_worker_task(self, task):
+        """Run a task in an executor thread and close its database connection."""
+        try:
+            self._run_task(task)
+        finally:
+            close_old_connections()
+
+    def _register_running_task(self, task, entry):
+        """Return a cancellation token for `task`.
+
+        Tasks running an action that supports cancellation are tracked so they
+        may be preempted, see :meth:`_preempt_running_tasks`.
+
+        """
+        token = CancellationToken()
+        cancellable = any(
+            accepts_cancellation(action_loader.actions.get(action))
+            for action in entry.get_actions()
+        )
+        if cancellable:
+            with self.dispatch_lock:
+                self.running_tasks[(task.schedule_entry_name, task.task_id)] = (
+                    task,
+                    token,
+                )
+                self._start_preemption_monitor()
+
+        return token
+
+    def _start_preemption_monitor(self):
+        if settings.PREEMPTION_SLICE <= 0:
+            return
+
+        with self.dispatch_lock:
+            if self.preemption_monitor is not None:
+                return
+
+            self.preemption_monitor = threading.Thread(
+                target=self._monitor_preemption, name="PreemptionMonitor", daemon=True
+            )
+            self.preemption_monitor.start()
+
+    def _monitor_preemption(self):
+        """Check for tasks to preempt every slice while any can be cancelled."""
+        try:
+            while not self.interrupt_flag.wait(settings.PREEMPTION_SLICE):
+                with self.dispatch_lock:
+                    if not self.running_tasks:
+                        # decided under the lock so a new task starts another
+                        self.preemption_monitor = None
+                        return
+                try:
+                    self._preempt_running_tasks()
+                except Exception as err:
+                    logger.exception(f"preemption check failed: {err}")
+
+            with self.dispatch_lock:
+                self.preemption_monitor = None
+        finally:
+            connection.close()
+
+    def _preempt_running_tasks(self):
+        """Cancel running tasks that keep a higher priority task from starting.
+
+        A due task can only be blocked by a running task whose resources it
+        needs, which is every running task when tasks run one at a time.
+
+        """
+        now = self.timefn()
+        with self.dispatch_lock:
+            running = list(self.running_tasks.values())
+            due = [
+                (t.priority, t.schedule_entry_name, self._get_task_resources(t))
+                for t in self.backlog
+                if t.time <= now
+            ]
+            busy = set(self.busy_entries)
+        if not running:
+            return
+
+        due_entries = ScheduleEntry.objects.filter(
+            is_active=True, continuous=False, next_task_time__lte=now
+        ).exclude(name__in=busy)
+        for entry in due_entries:
+            resources = set()
+            for action in entry.get_actions():
+                resources |= get_action_resources(
+                    action, action_loader.actions.get(action)
                 )
+            due.append((entry.priority, entry.name, resources))
+
+        for task, token in running:
+            resources = self._get_task_resources(task)
+            for priority, entry_name, due_resources in sorted(due):
+                if priority >= task.priority:
+                    break
+                if entry_name == task.schedule_entry_name:
+                    continue
+                if self.executor is None or resources & due_resources:
+                    logger.info(
+                        f"preempting {task.schedule_entry_name}/{task.task_id} "
+                        + f"for {entry_name}"
+                    )
+                    token.cancel(f"preempted by {entry_name}")
+                    break
+
+    def _prepare_next_task(self):
+        """Let the next task's action configure hardware before it is due.
+
+        Actions may define ``prepare(sensor, schedule_entry)``, which is called
+        once per upcoming task while the scheduler is idle and the task is due
+        within ``TUNE_AHEAD_WINDOW`` seconds, so retuning and settling happen
+        before the task's start time rather than after it.
+
+        """
+        if not settings.TUNE_AHEAD_WINDOW or not self.task_queue:
+            return
+
+        if self.dispatch_paused.is_set():
+            return
 
-    def _initialize_task_result(self) -> TaskResult:
+        task = self.task_queue.next_task
+        task_key = (task.schedule_entry_name, task.time)
+        if task_key == self.prepared_task:
+            return
+
+        if task.time - self.timefn() > settings.TUNE_AHEAD_WINDOW:
+            return
+
+        prepare = getattr(action_loader.actions.get(task.action), "prepare", None)
+        if prepare is None:
+            return
+
+        # claim the task's lanes so no task starts using the hardware meanwhile,
+        # tasks on other lanes are still dispatched while it is prepared
+        resources = self._get_task_resources(task)
+        with self.dispatch_lock:
+            if not self.lanes.is_free(resources):
+                return
+            self.lanes.acquire(resources, task)
+
+        try:
+            entry = ScheduleEntry.objects.get(name=task.schedule_entry_name)
+            logger.debug(f"preparing hardware for {task_key[0]} at {task.time}")
+            prepare(self.sensor, self._get_schedule_entry_json(entry))
+        except Exception as err:
+            logger.warning(f"unable to prepare {task.action}: {err}")
+        finally:
+            with self.dispatch_lock:
+                self.lanes.release(resources)
+
+        self.prepared_task = task_key
+        if self.executor is not None and not self.interrupt_flag.is_set():
+            # tasks may have been held back by the claimed lanes
+            self._dispatch_backlog()
+
+    def _initialize_task_result(self, task, entry) -> TaskResult:
         """Initalize an 'in-progress' result so it exists when action runs."""
-        tid = self.task.task_id
-        task_result = TaskResult(schedule_entry=self.entry, task_id=tid)
+        tid = task.task_id
+        task_result = TaskResult(schedule_entry=entry, task_id=tid)
         logger.debug(f"Creating task result with task id = {tid}")
         task_result.save()
         if tid > 1:
@@ -168,31 +544,49 @@ class Scheduler(threading.Thread):
                 # raise Exception(f"Task ID Mismatch! last task id = {tid-1} current task id = {tid}")
         return task_result
 
-    def _call_task_action(self):
-        entry_name = self.task.schedule_entry_name
-        task_id = self.task.task_id
+    @staticmethod
+    def _get_schedule_entry_json(schedule_entry):
         from schedule.serializers import ScheduleEntrySerializer
 
-        schedule_entry = ScheduleEntry.objects.get(name=entry_name)
-
         schedule_serializer = ScheduleEntrySerializer(
             schedule_entry, context={"request": schedule_entry.request}
         )
         schedule_entry_json = schedule_serializer.to_sigmf_json()
-        schedule_entry_json["id"] = entry_name
+        schedule_entry_json["id"] = schedule_entry.name
+        return schedule_entry_json
+
+    def _call_task_action(self, task, schedule_entry, action=None, token=None):
+        entry_name = task.schedule_entry_name
+        task_id = task.task_id
+        schedule_entry_json = self._get_schedule_entry_json(schedule_entry)
+        if action is None:
+            action_caller = task.action_caller
+        else:
+            action_caller = action_loader.actions[action]
+        kwargs = {}
+        if token is not None and accepts_cancellation(action_caller):
+            kwargs["cancellation_token"] = token
 
         try:
             logger.debug(
                 f"running task {entry_name}/{task_id} with sigan: {self.sensor.signal_analyzer}"
             )
             start = perf_counter()
-            detail = self.task.action_caller(self.sensor, schedule_entry_json, task_id)
+            detail = action_caller(self.sensor, schedule_entry_json, task_id, **kwargs)
             stop = perf_counter()
             logger.debug(f"Action completed in {stop-start:.2f} s")
             self.delayfn(0)  # let other threads run
             status = "success"
             if not isinstance(detail, str):
                 detail = ""
+            if kwargs and token.cancelled:
+                # the action returned early
+                status = "cancelled"
+                detail = detail or token.reason
+        except TaskCancelled as err:
+            detail = str(err) or "cancelled"
+            logger.info(f"task {entry_name}/{task_id} cancelled: {detail}")
+            status = "cancelled"
         except Exception as err:
             detail = str(err)
             logger.exception(f"action failed: {detail}")
@@ -200,7 +594,45 @@ class Scheduler(threading.Thread):
 
         return status, detail[:MAX_DETAIL_LEN]
 
+    def _call_task_group(self, task, schedule_entry, token=None):
+        """Run each of the entry's actions back-to-back as one task.
+
+        The group stops at the first failed step, since later steps usually
+        depend on the hardware state or data left by earlier ones.
+
+        :return: the group status and detail, and a list of step results
+
+        """
+        steps = []
+        for index, action in enumerate(schedule_entry.get_actions()):
+            started = timezone.now()
+            with task_group_step(index):
+                status, detail = self._call_task_action(
+                    task, schedule_entry, action, token
+                )
+            finished = timezone.now()
+            steps.append(
+                {
+                    "action": action,
+                    "status": status,
+                    "detail": detail,
+                    "started": convert_datetime_to_millisecond_iso_format(started),
+                    "finished": convert_datetime_to_millisecond_iso_format(finished),
+                    "duration": (finished - started).total_seconds(),
+                }
+            )
+            if status == "failure":
+                detail = f"{action} failed: {detail}"
+                return status, detail[:MAX_DETAIL_LEN], steps
+            if status == "cancelled" or (token is not None and token.cancelled):
+                detail = f"cancelled after {action}: {detail or token.reason}"
+                return "cancelled", detail[:MAX_DETAIL_LEN], steps
+
+        detail = "; ".join(step["detail"] for step in steps if step["detail"])
+        return "success", detail[:MAX_DETAIL_LEN], steps
+
     def _finalize_task_result(self, task_result, started, finished, status, detail):
+        entry = task_result.schedule_entry
         task_result.started = started
         task_result.finished = finished
         task_result.duration = finished - started
@@ -208,10 +640,10 @@ class Scheduler(threading.Thread):
         task_result.detail = detail
         task_result.save()
 
-        if self.entry.callback_url:
+        if entry.callback_url:
             try:
-                logger.debug("Trying callback to URL: " + self.entry.callback_url)
-                context = {"request": self.entry.request}
+                logger.debug("Trying callback to URL: " + entry.callback_url)
+                context = {"request": entry.request}
                 result_json = TaskResultSerializer(task_result, context=context).data
                 verify_ssl = settings.CALLBACK_SSL_VERIFICATION
                 if settings.CALLBACK_SSL_VERIFICATION:
@@ -222,7 +654,7 @@ class Scheduler(threading.Thread):
                     headers = {"Content-Type": "application/json"}
 
                     response = requests.post(
-                        self.entry.callback_url,
+                        entry.callback_url,
                         data=json.dumps(result_json),
                         headers=headers,
                         verify=verify_ssl,
@@ -232,10 +664,10 @@ class Scheduler(threading.Thread):
                     self._callback_response_handler(response, task_result)
                 else:
                     logger.debug("Posting callback with token")
-                    token = self.entry.owner.auth_token
+                    token = entry.owner.auth_token
                     headers = {"Authorization": "Token " + str(token)}
                     response = requests.post(
-                        self.entry.callback_url,
+                        entry.callback_url,
                         json=result_json,
                         headers=headers,
                         verify=verify_ssl,
@@ -250,6 +682,21 @@ class Scheduler(threading.Thread):
         else:
             task_result.save()
 
+        events.publish(
+            events.TASK_FINISHED,
+            {
+                "schedule_entry": entry.name,
+                "task_id": task_result.task_id,
+                "status": task_result.status,
+                "started": convert_datetime_to_millisecond_iso_format(started),
+                "finished": convert_datetime_to_millisecond_iso_format(finished),
+            },
+        )
+
+        if status == "cancelled":
+            # neither a failure nor evidence that the sensor is healthy
+            return
+
         with self.task_status_lock:
             if status == "failure" and self.last_status == "failure":
                 self.consecutive_failures = self.consecutive_failures + 1
@@ -258,12 +705,51 @@ class Scheduler(threading.Thread):
             else:
                 self.consecutive_failures = 0
             self.last_status = status
-            if self.consecutive_failures >= settings.MAX_FAILURES:
-                trigger_api_restart.send(sender=self.__class__)
-                # prevent more tasks from being run
-                # restart can cause missing db task result ids
-                # if tasks continue to run waiting for restart
-                thread.stop()
+            recover = (
+                self.consecutive_failures >= settings.MAX_FAILURES
+                and not self.dispatch_paused.is_set()
+            )
+            if recover:
+                self.dispatch_paused.set()
+
+        if recover:
+            self._recover_hardware()
+
+    def _recover_hardware(self):
+        """Ask trigger_api_restart receivers to recover the hardware.
+
+        No task is started while recovering. If the hardware is not recovered,
+        tasks stay paused and the scheduler stops.
+
+        """
+        recovered = False
+        try:
+            # receivers return True if they recovered the hardware
+            responses = trigger_api_restart.send(sender=self.__class__)
+            recovered = any(result is True for _, result in responses)
+        except Exception as err:
+            logger.exception(f"hardware recovery failed: {err}")
+
+        if not recovered:
+            # prevent more tasks from being run
+            # restart can cause missing db task result ids
+            # if tasks continue to run waiting for restart
+            thread.stop()
+            return
+
+        logger.info("hardware recovered, resuming tasks")
+        with self.task_status_lock:
+            self.consecutive_failures = 0
+        self.dispatch_paused.clear()
+        if self.executor is not None and not self.interrupt_flag.is_set():
+            self._dispatch_backlog()
+
+    def _wait_while_paused(self):
+        """Wait for hardware recovery, returning False if interrupted."""
+        while self.dispatch_paused.is_set():
+            if self.interrupt_flag.wait(0.1):
+                return False
+        return True
 
     @staticmethod
     def _callback_response_handler(resp, task_result):
@@ -278,38 +764,131 @@ class Scheduler(threading.Thread):
 
     def _queue_pending_tasks(self, schedule_snapshot):
         pending_queue = TaskQueue()
+        if self.restored_tasks:
+            self._queue_restored_tasks(pending_queue)
         for entry in schedule_snapshot:
-            task_time = self._take_pending_task_time(entry)
-            self._cancel_if_completed(entry)
-            if task_time is None:
+            if entry.name in self.busy_entries:
+                # previous task has not finished, past times are compressed
+                # once it has
                 continue
 
-            task_id = entry.get_next_task_id()
-            entry.save(update_fields=("next_task_id",))
+            if entry.continuous:
+                task_times = self._take_continuous_task_time(entry)
+            else:
+                task_times = self._take_pending_task_times(entry)
+            self._cancel_if_completed(entry)
+            if task_times:
+                self.entry_actions[entry.name] = entry.get_actions()
             pri = entry.priority
             action = entry.action
-            pending_queue.enter(task_time, pri, action, entry.name, task_id)
+            for task_time in task_times:
+                task_id = entry.get_next_task_id()
+                entry.save(update_fields=("next_task_id",))
+                deadline = entry.get_deadline(task_time)
+                pending_queue.enter(
+                    task_time, pri, action, entry.name, task_id, deadline
+                )
 
         return pending_queue
 
-    def _take_pending_task_time(self, entry):
+    def _queue_restored_tasks(self, pending_queue):
+        """Queue the pending tasks saved by the previous scheduler.
+
+        Tasks that may no longer start within their entry's `tolerance` are
+        dropped, and only the most recent task of an entry without one is
+        kept, as when the sensor is busy.
+
+        """
+        now = self.timefn()
+        restored, self.restored_tasks = self.restored_tasks, {}
+        entries = ScheduleEntry.objects.in_bulk(list(restored))
+        for name, tasks in restored.items():
+            entry = entries.get(name)
+            if entry is None or (not entry.is_active and entry.interval):
+                # deleted or deactivated, one-shot entries are inactive once
+                # their task is taken
+                continue
+
+            if entry.tolerance is None:
+                kept = tasks[-1:]
+            else:
+                kept = [t for t in tasks if t.deadline is None or t.deadline >= now]
+            if len(kept) < len(tasks):
+                logger.warning(
+                    f"skipping {len(tasks) - len(kept)} restored {name} tasks"
+                )
+
+            self.entry_actions[name] = entry.get_actions()
+            for task in kept:
+                pending_queue.enter(*task)
+
+    def _take_pending_task_times(self, entry):
         task_times = entry.take_pending()
         entry.save(update_fields=("next_task_time", "is_active"))
         if not task_times:
-            return None
+            return []
 
-        most_recent = self._compress_past_task_times(task_times, entry.name)
-        return most_recent
+        return self._compress_past_task_times(task_times, entry)
 
-    @staticmethod
-    def _compress_past_task_times(past, schedule_entry_name):
-        npast = len(past)
-        if npast > 1:
+    def _take_continuous_task_time(self, entry):
+        """Return the current time if a continuous entry may start a task.
+
+        Continuous entries don't wait for a time slot, a task starts whenever
+        the previous one has finished and the duty cycle allows.
+
+        """
+        now = self.timefn()
+        if entry.next_task_time > now:
+            return []
+
+        if entry.stop is not None and now >= entry.stop:
+            entry.next_task_time = entry.stop
+            entry.save(update_fields=("next_task_time",))
+            with self.dispatch_lock:
+                self.continuous_entries.pop(entry.name, None)
+            return []
+
+        with self.dispatch_lock:
+            resume_at = self.continuous_entries.setdefault(entry.name, 0)
+        if monotonic() < resume_at:
+            return []
+
+        if entry.next_task_time != now:
+            entry.next_task_time = now
+            entry.save(update_fields=("next_task_time",))
+
+        return [now]
+
+    def _continuous_task_ready(self):
+        """Return :obj:`True` if a continuous entry may start another task."""
+        now = monotonic()
+        with self.dispatch_lock:
+            return any(
+                name not in self.busy_entries and now >= resume_at
+                for name, resume_at in self.continuous_entries.items()
+            )
+
+    def _compress_past_task_times(self, past, entry):
+        """Drop past task times that can no longer start on time.
+
+        Only the most recent time is kept, unless the entry has a `tolerance`,
+        in which case every time that may still start within it is kept.
+
+        """
+        if entry.tolerance is None:
+            kept = past[-1:]
+        else:
+            now = self.timefn()
+            # at most tolerance + 1 times fit in the window since interval >= 1
+            window = past[-(entry.tolerance + 1) :]
+            kept = [t for t in window if t + entry.tolerance >= now] or past[-1:]
+
+        nskipped = len(past) - len(kept)
+        if nskipped:
             msg = "skipping {} {} tasks with times in the past"
-            logger.warning(msg.format(npast - 1, schedule_entry_name))
+            logger.warning(msg.format(nskipped, entry.name))
 
-        most_recent = past[-1]
-        return most_recent
+        return list(kept)
 
     def _queue_upcoming_tasks(self, schedule_snapshot):
         upcoming_queue = TaskQueue()
@@ -319,7 +898,8 @@ class Scheduler(threading.Thread):
             pri = entry.priority
             action = entry.action
             for t in task_times:
-                upcoming_queue.enter(t, pri, action, entry.name, task_id)
+                deadline = entry.get_deadline(t)
+                upcoming_queue.enter(t, pri, action, entry.name, task_id, deadline)
 
         return upcoming_queue
 
@@ -387,27 +967,71 @@ class Scheduler(threading.Thread):
                 )
 
     def reset_next_task_id(self):
-        # reset next task id
-        for entry in self.schedule:
-            count = TaskResult.objects.filter(schedule_entry=entry).count()
-            if count > 0:
-                last_task_id = TaskResult.objects.filter(schedule_entry=entry).order_by("task_id")[count-1].task_id
+        """Resume task ids after the last result or restored task of each entry.
+
+        Pending tasks saved in the last checkpoint are restored first. If the
+        previous scheduler stopped cleanly and the cursors in its checkpoint
+        match the schedule, task ids are already consistent.
+
+        """
+        checkpoint = load_checkpoint()
+        restored_ids = {}
+        if checkpoint is not None:
+            started = self._get_started_tasks(checkpoint["pending"])
+            for task in checkpoint["pending"]:
+                key = (task.schedule_entry_name, task.task_id)
+                if key in started:
+                    continue
+                self.restored_tasks.setdefault(key[0], []).append(task)
+                restored_ids[key[0]] = max(restored_ids.get(key[0], 0), key[1])
+            if self.restored_tasks:
+                n = sum(len(tasks) for tasks in self.restored_tasks.values())
+                logger.info(f"restored {n} pending tasks from checkpoint")
+
+            cursors = dict(
+                ScheduleEntry.objects.filter(is_active=True).values_list(
+                    "name", "next_task_id"
+                )
+            )
+            if checkpoint["clean"] and checkpoint["cursors"] == cursors:
+                logger.debug("task ids are consistent with scheduler checkpoint")
+                return
+
+        entries = ScheduleEntry.objects.filter(is_active=True).annotate(
+            last_task_id=Max("task_results__task_id")
+        )
+        for entry in entries:
+            last_task_id = max(entry.last_task_id or 0, restored_ids.get(entry.name, 0))
+            if last_task_id > 0:
                 if entry.next_task_id != last_task_id + 1:
                     logger.info(f"Changing next_task_id from {entry.next_task_id} to {last_task_id + 1}")
                     entry.next_task_id = last_task_id + 1
                     entry.save(update_fields=("next_task_id",))
 
+    @staticmethod
+    def _get_started_tasks(tasks):
+        """Return (entry name, task id) of each of `tasks` that has a result."""
+        names = {t.schedule_entry_name for t in tasks}
+        task_ids = {t.task_id for t in tasks}
+        results = TaskResult.objects.filter(
+            schedule_entry__name__in=names, task_id__in=task_ids
+        )
+        return set(results.values_list("schedule_entry__name", "task_id"))
+
 
 @contextmanager
-def minimum_duration(blocking):
+def minimum_duration(blocking, until=None):
     """Ensure a code block is entered at most once per timefn rollover.
 
     :param blocking: if False, minimum duration is 0
+    :param until: optional callable, stop waiting as soon as it returns True
 
     """
     start_time = utils.timefn()
     yield
     while blocking and utils.timefn() == start_time:
+        if until is not None and until():
+            break
         utils.delayfn(0.01)
 
 
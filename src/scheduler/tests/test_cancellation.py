@@ -0,0 +1,38 @@
+import pytest
+
+from scheduler.cancellation import (
+    CancellationToken,
+    TaskCancelled,
+    accepts_cancellation,
+)
+
+
+class CancellableAction:
+    def __call__(self, sensor, schedule_entry, task_id, cancellation_token=None):
+        pass
+
+
+def plain_action(sensor, schedule_entry, task_id):
+    pass
+
+
+def kwargs_action(sensor, schedule_entry, task_id, **kwargs):
+    pass
+
+
+def test_accepts_cancellation():
+    assert accepts_cancellation(CancellableAction())
+    assert accepts_cancellation(kwargs_action)
+    assert not accepts_cancellation(plain_action)
+    assert not accepts_cancellation(None)
+
+
+def test_cancelled_token_raises_with_reason():
+    token = CancellationToken()
+    token.raise_if_cancelled()
+    token.cancel("preempted by test")
+    token.cancel("ignored")
+    assert token.cancelled
+    assert token.wait(0)
+    with pytest.raises(TaskCancelled, match="preempted by test"):
+        token.raise_if_cancelled()
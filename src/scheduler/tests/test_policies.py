@@ -0,0 +1,31 @@
+from scheduler.policies import EarliestDeadlineFirstPolicy, PriorityPolicy, get_policy
+from tasks.models import Task
+
+
+def make_task(name, time, priority, deadline=None):
+    return Task(time, priority, "test_monitor_sigan", name, 1, deadline)
+
+
+def test_priority_policy_orders_by_time_then_priority():
+    tasks = [
+        make_task("late", 2, 1),
+        make_task("lopri", 1, 20),
+        make_task("hipri", 1, 10, deadline=10),
+    ]
+    ordered = PriorityPolicy().order(tasks)
+    assert [t.schedule_entry_name for t in ordered] == ["hipri", "lopri", "late"]
+
+
+def test_edf_policy_runs_least_slack_first():
+    tasks = [
+        make_task("tolerant", 1, 10, deadline=10),
+        make_task("strict", 2, 20),
+        make_task("tight", 1, 20, deadline=3),
+    ]
+    ordered = EarliestDeadlineFirstPolicy().order(tasks)
+    assert [t.schedule_entry_name for t in ordered] == ["strict", "tight", "tolerant"]
+
+
+def test_unknown_policy_falls_back_to_priority():
+    assert isinstance(get_policy("edf"), EarliestDeadlineFirstPolicy)
+    assert isinstance(get_policy("nonsense"), PriorityPolicy)
@@ -0,0 +1,43 @@
+from scheduler.resources import (
+    EXCLUSIVE_RESOURCES,
+    GPS,
+    SIGAN,
+    ResourceLanes,
+    get_action_resources,
+)
+
+
+class DeclaredResourcesAction:
+    resources = ("sigan", "cpu")
+
+
+def test_undeclared_action_claims_all_hardware(settings):
+    settings.ACTION_RESOURCES = {}
+    assert get_action_resources("undeclared", object()) == EXCLUSIVE_RESOURCES
+
+
+def test_action_attribute_declares_resources(settings):
+    settings.ACTION_RESOURCES = {}
+    action = DeclaredResourcesAction()
+    assert get_action_resources("declared", action) == {SIGAN}
+
+
+def test_setting_overrides_action_attribute(settings):
+    settings.ACTION_RESOURCES = {"declared": ["gps"]}
+    action = DeclaredResourcesAction()
+    assert get_action_resources("declared", action) == {GPS}
+
+
+def test_cpu_only_action_claims_nothing(settings):
+    settings.ACTION_RESOURCES = {"post_process": ["cpu"]}
+    assert get_action_resources("post_process") == frozenset()
+
+
+def test_resource_lanes():
+    lanes = ResourceLanes()
+    lanes.acquire({SIGAN}, "task")
+    assert not lanes.is_free({SIGAN, GPS})
+    assert lanes.is_free({GPS})
+    assert lanes.holder(SIGAN) == "task"
+    lanes.release({SIGAN})
+    assert lanes.is_free({SIGAN})
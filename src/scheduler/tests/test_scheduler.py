@@ -1,16 +1,22 @@
 import threading
 import time
 
+import numpy as np
 import pytest
 import requests
 import requests_mock
 from django import conf
+from django.dispatch import Signal
+from scos_actions.signals import measurement_action_completed
 
+from scheduler import scheduler as scheduler_module
+from scheduler.checkpoint import load_checkpoint, save_checkpoint
 from scheduler.scheduler import Scheduler, minimum_duration
-from tasks.models import TaskResult
+from tasks.models import Acquisition, Task, TaskResult
 
 from .utils import (
     BAD_ACTION_STR,
+    actions,
     advance_testclock,
     create_action,
     create_bad_action,
@@ -178,6 +184,19 @@ def test_compress_past_times_offset(test_scheduler):
     assert len(s.task_queue) == 3
 
 
+@pytest.mark.django_db
+def test_tolerance_keeps_past_times_in_window(test_scheduler):
+    """Past task times within an entry's tolerance should all be run."""
+    create_entry("t", 1, -10, 5, 1, "test_monitor_sigan", tolerance=2)
+    s = test_scheduler
+    s.run(blocking=False)
+    # past times -10 through -3 are skipped, -2, -1 and 0 are run,
+    # then 1, 2, 3, and 4 are queued
+    assert TaskResult.objects.count() == 3
+    assert len(s.task_queue) == 4
+    assert [task.deadline for task in s.task_queue] == [3, 4, 5, 6]
+
+
 # XXX: refactor
 @pytest.mark.django_db
 def test_next_task_time_value_when_start_changes(test_scheduler):
@@ -492,3 +511,353 @@ def test_task_pushed_past_stop_still_runs(test_scheduler):
 
 def test_str():
     str(Scheduler())
+
+
+@pytest.mark.django_db(transaction=True)
+def test_non_conflicting_tasks_run_concurrently(testclock, settings):
+    """Tasks using different resources should not wait on each other."""
+    settings.SCHEDULER_MAX_WORKERS = 2
+    settings.ACTION_RESOURCES = {"sigan_action": ["sigan"], "gps_action": ["gps"]}
+    gps_started = threading.Event()
+
+    def sigan_action(sensor, schedule_entry_json, task_id):
+        # would time out if tasks were run one at a time
+        if not gps_started.wait(timeout=5):
+            raise Exception("gps task did not run concurrently")
+
+    def gps_action(sensor, schedule_entry_json, task_id):
+        gps_started.set()
+
+    actions["sigan_action"] = sigan_action
+    actions["gps_action"] = gps_action
+    create_entry("sigan", 10, None, None, None, "sigan_action")
+    create_entry("gps", 20, None, None, None, "gps_action")
+    s = Scheduler()
+    advance_testclock(s.timefn, 1)
+    s.run(blocking=False)
+    statuses = TaskResult.objects.values_list("status", flat=True)
+    assert list(statuses) == ["success", "success"]
+    assert not s.futures
+    assert not s.backlog
+
+
+@pytest.mark.django_db(transaction=True)
+def test_conflicting_tasks_run_in_priority_order(testclock, settings):
+    """Tasks sharing a resource should run one at a time by priority."""
+    settings.SCHEDULER_MAX_WORKERS = 2
+    settings.ACTION_RESOURCES = {"lane_action": ["sigan"]}
+    order = []
+
+    def lane_action(sensor, schedule_entry_json, task_id):
+        order.append(schedule_entry_json["name"])
+
+    actions["lane_action"] = lane_action
+    create_entry("lopri", 20, None, None, None, "lane_action")
+    create_entry("hipri", 10, None, None, None, "lane_action")
+    s = Scheduler()
+    advance_testclock(s.timefn, 1)
+    s.run(blocking=False)
+    assert order == ["hipri", "lopri"]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_task_skipped_when_deadline_passes_behind_busy_lane(testclock, settings):
+    """A task should not start once its tolerance ran out waiting for a lane."""
+    settings.SCHEDULER_MAX_WORKERS = 2
+    settings.ACTION_RESOURCES = {"slow_action": ["sigan"], "late_action": ["sigan"]}
+    ran = []
+
+    def slow_action(sensor, schedule_entry_json, task_id):
+        advance_testclock(s.timefn, 3)  # past the waiting task's deadline
+
+    def late_action(sensor, schedule_entry_json, task_id):
+        ran.append(task_id)
+
+    actions["slow_action"] = slow_action
+    actions["late_action"] = late_action
+    create_entry("slow", 10, None, None, None, "slow_action")
+    create_entry("late", 20, None, None, None, "late_action", tolerance=1)
+    s = Scheduler()
+    advance_testclock(s.timefn, 1)
+    s.run(blocking=False)
+    assert not ran
+    assert list(TaskResult.objects.values_list("schedule_entry__name", flat=True)) == [
+        "slow"
+    ]
+    assert not s.backlog
+    assert not s.busy_entries
+
+
+@pytest.mark.django_db
+def test_next_task_prepared_once_before_it_runs(test_scheduler, settings):
+    """An action's `prepare` hook should run once while waiting for its task."""
+    settings.TUNE_AHEAD_WINDOW = 5
+    prepared = []
+    ran = []
+
+    def tuned_action(sensor, schedule_entry_json, task_id):
+        ran.append(schedule_entry_json["name"])
+
+    def prepare(sensor, schedule_entry_json):
+        assert not ran
+        prepared.append(schedule_entry_json["name"])
+
+    tuned_action.prepare = prepare
+    actions["tuned_action"] = tuned_action
+    create_entry("tuned", 10, 2, None, None, "tuned_action")
+    s = test_scheduler
+    s.run(blocking=False)
+    s.run(blocking=False)
+    assert prepared == ["tuned"]
+    advance_testclock(s.timefn, 2)
+    s.run(blocking=False)
+    assert prepared == ["tuned"]
+    assert ran == ["tuned"]
+
+
+@pytest.mark.django_db
+def test_next_task_prepared_outside_dispatch_lock(test_scheduler, settings):
+    """Preparing hardware should claim the task's lanes, not the dispatch lock."""
+    settings.TUNE_AHEAD_WINDOW = 5
+    settings.ACTION_RESOURCES = {"tuned_action": ["sigan"]}
+    lanes_free = []
+
+    def tuned_action(sensor, schedule_entry_json, task_id):
+        pass
+
+    def prepare(sensor, schedule_entry_json):
+        def check_lanes():
+            if s.dispatch_lock.acquire(timeout=1):
+                lanes_free.append(s.lanes.is_free({"sigan"}))
+                s.dispatch_lock.release()
+
+        checker = threading.Thread(target=check_lanes)
+        checker.start()
+        checker.join()
+
+    tuned_action.prepare = prepare
+    actions["tuned_action"] = tuned_action
+    create_entry("tuned", 10, 2, None, None, "tuned_action")
+    s = test_scheduler
+    s.run(blocking=False)
+    assert lanes_free == [False]
+    assert s.lanes.is_free({"sigan"})
+
+
+@pytest.mark.django_db
+def test_task_group_runs_actions_back_to_back(test_scheduler):
+    """A task group should run its actions in order as one task result."""
+    order = []
+
+    def first_step(sensor, schedule_entry_json, task_id):
+        order.append(("first", task_id))
+        return "first done"
+
+    def second_step(sensor, schedule_entry_json, task_id):
+        order.append(("second", task_id))
+
+    actions["first_step"] = first_step
+    actions["second_step"] = second_step
+    create_entry(
+        "group", 10, None, None, None, "first_step", group_actions=["second_step"]
+    )
+    s = test_scheduler
+    advance_testclock(s.timefn, 1)
+    s.run(blocking=False)
+    assert order == [("first", 1), ("second", 1)]
+    result = TaskResult.objects.get()
+    assert result.status == "success"
+    assert result.detail == "first done"
+    assert [step["action"] for step in result.steps] == ["first_step", "second_step"]
+    assert [step["status"] for step in result.steps] == ["success", "success"]
+
+
+@pytest.mark.django_db
+def test_task_group_stops_at_failed_step(test_scheduler):
+    """A failed step should fail the group and skip the remaining steps."""
+    cb, flag = create_action()
+    create_bad_action()
+    create_entry(
+        "group", 10, None, None, None, "bad_action", group_actions=[cb.__name__]
+    )
+    s = test_scheduler
+    advance_testclock(s.timefn, 1)
+    s.run(blocking=False)
+    assert not flag.is_set()
+    result = TaskResult.objects.get()
+    assert result.status == "failure"
+    assert result.detail == f"bad_action failed: {BAD_ACTION_STR}"
+    assert len(result.steps) == 1
+
+
+@pytest.mark.django_db
+def test_task_group_steps_store_separate_recordings(test_scheduler):
+    """Each step of a group should store its data under its own recording id."""
+
+    def storing_step(sensor, schedule_entry_json, task_id):
+        measurement_action_completed.send(
+            sender=storing_step,
+            task_id=task_id,
+            data=np.zeros(4, dtype=np.complex64),
+            metadata={"global": {"ntia-scos:schedule": schedule_entry_json}},
+        )
+
+    actions["first_gain"] = storing_step
+    actions["second_gain"] = storing_step
+    create_entry(
+        "group", 10, None, None, None, "first_gain", group_actions=["second_gain"]
+    )
+    s = test_scheduler
+    advance_testclock(s.timefn, 1)
+    s.run(blocking=False)
+    assert TaskResult.objects.get().status == "success"
+    acquisitions = Acquisition.objects.all()
+    assert [a.recording_id for a in acquisitions] == [1, 2]
+    assert len({a.data.name for a in acquisitions}) == 2
+
+
+@pytest.mark.django_db
+def test_continuous_entry_runs_back_to_back(test_scheduler):
+    """A continuous entry should not wait for the next second to run again."""
+    create_entry("c", 10, None, None, None, "test_monitor_sigan", continuous=True)
+    s = test_scheduler
+    advance_testclock(s.timefn, 1)
+    for _ in range(3):
+        s.run(blocking=False)
+    task_ids = TaskResult.objects.values_list("task_id", flat=True)
+    assert list(task_ids) == [1, 2, 3]
+    assert s._continuous_task_ready()
+
+
+@pytest.mark.django_db
+def test_continuous_entry_respects_duty_cycle(test_scheduler):
+    """A duty-cycled entry should idle in proportion to its task duration."""
+
+    def slow_action(sensor, schedule_entry_json, task_id):
+        time.sleep(0.05)
+
+    actions["slow_action"] = slow_action
+    create_entry(
+        "c", 10, None, None, None, "slow_action", continuous=True, duty_cycle=0.01
+    )
+    s = test_scheduler
+    advance_testclock(s.timefn, 1)
+    s.run(blocking=False)
+    s.run(blocking=False)
+    assert TaskResult.objects.count() == 1
+    assert not s._continuous_task_ready()
+
+
+@pytest.mark.django_db
+def test_continuous_entry_stops(test_scheduler):
+    """A continuous entry should be deactivated at its stop time."""
+    entry = create_entry("c", 10, 1, 3, None, "test_monitor_sigan", continuous=True)
+    s = test_scheduler
+    advance_testclock(s.timefn, 1)
+    s.run(blocking=False)
+    advance_testclock(s.timefn, 2)
+    s.run(blocking=False)
+    entry.refresh_from_db()
+    assert not entry.is_active
+    assert TaskResult.objects.count() == 1
+    assert not s.continuous_entries
+
+
+@pytest.mark.django_db(transaction=True)
+def test_low_priority_task_preempted(testclock, settings):
+    """A cancellable task should give way when a higher priority task is due."""
+    settings.PREEMPTION_SLICE = 0.01
+
+    def long_action(sensor, schedule_entry_json, task_id, cancellation_token=None):
+        advance_testclock(s.timefn, 1)  # hipri comes due
+        cancellation_token.wait(timeout=5)
+        cancellation_token.raise_if_cancelled()
+
+    actions["long_action"] = long_action
+    create_entry("lopri", 20, 1, None, None, "long_action")
+    create_entry("hipri", 10, 2, None, None, "test_monitor_sigan")
+    s = Scheduler()
+    advance_testclock(s.timefn, 1)
+    s.run(blocking=False)
+    lopri = TaskResult.objects.get(schedule_entry__name="lopri")
+    assert lopri.status == "cancelled"
+    assert lopri.detail == "preempted by hipri"
+    assert s.consecutive_failures == 0
+    s.run(blocking=False)
+    assert TaskResult.objects.get(schedule_entry__name="hipri").status == "success"
+
+
+@pytest.mark.django_db
+def test_reset_next_task_id_follows_last_result(test_scheduler):
+    entry = create_entry("t", 10, 100, None, 100, "test_monitor_sigan")
+    for task_id in (1, 2, 3):
+        TaskResult(schedule_entry=entry, task_id=task_id).save()
+    entry.next_task_id = 10
+    entry.save()
+    test_scheduler.reset_next_task_id()
+    entry.refresh_from_db()
+    assert entry.next_task_id == 4
+
+
+@pytest.mark.django_db
+def test_pending_tasks_restored_from_checkpoint(test_scheduler, settings, tmp_path):
+    """Tasks taken but not started before a restart should still run."""
+    settings.SCHEDULER_CHECKPOINT_FILE = str(tmp_path / "checkpoint.json")
+    entry = create_entry("t", 10, 100, None, 100, "test_monitor_sigan")
+    entry.next_task_id = 3
+    entry.save()
+    started = Task(1, 10, "test_monitor_sigan", "t", 1)
+    TaskResult(schedule_entry=entry, task_id=started.task_id).save()
+    pending = Task(1, 10, "test_monitor_sigan", "t", 2)
+    save_checkpoint({"t": 3}, [started, pending])
+    s = test_scheduler
+    advance_testclock(s.timefn, 1)
+    s.run(blocking=False)
+    results = TaskResult.objects.values_list("task_id", "status")
+    assert list(results) == [(1, "in-progress"), (2, "success")]
+    entry.refresh_from_db()
+    assert entry.next_task_id == 3
+    checkpoint = load_checkpoint()
+    assert checkpoint["clean"]
+    assert checkpoint["cursors"] == {"t": 3}
+    assert checkpoint["pending"] == []
+
+
+@pytest.mark.django_db
+def test_unchanged_checkpoint_not_rewritten(test_scheduler, settings, tmp_path):
+    settings.SCHEDULER_CHECKPOINT_FILE = str(tmp_path / "checkpoint.json")
+    create_entry("t", 10, 100, None, 100, "test_monitor_sigan")
+    s = test_scheduler
+    s.pending_tasks = [Task(100, 10, "test_monitor_sigan", "t", 1)]
+    s._save_checkpoint()
+    checkpoint_file = tmp_path / "checkpoint.json"
+    checkpoint_file.unlink()
+    s._save_checkpoint()
+    assert not checkpoint_file.exists()
+
+    s.pending_tasks.append(Task(200, 10, "test_monitor_sigan", "t", 2))
+    s._save_checkpoint()
+    assert checkpoint_file.exists()
+
+
+@pytest.mark.django_db
+def test_hardware_recovered_outside_status_lock(test_scheduler, settings, monkeypatch):
+    settings.MAX_FAILURES = 1
+    s = test_scheduler
+    restart_signal = Signal()
+    monkeypatch.setattr(scheduler_module, "trigger_api_restart", restart_signal)
+    recoveries = []
+
+    def recover(sender, **kwargs):
+        recoveries.append((s.task_status_lock.locked(), s.dispatch_paused.is_set()))
+        return True
+
+    restart_signal.connect(recover, weak=False)
+    cb = create_bad_action()
+    create_entry("t", 10, None, None, None, cb.__name__)
+    advance_testclock(s.timefn, 1)
+    s.run(blocking=False)
+    assert recoveries == [(False, True)]
+    assert not s.dispatch_paused.is_set()
+    assert s.consecutive_failures == 0
+    assert not s.interrupt_flag.is_set()
@@ -70,7 +70,19 @@ def simulate_scheduler_run(n=1):
         s.run(blocking=False)
 
 
-def create_entry(name, priority, start, stop, interval, action, cb_url=None):
+def create_entry(
+    name,
+    priority,
+    start,
+    stop,
+    interval,
+    action,
+    cb_url=None,
+    tolerance=None,
+    group_actions=None,
+    continuous=False,
+    duty_cycle=None,
+):
     kwargs = {
         "name": name,
         "priority": priority,
@@ -86,6 +98,16 @@ def create_entry(name, priority, start, stop, interval, action, cb_url=None):
     if cb_url is not None:
         kwargs["callback_url"] = cb_url
 
+    if tolerance is not None:
+        kwargs["tolerance"] = tolerance
+
+    if group_actions is not None:
+        kwargs["group_actions"] = group_actions
+
+    if continuous:
+        kwargs["continuous"] = continuous
+        kwargs["duty_cycle"] = duty_cycle
+
     r = Request()
     r.scheme = "https"
     r.version = V1["version"]
@@ -0,0 +1,45 @@
+"""ASGI config for scos_sensor project.
+
+It exposes the ASGI callable as a module-level variable named ``application``.
+Served by gunicorn with uvicorn workers when ``ASGI`` is set, so that streamed
+responses, e.g. SigMF archives and the event stream, don't each hold a thread.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
+
+isort:skip_file
+
+"""
+
+import os
+
+from sensor import startup_profile
+
+startup_profile.start()
+
+import django
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "sensor.settings")
+with startup_profile.phase("apps"):
+    django.setup()  # this is necessary because we need to handle our own thread
+
+from scheduler import scheduler  # noqa
+from sensor import settings  # noqa
+
+if settings.DEBUG:
+    # Handle segmentation faults in DEBUG mode
+    import faulthandler
+
+    faulthandler.enable()
+
+application = get_asgi_application()
+startup_profile.stop()
+
+if not settings.IN_DOCKER:
+    # Normally scheduler and status poller are started by gunicorn worker process
+    from status.views import status_poller  # noqa
+
+    scheduler.thread.start()
+    if settings.STATUS_HISTORY_POLL:
+        status_poller.start()
@@ -0,0 +1,60 @@
+"""Conditional GET support for viewsets.
+
+Views compute a version stamp with cheap queries, e.g. modification times and
+counts, which changes whenever the response would. The ETag is derived from
+the stamp and the request, so an unchanged resource gets a 304 response
+without being serialized or rendered.
+
+"""
+
+import hashlib
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+
+class ConditionalGetMixin:
+    """Answer conditional list and retrieve requests from a version stamp."""
+
+    def get_version_stamp(self):
+        """Return a value that changes whenever the response would."""
+        raise NotImplementedError
+
+    def get_last_modified(self):
+        """Return when the resource last changed, if it is known exactly."""
+        return None
+
+    def get_etag(self, request) -> str:
+        # The URL, format and user also change the response
+        key = repr(
+            (
+                self.get_version_stamp(),
+                request.build_absolute_uri(),
+                request.accepted_renderer.format,
+                request.user.pk,
+            )
+        )
+        return f'W/"{hashlib.sha256(key.encode()).hexdigest()[:32]}"'
+
+    def conditional_get(self, view, request, *args, **kwargs):
+        etag = self.get_etag(request)
+        last_modified = self.get_last_modified()
+        if last_modified is not None:
+            last_modified = int(last_modified.timestamp())
+
+        # Last-Modified has a resolution of one second, too coarse for a
+        # resource that changes twice in a second, so only the ETag is checked
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = view(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            response["ETag"] = etag
+            if last_modified is not None:
+                response["Last-Modified"] = http_date(last_modified)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_get(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_get(super().retrieve, request, *args, **kwargs)
@@ -0,0 +1,49 @@
+import json
+
+from django.core.management.base import BaseCommand
+from django.urls import get_resolver
+
+from sensor import startup_profile
+
+
+class Command(BaseCommand):
+    help = (
+        "Starts the API as it would be started to serve requests and shows how "
+        "long each phase of startup took. Set STARTUP_PROFILE_IMPORTS=True to "
+        "also time the import of each package."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--imports",
+            type=int,
+            default=10,
+            help="Number of slowest imports to show (default 10)",
+        )
+        parser.add_argument("--json", action="store_true", help="Output JSON")
+
+    def handle(self, *args, **options):
+        # The URLconf is otherwise loaded on the first request
+        get_resolver().url_patterns
+        profile = startup_profile.get_profile(max_imports=options["imports"])
+
+        if options["json"]:
+            self.stdout.write(json.dumps(profile, indent=4))
+            return
+
+        for phase in profile["phases"]:
+            duration = phase["duration"]
+            duration = "incomplete" if duration is None else f"{duration:.3f} s"
+            self.stdout.write(
+                f"{phase['name']:<14} start {phase['start']:.3f} s  {duration:<12}"
+                f"{phase['modules_imported'] or 0} modules"
+            )
+            if phase["packages_imported"]:
+                packages = ", ".join(phase["packages_imported"])
+                self.stdout.write(f"{'':<14} imported {packages}")
+        if profile["imports"]:
+            self.stdout.write("Slowest imports:")
+            for package in profile["imports"]:
+                self.stdout.write(
+                    f"  {package['package']:<24}{package['duration']:.3f} s"
+                )
@@ -0,0 +1,31 @@
+import asyncio
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.utils.decorators import sync_and_async_middleware
+
+
+@sync_and_async_middleware
+def bounded_views_middleware(get_response):
+    """
+    Limit the requests handled at once over ASGI to ASGI_THREADS.
+
+    Django runs each synchronous view in its own thread under ASGI, so without
+    a limit a burst of requests starts a burst of threads. Streamed response
+    bodies are sent after the view returns and aren't counted. Under WSGI the
+    server's worker threads already bound the views, so nothing is done.
+    """
+    if not iscoroutinefunction(get_response):
+        return get_response
+
+    semaphore = None
+
+    async def middleware(request):
+        nonlocal semaphore
+        if semaphore is None:
+            # created on first use to use the running event loop
+            semaphore = asyncio.Semaphore(settings.ASGI_THREADS)
+        async with semaphore:
+            return await get_response(request)
+
+    return middleware
@@ -0,0 +1,51 @@
+"""Generate the OpenAPI schema once per process.
+
+Generating the schema introspects every view and serializer, so the generated
+schema is kept for each combination of request scheme, host and API version
+and whether the user is a superuser, which determines the endpoints included.
+This module imports drf_yasg, so it is only imported when the schema is first
+requested.
+
+"""
+
+import threading
+
+from drf_yasg.generators import OpenAPISchemaGenerator
+
+# Hosts are validated against ALLOWED_HOSTS, but bound the cache regardless
+MAX_CACHED_SCHEMAS = 32
+
+_schemas = {}
+_lock = threading.Lock()
+
+
+def get_schema_key(request, public: bool) -> tuple:
+    if request is None:
+        return (public,)
+    user = getattr(request, "user", None)
+    return (
+        public,
+        request.scheme,
+        request.get_host(),
+        getattr(request, "version", None),
+        bool(user and user.is_superuser),
+    )
+
+
+def clear_schema_cache():
+    with _lock:
+        _schemas.clear()
+
+
+class CachedSchemaGenerator(OpenAPISchemaGenerator):
+    def get_schema(self, request=None, public=False):
+        key = get_schema_key(request, public)
+        with _lock:
+            schema = _schemas.get(key)
+        if schema is None:
+            schema = super().get_schema(request, public)
+            with _lock:
+                if len(_schemas) >= MAX_CACHED_SCHEMAS:
+                    _schemas.clear()
+                _schemas[key] = schema
+        return schema
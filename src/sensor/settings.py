@@ -16,9 +16,12 @@ import sys
 from os import path
 from pathlib import Path
 
-from cryptography.fernet import Fernet
-from django.core.management.utils import get_random_secret_key
-from environs import Env
+from sensor import startup_profile
+
+startup_profile.begin("settings")
+
+from django.core.management.utils import get_random_secret_key  # noqa: E402
+from environs import Env  # noqa: E402
 
 logger = logging.getLogger(__name__)
 logger.debug("Initializing scos-sensor settings.")
@@ -96,6 +99,14 @@ else:
     DIFFERENTIAL_CALIBRATION_FILE = None
 os.environ["DIFFERENTIAL_CALIBRATION_FILE"] = diff_cal_path
 
+# Parsed calibration files are cached here and regenerated when a file changes
+CALIBRATION_CACHE_DIR = (
+    "" if RUNNING_TESTS else path.join(CONFIG_DIR, "calibration_cache")
+)
+# Seconds between checks for changed calibration files, which are then loaded
+# without restarting the API. 0 disables reloading.
+CALIBRATION_WATCH_INTERVAL = env.float("CALIBRATION_WATCH_INTERVAL", default=10)
+
 # Sensor Definition File
 if path.exists(sensor_def_path := path.join(CONFIG_DIR, "sensor_definition.json")):
     SENSOR_DEFINITION_FILE = sensor_def_path
@@ -126,6 +137,8 @@ if not IN_DOCKER or RUNNING_TESTS:
     SECRET_KEY = get_random_secret_key()
     DEBUG = True
     ALLOWED_HOSTS = []
+    from cryptography.fernet import Fernet
+
     ENCRYPTION_KEY = Fernet.generate_key()
     ASYNC_CALLBACK = False
 else:
@@ -217,11 +230,13 @@ INSTALLED_APPS = [
     "schedule.apps.ScheduleConfig",
     "scheduler.apps.SchedulerConfig",
     "status.apps.StatusConfig",
+    "events.apps.EventsConfig",
     "sensor.apps.SensorConfig",  # global settings/utils, etc
     "users.apps.UsersConfig",
 ]
 
 MIDDLEWARE = [
+    "sensor.middleware.bounded_views_middleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django_session_timeout.middleware.SessionTimeoutMiddleware",
@@ -288,10 +303,15 @@ if AUTHENTICATION == "CERT":
     )
 else:
     REST_FRAMEWORK["DEFAULT_AUTHENTICATION_CLASSES"] = (
-        "rest_framework.authentication.TokenAuthentication",
+        "authentication.auth.CachedTokenAuthentication",
         "rest_framework.authentication.SessionAuthentication",
     )
 
+# Seconds to cache the user for a client certificate or token, 0 to disable
+AUTH_CACHE_TTL = 0 if RUNNING_TESTS else env.float("AUTH_CACHE_TTL", default=60)
+# Minimum seconds between saving a user's last login time
+LAST_LOGIN_UPDATE_INTERVAL = env.float("LAST_LOGIN_UPDATE_INTERVAL", default=300)
+
 
 # https://drf-yasg.readthedocs.io/en/stable/settings.html
 SWAGGER_SETTINGS = {
@@ -369,10 +389,50 @@ else:
 if not IN_DOCKER:
     DATABASES["default"]["HOST"] = "localhost"
 
+# Number of task result and acquisition changes kept for /api/v1/tasks/changes/
+CHANGE_LOG_MAX_ROWS = env.int("CHANGE_LOG_MAX_ROWS", default=100000)
 # Delete oldest TaskResult (and related acquisitions) of current ScheduleEntry if MAX_DISK_USAGE exceeded
 MAX_DISK_USAGE = env.int("MAX_DISK_USAGE", default=85)  # percent
 # Display at most MAX_TASK_QUEUE upcoming tasks in /tasks/upcoming
 MAX_TASK_QUEUE = 50
+# Most seconds a task result request may wait for the task to finish
+TASK_RESULT_MAX_WAIT = env.float("TASK_RESULT_MAX_WAIT", default=60)
+# Number of tasks the scheduler may run at once. Tasks only run concurrently
+# if the resources (sigan, preselector, gps, cpu) their actions need do not
+# conflict. The default of 1 runs every task in the scheduler thread.
+SCHEDULER_MAX_WORKERS = env.int("SCHEDULER_MAX_WORKERS", default=1)
+# Map of action name to the list of resources it needs, overriding the
+# `resources` attribute of the action. Actions declaring neither need all
+# hardware, e.g. '{"sync_gps": ["gps"], "post_process": ["cpu"]}'
+ACTION_RESOURCES = env.json("ACTION_RESOURCES", default={})
+# Order in which pending tasks are run, either "priority" (by scheduled time,
+# then priority) or "edf" (earliest deadline first, see schedule `tolerance`)
+SCHEDULER_POLICY = env.str("SCHEDULER_POLICY", default="priority")
+# What to do when a new or updated schedule entry would push projected sensor
+# utilization past capacity: "off", "warn" (log and add a Warning header) or
+# "reject" (respond with 400 Bad Request)
+SCHEDULE_ADMISSION_CONTROL = env.str("SCHEDULE_ADMISSION_CONTROL", default="warn")
+# Longest horizon in seconds accepted by the schedule utilization endpoint
+MAX_UTILIZATION_HORIZON = env.int("MAX_UTILIZATION_HORIZON", default=86400)
+# Action durations are estimated from the last DURATION_HISTORY_SIZE completed
+# tasks, then from the benchmarked seeds in ACTION_DURATIONS_FILE (written by
+# `manage.py benchmark_actions`), then DEFAULT_ACTION_DURATION seconds
+DURATION_HISTORY_SIZE = env.int("DURATION_HISTORY_SIZE", default=20)
+ACTION_DURATIONS_FILE = path.join(CONFIG_DIR, "action_durations.json")
+DEFAULT_ACTION_DURATION = env.float("DEFAULT_ACTION_DURATION", default=1.0)
+# Actions defining `prepare(sensor, schedule_entry)` are given the chance to
+# configure hardware while the scheduler is idle, once the next task is due
+# within TUNE_AHEAD_WINDOW seconds. Set to 0 to disable.
+TUNE_AHEAD_WINDOW = env.int("TUNE_AHEAD_WINDOW", default=5)
+# Seconds between checks for running tasks to preempt in favor of a due task
+# of higher priority. Only actions accepting a `cancellation_token` can be
+# preempted. Set to 0 to disable preemption.
+PREEMPTION_SLICE = env.float("PREEMPTION_SLICE", default=0)
+# Pending tasks and task id cursors are saved here so that a restarted
+# scheduler resumes where the last one stopped
+SCHEDULER_CHECKPOINT_FILE = (
+    "" if RUNNING_TESTS else path.join(CONFIG_DIR, "scheduler_checkpoint.json")
+)
 
 # Password validation
 # https://docs.djangoproject.com/en/1.11/ref/settings/#auth-password-validators
@@ -453,10 +513,74 @@ SWITCH_CONFIGS_DIR = Path(SWITCH_CONFIGS_DIR)
 SIGAN_POWER_CYCLE_STATES = env("SIGAN_POWER_CYCLE_STATES", default=None)
 SIGAN_POWER_SWITCH = env("SIGAN_POWER_SWITCH", default=None)
 MAX_FAILURES = env("MAX_FAILURES", default=2)
+# When tasks fail MAX_FAILURES times in a row or the signal analyzer is
+# unhealthy at startup, it is power cycled and re-created up to
+# RECOVERY_ATTEMPTS times before the container is marked for restart. The wait
+# after power cycling starts at RECOVERY_BACKOFF seconds and doubles after each
+# attempt, up to RECOVERY_MAX_BACKOFF. Set RECOVERY_ATTEMPTS to 0 to restart
+# the container right away.
+RECOVERY_ATTEMPTS = env.int("RECOVERY_ATTEMPTS", default=3)
+RECOVERY_BACKOFF = env.float("RECOVERY_BACKOFF", default=5)
+RECOVERY_MAX_BACKOFF = env.float("RECOVERY_MAX_BACKOFF", default=60)
+# Seconds each hardware component may take to load at startup before the API
+# starts without it. Slow components are attached when they finish loading.
+INIT_TIMEOUT = env.float("INIT_TIMEOUT", default=30)
+# Seconds to reuse `lsusb` output when checking for USB_DEVICE
+USB_DEVICES_CACHE_TIMEOUT = env.float("USB_DEVICES_CACHE_TIMEOUT", default=30)
+# Names, sources and descriptions of discovered actions, so that plugins are
+# only imported when one of their actions is first used. The manifest is
+# rebuilt when installed scos plugins or files in ACTIONS_DIR change.
+ACTION_MANIFEST_FILE = (
+    "" if RUNNING_TESTS else path.join(CONFIG_DIR, "action_manifest.json")
+)
+# Size, modification time and hash of driver files copied from DRIVERS_DIR, so
+# unchanged files aren't copied again on startup
+DRIVER_MANIFEST_FILE = (
+    "" if RUNNING_TESTS else path.join(CONFIG_DIR, "driver_manifest.json")
+)
 os.environ["RUNNING_TESTS"] = str(RUNNING_TESTS)
 USB_DEVICE = env("USB_DEVICE", default=None)
 STARTUP_CALIBRATION_ACTION = env("STARTUP_CALIBRATION_ACTION", default=None)
 RAY_INIT = env.bool("RAY_INIT", default=False)
 
+# Seconds between refreshes of the component statuses served by the status
+# endpoint, which request each switch and preselector. 0 refreshes them on each
+# request. STATUS_COMPONENT_TIMEOUT is how long to wait for each component.
+STATUS_POLL_INTERVAL = (
+    0 if RUNNING_TESTS else env.float("STATUS_POLL_INTERVAL", default=10)
+)
+STATUS_COMPONENT_TIMEOUT = env.float("STATUS_COMPONENT_TIMEOUT", default=5)
+# Poll the status from startup, so its history is recorded without status
+# requests. Off by default, since polling requests the signal analyzer and each
+# switch even while a task is using them. Otherwise polling starts with the
+# first status request.
+STATUS_HISTORY_POLL = env.bool("STATUS_HISTORY_POLL", default=False)
+# Status values kept by the status history endpoint: the last
+# STATUS_HISTORY_RAW_POINTS snapshots, and means of the last
+# STATUS_HISTORY_MINUTES minutes and STATUS_HISTORY_HOURS hours
+STATUS_HISTORY_RAW_POINTS = env.int("STATUS_HISTORY_RAW_POINTS", default=360)
+STATUS_HISTORY_MINUTES = env.int("STATUS_HISTORY_MINUTES", default=1440)
+STATUS_HISTORY_HOURS = env.int("STATUS_HISTORY_HOURS", default=720)
+STATUS_HISTORY_FILE = (
+    "" if RUNNING_TESTS else path.join(CONFIG_DIR, "status_history.json")
+)
+
+# Requests handled at once when served over ASGI, see sensor/asgi.py. Matches
+# the threads of the WSGI server's gthread worker by default.
+ASGI_THREADS = env.int("ASGI_THREADS", default=os.cpu_count())
+
+# Events kept for clients of the event stream to resume from, and seconds
+# before a stream is closed, after which clients reconnect. Unless served over
+# ASGI, each open stream uses one of the API's worker threads.
+EVENTS_BUFFER_SIZE = env.int("EVENTS_BUFFER_SIZE", default=1000)
+EVENTS_STREAM_TIMEOUT = env.float("EVENTS_STREAM_TIMEOUT", default=300)
+EVENTS_KEEPALIVE_INTERVAL = env.float("EVENTS_KEEPALIVE_INTERVAL", default=15)
+# Event streams and task result requests waiting with `wait` held at once,
+# each using a worker thread under WSGI. Leaves half of the gthread worker's
+# threads for other requests by default.
+MAX_LONG_REQUESTS = env.int("MAX_LONG_REQUESTS", default=max(1, os.cpu_count() // 2))
+
 # Set default field type for Django auto-created primary keys
 DEFAULT_AUTO_FIELD = "django.db.models.AutoField"
+
+startup_profile.end("settings")
@@ -0,0 +1,164 @@
+"""Record how long each phase of startup takes.
+
+Phases are recorded with :func:`phase`, or :func:`begin` and :func:`end` when
+a phase spans a whole module, e.g. the settings. Each phase records its
+duration and the top-level packages first imported during it.
+
+Setting the ``STARTUP_PROFILE_IMPORTS`` environment variable to ``True`` also
+times the import of each top-level package. This is off by default since it
+wraps every module loader. This module is imported before Django is
+configured, so it only uses the standard library.
+
+"""
+
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from importlib.abc import MetaPathFinder
+
+logger = logging.getLogger(__name__)
+
+_started = time.perf_counter()
+_lock = threading.Lock()
+_phases = {}
+_imports = {}
+_import_timer = None
+
+
+def _top_level_modules() -> set:
+    return {name.partition(".")[0] for name in list(sys.modules)}
+
+
+def begin(name: str) -> None:
+    with _lock:
+        _phases[name] = {
+            "start": time.perf_counter(),
+            "duration": None,
+            "modules": _top_level_modules(),
+            "module_count": len(sys.modules),
+        }
+
+
+def end(name: str) -> None:
+    with _lock:
+        entry = _phases.get(name)
+        if entry is None or entry["duration"] is not None:
+            return
+        entry["duration"] = time.perf_counter() - entry["start"]
+        entry["modules"] = sorted(_top_level_modules() - entry["modules"])
+        entry["module_count"] = len(sys.modules) - entry["module_count"]
+    logger.debug(f"Startup phase {name} took {entry['duration']:.3f} s")
+
+
+@contextmanager
+def phase(name: str):
+    begin(name)
+    try:
+        yield
+    finally:
+        end(name)
+
+
+class _TimedLoader:
+    """Wrap a module loader to time executing the module."""
+
+    def __init__(self, loader, name: str):
+        self._loader = loader
+        self._name = name
+
+    def __getattr__(self, attr):
+        return getattr(self._loader, attr)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        start = time.perf_counter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            elapsed = time.perf_counter() - start
+            # nested imports are included in their top-level package's time
+            if self._name.partition(".")[0] not in _imports:
+                _imports[self._name.partition(".")[0]] = elapsed
+
+
+class _ImportTimer(MetaPathFinder):
+    def __init__(self):
+        self._local = threading.local()
+
+    def find_spec(self, fullname, path, target=None):
+        top_level = fullname.partition(".")[0]
+        if top_level in _imports or top_level != fullname:
+            return None
+        if getattr(self._local, "finding", False):
+            return None
+
+        self._local.finding = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            self._local.finding = False
+
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _TimedLoader(spec.loader, fullname)
+        return spec
+
+
+def start() -> None:
+    """Start timing imports if enabled with STARTUP_PROFILE_IMPORTS."""
+    global _import_timer
+    enabled = os.environ.get("STARTUP_PROFILE_IMPORTS", "").lower() in ("1", "true")
+    if enabled and _import_timer is None:
+        _import_timer = _ImportTimer()
+        sys.meta_path.insert(0, _import_timer)
+
+
+def stop() -> None:
+    global _import_timer
+    if _import_timer is not None:
+        sys.meta_path.remove(_import_timer)
+        _import_timer = None
+
+
+def get_profile(max_imports: int = 10) -> dict:
+    """
+    Return the recorded phases and the slowest imports.
+
+    :param max_imports: the number of slowest imports to include
+    """
+    with _lock:
+        phases = [
+            {
+                "name": name,
+                "start": round(entry["start"] - _started, 4),
+                "duration": (
+                    None if entry["duration"] is None else round(entry["duration"], 4)
+                ),
+                "modules_imported": (
+                    entry["module_count"] if entry["duration"] is not None else None
+                ),
+                "packages_imported": (
+                    entry["modules"] if entry["duration"] is not None else []
+                ),
+            }
+            for name, entry in sorted(_phases.items(), key=lambda p: p[1]["start"])
+        ]
+        imports = sorted(_imports.items(), key=lambda i: i[1], reverse=True)
+    return {
+        "phases": phases,
+        "imports": [
+            {"package": package, "duration": round(duration, 4)}
+            for package, duration in imports[:max_imports]
+        ],
+    }
@@ -0,0 +1,105 @@
+"""Stream responses without holding a thread when served over ASGI.
+
+Under ASGI, Django reads a synchronous iterator, e.g. a file, into memory
+before sending any of it. These helpers return asynchronous iterators instead
+when the request was received over ASGI, reading files in the event loop's
+default thread pool a block at a time.
+
+Under WSGI every request holds one of the server's threads until its response
+is sent, so requests that wait for events, e.g. event streams and task result
+requests with `wait`, are limited to MAX_LONG_REQUESTS at once by
+:data:`long_request_slots`, leaving threads for other requests.
+
+"""
+
+import threading
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import FileResponse
+
+
+def is_asgi_request(request) -> bool:
+    """Return True if `request`, a Django or DRF request, came over ASGI."""
+    return isinstance(getattr(request, "_request", request), ASGIRequest)
+
+
+async def aiter_file(fileobj, block_size: int):
+    """Read `fileobj` a block at a time, closing it when done."""
+    read = sync_to_async(fileobj.read, thread_sensitive=False)
+    try:
+        while True:
+            block = await read(block_size)
+            if not block:
+                break
+            yield block
+    finally:
+        await sync_to_async(fileobj.close, thread_sensitive=False)()
+
+
+def stream_file_response(request, fileobj, **kwargs) -> FileResponse:
+    """
+    Return a :class:`FileResponse` that is read asynchronously over ASGI.
+
+    :param request: the request being responded to
+    :param fileobj: an open file, closed once sent
+    :param kwargs: passed to :class:`FileResponse`
+    """
+    response = FileResponse(fileobj, **kwargs)
+    if is_asgi_request(request):
+        # FileResponse sets the content headers from the file, so replace only
+        # how it is read
+        response.streaming_content = aiter_file(fileobj, response.block_size)
+    return response
+
+
+# seconds a client is asked to wait when no slot is free
+RETRY_AFTER = 10
+
+
+class RequestSlots:
+    """Counts the long-lived requests in progress, up to MAX_LONG_REQUESTS."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._used = 0
+
+    def acquire(self) -> bool:
+        """Take a slot, returning False if all MAX_LONG_REQUESTS are in use."""
+        with self._lock:
+            if self._used >= settings.MAX_LONG_REQUESTS:
+                return False
+            self._used += 1
+            return True
+
+    def release(self):
+        with self._lock:
+            self._used -= 1
+
+
+long_request_slots = RequestSlots()
+
+
+class SlotIterator:
+    """Iterates `iterable`, releasing a request slot once the response closes."""
+
+    def __init__(self, iterable, slots: RequestSlots = long_request_slots):
+        self._iterator = iter(iterable)
+        self._slots = slots
+        self._released = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self._iterator)
+
+    def close(self):
+        # called by Django when the response is closed, even if never iterated
+        if not self._released:
+            self._released = True
+            self._slots.release()
+        close = getattr(self._iterator, "close", None)
+        if close is not None:
+            close()
@@ -22,3 +22,34 @@ def test_api_docs_up_to_date(admin_client):
     with open(settings.OPENAPI_FILE, "w+") as openapi_file:
         openapi_json = json.loads(response.content)
         json.dump(openapi_json, openapi_file, indent=4)
+
+
+def test_api_schema_not_modified(admin_client):
+    schema_url = reverse("api_schema", kwargs=V1) + "?format=openapi"
+    response = admin_client.get(schema_url, **HTTPS_KWARG)
+    assert response.status_code == 200
+    etag = response["ETag"]
+
+    response = admin_client.get(schema_url, HTTP_IF_NONE_MATCH=etag, **HTTPS_KWARG)
+    assert response.status_code == 304
+
+
+def test_api_schema_generated_once(admin_client, monkeypatch):
+    from drf_yasg.generators import OpenAPISchemaGenerator
+
+    from sensor import schema
+
+    schema.clear_schema_cache()
+    get_schema = OpenAPISchemaGenerator.get_schema
+    calls = []
+
+    def count_get_schema(self, *args, **kwargs):
+        calls.append(args)
+        return get_schema(self, *args, **kwargs)
+
+    monkeypatch.setattr(OpenAPISchemaGenerator, "get_schema", count_get_schema)
+    schema_url = reverse("api_schema", kwargs=V1) + "?format=openapi"
+    first = admin_client.get(schema_url, **HTTPS_KWARG)
+    second = admin_client.get(schema_url, **HTTPS_KWARG)
+    assert first.content == second.content
+    assert len(calls) == 1
@@ -0,0 +1,32 @@
+import sys
+
+from sensor import startup_profile
+
+
+def test_phase_recorded():
+    with startup_profile.phase("test_phase"):
+        import sensor.tests.utils  # noqa
+
+    profile = startup_profile.get_profile()
+    phases = {phase["name"]: phase for phase in profile["phases"]}
+    assert phases["test_phase"]["duration"] >= 0
+    assert phases["test_phase"]["modules_imported"] >= 0
+    # the settings are loaded before any test runs
+    assert phases["settings"]["duration"] > 0
+
+
+def test_import_timer_records_top_level_packages(monkeypatch, tmp_path):
+    (tmp_path / "startup_profile_test_pkg.py").write_text("VALUE = 1\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setenv("STARTUP_PROFILE_IMPORTS", "True")
+    startup_profile.start()
+    try:
+        import startup_profile_test_pkg
+
+        assert startup_profile_test_pkg.VALUE == 1
+    finally:
+        startup_profile.stop()
+        sys.modules.pop("startup_profile_test_pkg", None)
+
+    imports = startup_profile.get_profile(max_imports=None)["imports"]
+    assert "startup_profile_test_pkg" in [i["package"] for i in imports]
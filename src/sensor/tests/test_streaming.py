@@ -0,0 +1,36 @@
+import asyncio
+import io
+
+from sensor.streaming import RequestSlots, SlotIterator, aiter_file
+
+
+def test_aiter_file_reads_blocks_and_closes():
+    fileobj = io.BytesIO(b"abcdefg")
+
+    async def read_all():
+        return [block async for block in aiter_file(fileobj, 3)]
+
+    assert asyncio.run(read_all()) == [b"abc", b"def", b"g"]
+    assert fileobj.closed
+
+
+def test_request_slots_limited(settings):
+    settings.MAX_LONG_REQUESTS = 2
+    slots = RequestSlots()
+    assert slots.acquire()
+    assert slots.acquire()
+    assert not slots.acquire()
+    slots.release()
+    assert slots.acquire()
+
+
+def test_slot_released_when_closed_without_iterating(settings):
+    settings.MAX_LONG_REQUESTS = 1
+    slots = RequestSlots()
+    assert slots.acquire()
+    iterator = SlotIterator(iter(["a", "b"]), slots)
+    assert not slots.acquire()
+    iterator.close()
+    iterator.close()
+    assert slots.acquire()
+    assert not slots.acquire()
@@ -17,13 +17,17 @@ Including another URLconf
 
 """
 
-from django.conf import settings
-from django.contrib import admin
-from django.urls import include, path, re_path
-from django.views.generic import RedirectView
-from rest_framework.urlpatterns import format_suffix_patterns
+from sensor import startup_profile
 
-from .views import api_v1_root, schema_view
+startup_profile.begin("urlconf")
+
+from django.conf import settings  # noqa: E402
+from django.contrib import admin  # noqa: E402
+from django.urls import include, path, re_path  # noqa: E402
+from django.views.generic import RedirectView  # noqa: E402
+from rest_framework.urlpatterns import format_suffix_patterns  # noqa: E402
+
+from .views import api_schema, api_v1_root  # noqa: E402
 
 # Matches api/v1, api/v2, etc...
 API_PREFIX = r"^api/(?P<version>v[0-9]+)/"
@@ -34,13 +38,12 @@ api_urlpatterns = format_suffix_patterns(
     (
         path("", api_v1_root, name="api-root"),
         path("capabilities/", include("capabilities.urls")),
+        path("events/", include("events.urls")),
         path("schedule/", include("schedule.urls")),
         path("status", include("status.urls")),
         path("users/", include("authentication.urls")),
         path("tasks/", include("tasks.urls")),
-        path(
-            "schema/", schema_view.with_ui("redoc", cache_timeout=0), name="api_schema"
-        ),
+        path("schema/", api_schema, name="api_schema"),
     )
 )
 
@@ -61,3 +64,5 @@ urlpatterns = [
 
 # logout/login does not do anything if AUTHENTICATION is set to "CERT"
 urlpatterns.append(path("api/auth/", include("rest_framework.urls")))
+
+startup_profile.end("urlconf")
@@ -1,7 +1,10 @@
-from functools import partial
+from functools import lru_cache, partial
 
-from drf_yasg import openapi
-from drf_yasg.views import get_schema_view
+from django.utils.cache import (
+    get_conditional_response,
+    patch_vary_headers,
+    set_response_etag,
+)
 from rest_framework import permissions
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
@@ -32,14 +35,37 @@ def api_v1_root(request, version, format=None):
     return Response(list_endpoints)
 
 
-schema_view = get_schema_view(
-    openapi.Info(
-        title=settings.API_TITLE,
-        default_version=api_settings.DEFAULT_VERSION,
-        description=settings.API_DESCRIPTION,
-        contact=openapi.Contact(email="sms@ntia.doc.gov"),
-        license=openapi.License(name="NTIA/ITS", url=settings.LICENSE_URL),
-    ),
-    public=False,
-    permission_classes=(permissions.IsAuthenticated,),
-)
+@lru_cache(maxsize=None)
+def get_schema_view_ui():
+    """Build the OpenAPI schema view, importing drf_yasg on first use."""
+    from drf_yasg import openapi
+    from drf_yasg.views import get_schema_view
+
+    from .schema import CachedSchemaGenerator
+
+    schema_view = get_schema_view(
+        openapi.Info(
+            title=settings.API_TITLE,
+            default_version=api_settings.DEFAULT_VERSION,
+            description=settings.API_DESCRIPTION,
+            contact=openapi.Contact(email="sms@ntia.doc.gov"),
+            license=openapi.License(name="NTIA/ITS", url=settings.LICENSE_URL),
+        ),
+        public=False,
+        generator_class=CachedSchemaGenerator,
+        permission_classes=(permissions.IsAuthenticated,),
+    )
+    return schema_view.with_ui("redoc", cache_timeout=0)
+
+
+def api_schema(request, *args, **kwargs):
+    """SCOS sensor OpenAPI schema."""
+    response = get_schema_view_ui()(request, *args, **kwargs)
+    if request.method not in ("GET", "HEAD") or response.status_code != 200:
+        return response
+
+    # The schema depends on the user, so clients revalidate with the ETag
+    response.render()
+    set_response_etag(response)
+    patch_vary_headers(response, ("Authorization", "Cookie"))
+    return get_conditional_response(request, etag=response["ETag"], response=response)
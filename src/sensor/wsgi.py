@@ -11,11 +11,16 @@ isort:skip_file
 
 import os
 
+from sensor import startup_profile
+
+startup_profile.start()
+
 import django
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "sensor.settings")
-django.setup()  # this is necessary because we need to handle our own thread
+with startup_profile.phase("apps"):
+    django.setup()  # this is necessary because we need to handle our own thread
 
 from scheduler import scheduler  # noqa
 from sensor import settings  # noqa
@@ -27,7 +32,12 @@ if settings.DEBUG:
     faulthandler.enable()
 
 application = get_wsgi_application()
+startup_profile.stop()
 
 if not settings.IN_DOCKER:
-    # Normally scheduler is started by gunicorn worker process
+    # Normally scheduler and status poller are started by gunicorn worker process
+    from status.views import status_poller  # noqa
+
     scheduler.thread.start()
+    if settings.STATUS_HISTORY_POLL:
+        status_poller.start()
@@ -0,0 +1,187 @@
+"""A bounded on-sensor history of status values.
+
+Numeric and boolean values in each status snapshot, such as disk usage,
+temperatures and health flags, are kept at three resolutions:
+
+- ``raw``: every snapshot, for the last STATUS_HISTORY_RAW_POINTS snapshots
+- ``minute``: the mean of each minute, for the last STATUS_HISTORY_MINUTES
+- ``hour``: the mean of each hour, for the last STATUS_HISTORY_HOURS
+
+Each resolution is a ring buffer, so memory use is bounded. The minute and
+hour buffers are saved to STATUS_HISTORY_FILE every 10 minutes, limiting
+writes to the SD card, and loaded on startup.
+
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+RAW = "raw"
+MINUTE = "minute"
+HOUR = "hour"
+RESOLUTIONS = {RAW: 0, MINUTE: 60, HOUR: 3600}
+
+
+def flatten_status(status, prefix: str = "") -> dict:
+    """
+    Return the numeric and boolean values in a status, by dotted path.
+
+    Booleans are converted to 0 or 1. Other values are left out.
+    """
+    values = {}
+    if isinstance(status, dict):
+        items = status.items()
+    elif isinstance(status, (list, tuple)):
+        items = enumerate(status)
+    else:
+        return values
+
+    for key, value in items:
+        name = f"{prefix}{key}"
+        if isinstance(value, bool):
+            values[name] = int(value)
+        elif isinstance(value, (int, float)):
+            values[name] = value
+        else:
+            values.update(flatten_status(value, f"{name}."))
+    return values
+
+
+class _Bucket:
+    """Accumulates values to average over one minute or hour."""
+
+    def __init__(self, start: int):
+        self.start = start
+        self.sums = {}
+        self.counts = {}
+
+    def add(self, values: dict):
+        for name, value in values.items():
+            self.sums[name] = self.sums.get(name, 0) + value
+            self.counts[name] = self.counts.get(name, 0) + 1
+
+    def mean(self) -> dict:
+        return {name: self.sums[name] / self.counts[name] for name in self.sums}
+
+
+class StatusHistory:
+    """
+    Ring buffers of status values at raw, minute and hour resolution.
+
+    :param raw_points: the number of snapshots to keep
+    :param minutes: the number of minute means to keep
+    :param hours: the number of hour means to keep
+    :param history_file: where minute and hour means are saved, not saved if
+        empty
+    :param save_interval: minimum seconds between saves
+    """
+
+    def __init__(
+        self,
+        raw_points: int,
+        minutes: int,
+        hours: int,
+        history_file="",
+        save_interval: float = 600,
+    ):
+        self.history_file = history_file
+        self.save_interval = save_interval
+        self._saved = None
+        self._points = {
+            RAW: deque(maxlen=raw_points),
+            MINUTE: deque(maxlen=minutes),
+            HOUR: deque(maxlen=hours),
+        }
+        self._buckets = {MINUTE: None, HOUR: None}
+        self._lock = threading.Lock()
+        self.load()
+
+    def add(self, status: dict, timestamp: float = None):
+        """Add the values in a status snapshot."""
+        timestamp = time.time() if timestamp is None else timestamp
+        values = flatten_status(status)
+        minute_completed = False
+        with self._lock:
+            self._points[RAW].append((timestamp, values))
+            for resolution, bucket in self._buckets.items():
+                seconds = RESOLUTIONS[resolution]
+                start = int(timestamp // seconds * seconds)
+                if bucket is not None and bucket.start != start:
+                    self._points[resolution].append((bucket.start, bucket.mean()))
+                    minute_completed = minute_completed or resolution == MINUTE
+                    bucket = None
+                if bucket is None:
+                    bucket = self._buckets[resolution] = _Bucket(start)
+                bucket.add(values)
+        if minute_completed and (
+            self._saved is None or timestamp - self._saved >= self.save_interval
+        ):
+            self._saved = timestamp
+            self.save()
+
+    def query(self, start: float, end: float, resolution: str = None, metrics=None):
+        """
+        Return the values between `start` and `end`.
+
+        :param start: POSIX timestamp of the first point
+        :param end: POSIX timestamp of the last point
+        :param resolution: one of ``raw``, ``minute`` or ``hour``. Defaults to
+            the finest resolution that covers `start`.
+        :param metrics: the values to return, all values if empty
+        :return: the resolution and a list of (timestamp, values) points
+        """
+        with self._lock:
+            points = {r: list(p) for r, p in self._points.items()}
+            for r, bucket in self._buckets.items():
+                # include the current, incomplete minute and hour
+                if bucket is not None:
+                    points[r].append((bucket.start, bucket.mean()))
+
+        if resolution is None:
+            resolution = HOUR
+            for r in (RAW, MINUTE):
+                if points[r] and points[r][0][0] <= start:
+                    resolution = r
+                    break
+
+        results = []
+        for timestamp, values in points[resolution]:
+            if start <= timestamp <= end:
+                if metrics:
+                    values = {m: values[m] for m in metrics if m in values}
+                results.append((timestamp, values))
+        return resolution, results
+
+    def load(self):
+        if not self.history_file:
+            return
+        try:
+            with open(self.history_file) as f:
+                saved = json.load(f)
+            for resolution in (MINUTE, HOUR):
+                self._points[resolution].extend(
+                    (timestamp, values) for timestamp, values in saved[resolution]
+                )
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError, TypeError) as err:
+            logger.warning(f"Unable to load status history: {err}")
+
+    def save(self):
+        if not self.history_file:
+            return
+        with self._lock:
+            saved = {r: list(self._points[r]) for r in (MINUTE, HOUR)}
+        tmp_file = f"{self.history_file}.tmp"
+        try:
+            with open(tmp_file, "w") as f:
+                json.dump(saved, f)
+            os.replace(tmp_file, self.history_file)
+        except OSError as err:
+            logger.warning(f"Unable to save status history: {err}")
@@ -0,0 +1,178 @@
+"""Refresh the sensor status in the background.
+
+Getting the status of switches and preselectors makes a request to each
+device, so the status endpoint serves a snapshot that :class:`StatusPoller`
+refreshes every STATUS_POLL_INTERVAL seconds, getting the status of all
+components concurrently with :class:`ComponentStatuses`.
+
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+
+class _StatusCall:
+    """A ``get_status`` call, timed from when a pool thread starts it."""
+
+    def __init__(self, executor, component):
+        self.started = threading.Event()
+        self.start_time = None
+        self.future = executor.submit(self._run, component)
+
+    def _run(self, component):
+        self.start_time = time.monotonic()
+        self.started.set()
+        return component.get_status()
+
+    def result(self, timeout: float):
+        if not self.started.wait(timeout):
+            raise FutureTimeoutError
+        remaining = self.start_time + timeout - time.monotonic()
+        return self.future.result(timeout=max(remaining, 0))
+
+
+class ComponentStatuses:
+    """
+    Gets the status of components concurrently with a bounded thread pool.
+
+    A component whose last call hasn't returned, e.g. a relay that stopped
+    responding, isn't called again until it does, so it holds at most one
+    thread. A component that fails or doesn't respond within `timeout`
+    seconds is reported unhealthy, with the error and the age of its last
+    status, rather than with its last status.
+
+    :param timeout: seconds to wait for each component
+    :param max_workers: the most components called at once
+    """
+
+    def __init__(self, timeout: float, max_workers: int = 8):
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="StatusPoller"
+        )
+        self._calls = {}  # the last call by component id
+        self._updated = {}  # when each component last returned its status
+        self._lock = threading.Lock()
+
+    def get(self, components) -> list:
+        """
+        Get the status of each component.
+
+        :param components: objects with a ``get_status`` method
+        :return: (component, status) pairs
+        """
+        calls = []
+        with self._lock:
+            for component in components:
+                call = self._calls.get(id(component))
+                pending = call is not None and not call.future.done()
+                if not pending:
+                    call = _StatusCall(self._executor, component)
+                    self._calls[id(component)] = call
+                calls.append((component, call, pending))
+            # forget components that were removed, e.g. a replaced sigan
+            current = {id(component) for component in components}
+            for key in set(self._calls) - current:
+                del self._calls[key]
+                self._updated.pop(key, None)
+
+        statuses = []
+        for component, call, pending in calls:
+            try:
+                status = call.result(self.timeout)
+            except FutureTimeoutError:
+                if pending:
+                    error = "the last status request has not returned"
+                else:
+                    error = f"no status after {self.timeout} s"
+                status = self._failed(component, error)
+            except Exception as err:
+                status = self._failed(component, str(err))
+            else:
+                self._updated[id(component)] = time.monotonic()
+            statuses.append((component, status))
+        return statuses
+
+    def _failed(self, component, error: str) -> dict:
+        logger.warning(f"Unable to get status of {component}: {error}")
+        updated = self._updated.get(id(component))
+        age = None if updated is None else round(time.monotonic() - updated, 3)
+        return {"healthy": False, "error": error, "last_status_age": age}
+
+
+class StatusPoller:
+    """
+    Keeps a snapshot of the sensor status, refreshed in a background thread.
+
+    :param collect: returns the status snapshot
+    :param interval: seconds between refreshes. If 0, the snapshot is
+        refreshed each time it is requested.
+    """
+
+    def __init__(self, collect, interval: float):
+        self.collect = collect
+        self.interval = interval
+        self.listeners = []
+        self._snapshot = None
+        self._updated = None
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+
+    def refresh(self):
+        snapshot = self.collect()
+        with self._lock:
+            self._snapshot = snapshot
+            self._updated = time.monotonic()
+        for listener in self.listeners:
+            try:
+                listener(snapshot)
+            except Exception:
+                logger.exception("Error in status listener")
+        return snapshot
+
+    def get_snapshot(self):
+        """
+        Return the last status snapshot and its age in seconds.
+
+        Starts polling on first use, so that no devices are polled unless the
+        status is requested.
+        """
+        if self.interval <= 0:
+            return self.refresh(), 0.0
+
+        with self._lock:
+            snapshot, updated = self._snapshot, self._updated
+        if snapshot is None:
+            snapshot = self.refresh()
+            updated = time.monotonic()
+            self.start()
+        return snapshot, time.monotonic() - updated
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.refresh()
+            except Exception:
+                logger.exception("Unable to refresh status")
+            finally:
+                close_old_connections()
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None or self.interval <= 0:
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="StatusPoller", daemon=True
+            )
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
@@ -0,0 +1,62 @@
+from status.history import HOUR, MINUTE, RAW, StatusHistory, flatten_status
+
+
+def test_flatten_status():
+    status = {
+        "healthy": True,
+        "disk_usage": 12,
+        "software": {"python_version": "3.10"},
+        "switches": [{"healthy": False, "temperature": 30.5}],
+    }
+    assert flatten_status(status) == {
+        "healthy": 1,
+        "disk_usage": 12,
+        "switches.0.healthy": 0,
+        "switches.0.temperature": 30.5,
+    }
+
+
+def test_history_downsampled_and_bounded():
+    history = StatusHistory(raw_points=10, minutes=3, hours=2)
+    start = 3600 * 100
+    # one snapshot every 10 s for 5 minutes
+    for i in range(30):
+        history.add({"disk_usage": i}, timestamp=start + i * 10)
+
+    resolution, points = history.query(start, start + 300, RAW)
+    assert len(points) == 10
+    assert points[-1] == (start + 290, {"disk_usage": 29})
+
+    resolution, points = history.query(start, start + 300, MINUTE)
+    # 3 completed minutes are kept, plus the current minute
+    assert [t for t, v in points] == [start + 60, start + 120, start + 180, start + 240]
+    assert points[0][1] == {"disk_usage": 8.5}
+
+    resolution, points = history.query(start, start + 300, HOUR)
+    assert points == [(start, {"disk_usage": 14.5})]
+
+
+def test_query_resolution_and_metrics():
+    history = StatusHistory(raw_points=10, minutes=10, hours=10)
+    start = 3600 * 100
+    for i in range(20):
+        history.add({"healthy": True, "disk_usage": i}, timestamp=start + i * 10)
+
+    resolution, points = history.query(start + 150, start + 200, metrics=["healthy"])
+    assert resolution == RAW
+    assert points == [(start + t, {"healthy": 1}) for t in range(150, 200, 10)]
+
+    resolution, points = history.query(start, start + 200)
+    assert resolution == MINUTE
+
+
+def test_history_saved_and_loaded(tmp_path):
+    history_file = str(tmp_path / "history.json")
+    history = StatusHistory(10, 10, 10, history_file, save_interval=0)
+    start = 3600 * 100
+    for i in range(13):
+        history.add({"disk_usage": i}, timestamp=start + i * 10)
+
+    loaded = StatusHistory(10, 10, 10, history_file)
+    resolution, points = loaded.query(start, start + 3600, MINUTE)
+    assert points == [(start, {"disk_usage": 2.5}), (start + 60, {"disk_usage": 8.5})]
@@ -0,0 +1,84 @@
+import threading
+import time
+
+from status.poller import ComponentStatuses, StatusPoller
+
+
+class Component:
+    def __init__(self, status, release=None, delay=0):
+        self.status = status
+        self.release = release
+        self.delay = delay
+        self.calls = 0
+
+    def get_status(self):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.release is not None:
+            self.release.wait(5)
+        if isinstance(self.status, Exception):
+            raise self.status
+        return self.status
+
+
+def test_failed_components_reported_unhealthy():
+    component = Component({"healthy": True})
+    failing = Component(ConnectionError("unreachable"))
+    getter = ComponentStatuses(timeout=0.1)
+    assert dict(getter.get([component, failing])) == {
+        component: {"healthy": True},
+        failing: {"healthy": False, "error": "unreachable", "last_status_age": None},
+    }
+
+    # stops responding
+    release = threading.Event()
+    component.release = release
+    status = dict(getter.get([component]))[component]
+    assert status["healthy"] is False
+    assert status["error"] == "no status after 0.1 s"
+    assert status["last_status_age"] >= 0.1
+
+    # not called again while the last call is pending
+    status = dict(getter.get([component]))[component]
+    assert status["error"] == "the last status request has not returned"
+    assert component.calls == 2
+    release.set()
+
+
+def test_component_timeout_starts_when_called():
+    # with one thread, the second component is called once the first returns
+    components = [Component({"healthy": True}, delay=0.15) for _ in range(2)]
+    getter = ComponentStatuses(timeout=0.2, max_workers=1)
+    assert [status for _, status in getter.get(components)] == [
+        {"healthy": True},
+        {"healthy": True},
+    ]
+
+
+def test_poller_serves_cached_snapshot():
+    calls = []
+
+    def collect():
+        calls.append(None)
+        return {"count": len(calls)}
+
+    poller = StatusPoller(collect, interval=60)
+    received = []
+    poller.listeners.append(received.append)
+    snapshot, age = poller.get_snapshot()
+    assert snapshot == {"count": 1}
+    snapshot, age = poller.get_snapshot()
+    assert snapshot == {"count": 1}
+    assert age >= 0
+    assert received == [{"count": 1}]
+    poller.stop()
+
+    poller.refresh()
+    assert poller.get_snapshot()[0] == {"count": 2}
+
+
+def test_poller_refreshes_on_each_request_without_interval():
+    count = iter(range(1, 10))
+    poller = StatusPoller(lambda: {"count": next(count)}, interval=0)
+    assert poller.get_snapshot() == ({"count": 1}, 0.0)
+    assert poller.get_snapshot() == ({"count": 2}, 0.0)
@@ -1,5 +1,8 @@
 from django.urls import path
 
-from .views import status
+from .views import status, status_history_view
 
-urlpatterns = (path("", status, name="status"),)
+urlpatterns = (
+    path("", status, name="status"),
+    path("/history", status_history_view, name="status-history"),
+)
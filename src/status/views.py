@@ -4,9 +4,7 @@ import platform
 import sys
 
 from django.conf import settings
-from its_preselector import __version__ as PRESELECTOR_API_VERSION
-from its_preselector.preselector import Preselector
-from its_preselector.web_relay import WebRelay
+from rest_framework import serializers
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from scos_actions import __version__ as SCOS_ACTIONS_VERSION
@@ -15,12 +13,17 @@ from scos_actions.utils import (
     convert_datetime_to_millisecond_iso_format,
     get_datetime_str_now,
     get_disk_usage,
+    parse_datetime_iso_format_str,
 )
 
 from initialization import sensor_loader, status_monitor
 from scheduler import scheduler
+from sensor import startup_profile
+from sensor.utils import get_datetime_from_timestamp, get_timestamp_from_datetime
 
 from . import start_time
+from .history import RESOLUTIONS, StatusHistory
+from .poller import ComponentStatuses, StatusPoller
 from .serializers import LocationSerializer
 from .utils import get_location
 
@@ -46,6 +49,8 @@ def get_days_up():
 
 
 def get_software_version():
+    from its_preselector import __version__ as PRESELECTOR_API_VERSION
+
     # Get software versions
     software_version = {
         "system_platform": platform.platform(),
@@ -77,17 +82,15 @@ def get_software_version():
     return software_version
 
 
-@api_view()
-def status(request, version, format=None):
-    """The status overview of the sensor."""
+def collect_status():
+    """Get the status of the sensor and each component."""
+    from its_preselector.preselector import Preselector
+    from its_preselector.web_relay import WebRelay
+
     healthy = True
     status_json = {
-        "scheduler": scheduler.thread.status,
         "location": serialize_location(),
-        "system_time": get_datetime_str_now(),
-        "start_time": convert_datetime_to_millisecond_iso_format(start_time),
         "disk_usage": get_disk_usage(),
-        "days_up": get_days_up(),
         "software": get_software_version(),
     }
     if (
@@ -97,8 +100,8 @@ def status(request, version, format=None):
         status_json["last_calibration_datetime"] = (
             sensor_loader.sensor.sensor_calibration.last_calibration_datetime
         )
-    for component in status_monitor.status_components:
-        component_status = component.get_status()
+    statuses = component_statuses.get(list(status_monitor.status_components))
+    for component, component_status in statuses:
         if isinstance(component, WebRelay):
             if "switches" in status_json:
                 status_json["switches"].append(component_status)
@@ -111,4 +114,79 @@ def status(request, version, format=None):
         if "healthy" in component_status:
             healthy = healthy and component_status["healthy"]
     status_json["healthy"] = healthy
+    return status_json
+
+
+component_statuses = ComponentStatuses(settings.STATUS_COMPONENT_TIMEOUT)
+status_poller = StatusPoller(collect_status, settings.STATUS_POLL_INTERVAL)
+status_history = StatusHistory(
+    settings.STATUS_HISTORY_RAW_POINTS,
+    settings.STATUS_HISTORY_MINUTES,
+    settings.STATUS_HISTORY_HOURS,
+    settings.STATUS_HISTORY_FILE,
+)
+status_poller.listeners.append(status_history.add)
+
+
+@api_view()
+def status(request, version, format=None):
+    """The status overview of the sensor."""
+    snapshot, age = status_poller.get_snapshot()
+    status_json = {
+        "scheduler": scheduler.thread.status,
+        "system_time": get_datetime_str_now(),
+        "start_time": convert_datetime_to_millisecond_iso_format(start_time),
+        "days_up": get_days_up(),
+        "startup": startup_profile.get_profile(),
+        **snapshot,
+        "status_age": round(age, 3),
+    }
     return Response(status_json)
+
+
+@api_view()
+def status_history_view(request, version, format=None):
+    """
+    Numeric and boolean status values over time.
+
+    Query parameters: `start` and `end` (ISO 8601, defaults to the last day),
+    `resolution` (raw, minute or hour, defaults to the finest covering
+    `start`) and `metrics` (comma-separated names, defaults to all).
+    """
+    now = datetime.datetime.utcnow()
+    try:
+        start = get_timestamp_from_datetime(
+            parse_datetime_iso_format_str(request.query_params["start"])
+            if "start" in request.query_params
+            else now - datetime.timedelta(days=1)
+        )
+        end = get_timestamp_from_datetime(
+            parse_datetime_iso_format_str(request.query_params["end"])
+            if "end" in request.query_params
+            else now
+        )
+    except ValueError:
+        raise serializers.ValidationError("start and end must be ISO 8601 datetimes")
+    resolution = request.query_params.get("resolution")
+    if resolution is not None and resolution not in RESOLUTIONS:
+        raise serializers.ValidationError(
+            f"resolution must be one of {', '.join(RESOLUTIONS)}"
+        )
+    metrics = request.query_params.get("metrics")
+    metrics = metrics.split(",") if metrics else None
+
+    resolution, points = status_history.query(start, end, resolution, metrics)
+    return Response(
+        {
+            "resolution": resolution,
+            "points": [
+                {
+                    "time": convert_datetime_to_millisecond_iso_format(
+                        get_datetime_from_timestamp(timestamp)
+                    ),
+                    "values": values,
+                }
+                for timestamp, values in points
+            ],
+        }
+    )
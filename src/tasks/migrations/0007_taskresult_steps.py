@@ -0,0 +1,22 @@
+# Generated by Django 4.2.17 on 2026-10-19 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0006_alter_taskresult_duration"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="taskresult",
+            name="steps",
+            field=models.JSONField(
+                blank=True,
+                default=list,
+                help_text="The result of each action run by a task group",
+            ),
+        ),
+    ]
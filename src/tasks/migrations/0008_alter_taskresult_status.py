@@ -0,0 +1,28 @@
+# Generated by Django 4.2.17 on 2026-10-19 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tasks", "0007_taskresult_steps"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="taskresult",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    (1, "success"),
+                    (2, "failure"),
+                    (3, "in-progress"),
+                    (4, "notification_failed"),
+                    (5, "cancelled"),
+                ],
+                default="in-progress",
+                help_text='"success", "failure", "cancelled", or "notification_failed"',
+                max_length=19,
+            ),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.17 on 2026-10-19 12:00
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tasks", "0008_alter_taskresult_status"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="taskresult",
+            name="modified",
+            field=models.DateTimeField(
+                auto_now=True,
+                default=django.utils.timezone.now,
+                help_text="The date the result was last modified",
+            ),
+            preserve_default=False,
+        ),
+    ]
@@ -0,0 +1,79 @@
+# Generated by Django 4.2.17 on 2026-10-19 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tasks", "0009_taskresult_modified"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="acquisition",
+            name="data_sha256",
+            field=models.CharField(
+                blank=True,
+                help_text="The SHA-256 hash of the stored data",
+                max_length=64,
+            ),
+        ),
+        migrations.AddField(
+            model_name="acquisition",
+            name="data_size",
+            field=models.BigIntegerField(
+                blank=True, help_text="The size of the stored data in bytes", null=True
+            ),
+        ),
+        migrations.CreateModel(
+            name="Change",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "time",
+                    models.DateTimeField(
+                        auto_now_add=True, help_text="When it changed"
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("task_result", "task result"),
+                            ("acquisition", "acquisition"),
+                        ],
+                        max_length=11,
+                    ),
+                ),
+                (
+                    "action",
+                    models.CharField(
+                        choices=[
+                            ("created", "created"),
+                            ("updated", "updated"),
+                            ("deleted", "deleted"),
+                        ],
+                        max_length=7,
+                    ),
+                ),
+                ("schedule_entry_name", models.CharField(max_length=50)),
+                ("task_id", models.IntegerField()),
+                ("recording_id", models.IntegerField(blank=True, null=True)),
+                ("status", models.CharField(blank=True, max_length=19)),
+                ("data_size", models.BigIntegerField(blank=True, null=True)),
+                ("data_sha256", models.CharField(blank=True, max_length=64)),
+            ],
+            options={
+                "db_table": "changes",
+                "ordering": ("id",),
+            },
+        ),
+    ]
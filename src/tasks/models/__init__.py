@@ -1,3 +1,4 @@
 from .acquisition import Acquisition  # noqa
+from .change import Change  # noqa
 from .task import Task  # noqa
 from .task_result import TaskResult  # noqa
@@ -30,6 +30,12 @@ class Acquisition(models.Model):
     metadata = JSONField(help_text="The sigmf meta data for the acquisition")
     data = FileField(upload_to="blob/%Y/%m/%d/%H/%M/%S", null=True)
     data_encrypted = models.BooleanField(default=False)
+    data_size = models.BigIntegerField(
+        null=True, blank=True, help_text="The size of the stored data in bytes"
+    )
+    data_sha256 = models.CharField(
+        max_length=64, blank=True, help_text="The SHA-256 hash of the stored data"
+    )
 
     class Meta:
         db_table = "acquisitions"
@@ -0,0 +1,159 @@
+import logging
+import threading
+from functools import partial
+
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models.signals import post_init, post_save
+
+from .acquisition import Acquisition
+from .task_result import TaskResult
+
+logger = logging.getLogger(__name__)
+
+
+class Change(models.Model):
+    """A task result or acquisition that was created, updated or deleted.
+
+    Changes are numbered in the order they were committed, so a client that
+    keeps the id of the last change it saw can get only what changed since.
+    A task result update is only recorded when its status changes, and
+    deletions are recorded by :func:`delete_task_results`. Only the last
+    CHANGE_LOG_MAX_ROWS changes are kept.
+
+    """
+
+    TASK_RESULT = "task_result"
+    ACQUISITION = "acquisition"
+    KIND_CHOICES = ((TASK_RESULT, "task result"), (ACQUISITION, "acquisition"))
+
+    CREATED = "created"
+    UPDATED = "updated"
+    DELETED = "deleted"
+    ACTION_CHOICES = ((CREATED, CREATED), (UPDATED, UPDATED), (DELETED, DELETED))
+
+    time = models.DateTimeField(auto_now_add=True, help_text="When it changed")
+    kind = models.CharField(max_length=11, choices=KIND_CHOICES)
+    action = models.CharField(max_length=7, choices=ACTION_CHOICES)
+    schedule_entry_name = models.CharField(max_length=50)
+    task_id = models.IntegerField()
+    recording_id = models.IntegerField(null=True, blank=True)
+    status = models.CharField(max_length=19, blank=True)
+    data_size = models.BigIntegerField(null=True, blank=True)
+    data_sha256 = models.CharField(max_length=64, blank=True)
+
+    class Meta:
+        db_table = "changes"
+        ordering = ("id",)
+
+    def __str__(self):
+        return f"{self.id}: {self.kind} {self.action}"
+
+
+# changes are written once their transaction commits, one batch at a time, so
+# ids follow commit order within the API process
+change_lock = threading.Lock()
+PRUNE_INTERVAL = 1000
+changes_written = 0
+
+
+def record_change(kind, action, task_result, **kwargs):
+    fields = dict(
+        kind=kind,
+        action=action,
+        schedule_entry_name=task_result.schedule_entry_id,
+        task_id=task_result.task_id,
+        **kwargs,
+    )
+    # nothing is recorded if the transaction is rolled back
+    transaction.on_commit(partial(write_changes, [fields]))
+
+
+def delete_task_results(task_results):
+    """
+    Delete task results and their acquisitions, recording each deletion.
+
+    Deleted rows are recorded with one insert, rather than from a signal
+    handler per row, which would also keep Django from deleting them in bulk.
+
+    :param task_results: a queryset of the task results to delete
+    """
+    acquisitions = Acquisition.objects.filter(task_result__in=task_results)
+    with transaction.atomic():
+        deleted = [
+            dict(
+                kind=Change.ACQUISITION,
+                action=Change.DELETED,
+                schedule_entry_name=name,
+                task_id=task_id,
+                recording_id=recording_id,
+            )
+            for name, task_id, recording_id in acquisitions.values_list(
+                "task_result__schedule_entry_id", "task_result__task_id", "recording_id"
+            )
+        ]
+        deleted += [
+            dict(
+                kind=Change.TASK_RESULT,
+                action=Change.DELETED,
+                schedule_entry_name=name,
+                task_id=task_id,
+            )
+            for name, task_id in task_results.values_list(
+                "schedule_entry_id", "task_id"
+            )
+        ]
+        task_results.delete()
+        transaction.on_commit(partial(write_changes, deleted))
+
+
+def write_changes(changes):
+    global changes_written
+    with change_lock:
+        Change.objects.bulk_create(Change(**fields) for fields in changes)
+        written, changes_written = changes_written, changes_written + len(changes)
+        # prune in batches rather than on every change
+        if written // PRUNE_INTERVAL != changes_written // PRUNE_INTERVAL:
+            prune_changes()
+
+
+def prune_changes():
+    """Delete all but the last CHANGE_LOG_MAX_ROWS changes."""
+    max_rows = settings.CHANGE_LOG_MAX_ROWS
+    oldest_kept = Change.objects.order_by("-id").values_list("id", flat=True)
+    oldest_kept = list(oldest_kept[max_rows - 1 : max_rows])
+    if oldest_kept:
+        Change.objects.filter(id__lt=oldest_kept[0]).delete()
+
+
+def task_result_loaded(sender, instance, **kwargs):
+    # skip new results and ones loaded without their status
+    if instance.pk is not None and "status" in instance.__dict__:
+        instance.recorded_status = instance.status
+
+
+def task_result_saved(sender, instance, created, **kwargs):
+    # a task saves its result several times; skip saves that change nothing
+    # a client would see in the change log
+    if not created and instance.status == getattr(instance, "recorded_status", None):
+        return
+
+    instance.recorded_status = instance.status
+    action = Change.CREATED if created else Change.UPDATED
+    record_change(Change.TASK_RESULT, action, instance, status=instance.status)
+
+
+def acquisition_saved(sender, instance, created, **kwargs):
+    record_change(
+        Change.ACQUISITION,
+        Change.CREATED if created else Change.UPDATED,
+        instance.task_result,
+        recording_id=instance.recording_id,
+        data_size=instance.data_size,
+        data_sha256=instance.data_sha256,
+    )
+
+
+post_init.connect(task_result_loaded, sender=TaskResult)
+post_save.connect(task_result_saved, sender=TaskResult)
+post_save.connect(acquisition_saved, sender=Acquisition)
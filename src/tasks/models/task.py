@@ -12,8 +12,15 @@ from initialization import action_loader
 logger = logging.getLogger(__name__)
 
 logger.debug("*********** scos-sensor/models/task.py ****************")
-attributes = ("time", "priority", "action", "schedule_entry_name", "task_id")
-TaskTuple = namedtuple("Task", attributes)
+attributes = (
+    "time",
+    "priority",
+    "action",
+    "schedule_entry_name",
+    "task_id",
+    "deadline",
+)
+TaskTuple = namedtuple("Task", attributes, defaults=(None,))
 
 
 class Task(TaskTuple):
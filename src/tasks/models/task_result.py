@@ -22,11 +22,13 @@ class TaskResult(models.Model):
     FAILURE = 2
     IN_PROGRESS = 3
     NOTIFICATION_FAILED = 4
+    CANCELLED = 5
     RESULT_CHOICES = (
         (SUCCESS, "success"),
         (FAILURE, "failure"),
         (IN_PROGRESS, "in-progress"),
         (NOTIFICATION_FAILED, "notification_failed"),
+        (CANCELLED, "cancelled"),
     )
 
     schedule_entry = models.ForeignKey(
@@ -51,12 +53,20 @@ class TaskResult(models.Model):
     status = models.CharField(
         default="in-progress",
         max_length=19,
-        help_text='"success", "failure", or "notification_failed"',
+        help_text='"success", "failure", "cancelled", or "notification_failed"',
         choices=RESULT_CHOICES,
     )
     detail = models.CharField(
         max_length=MAX_DETAIL_LEN, blank=True, help_text="Arbitrary detail string"
     )
+    steps = models.JSONField(
+        default=list,
+        blank=True,
+        help_text="The result of each action run by a task group",
+    )
+    modified = models.DateTimeField(
+        auto_now=True, help_text="The date the result was last modified"
+    )
 
     class Meta:
         ordering = ("task_id",)
@@ -85,7 +95,10 @@ class TaskResult(models.Model):
                     logger.warning(
                         "Max disk usage exceeded, deleting oldest task result!"
                     )
-                    same_entry_results[0].delete()
+                    from .change import delete_task_results
+
+                    oldest = same_entry_results[0]
+                    delete_task_results(TaskResult.objects.filter(pk=oldest.pk))
 
         super().save()
 
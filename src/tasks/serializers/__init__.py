@@ -1,2 +1,3 @@
 from .acquisition import AcquisitionSerializer  # noqa
+from .change import ChangeSerializer  # noqa
 from .task_result import TaskResultSerializer, TaskResultsOverviewSerializer  # noqa
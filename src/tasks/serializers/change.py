@@ -0,0 +1,46 @@
+from rest_framework import serializers
+from rest_framework.reverse import reverse
+
+from schedule.serializers import ISOMillisecondDateTimeFormatField
+from sensor import V1
+from tasks.models import Change
+
+
+class ChangeSerializer(serializers.ModelSerializer):
+    time = ISOMillisecondDateTimeFormatField(help_text="When it changed")
+    schedule_entry = serializers.CharField(
+        source="schedule_entry_name",
+        help_text="The name of the schedule entry of the task result",
+    )
+    url = serializers.SerializerMethodField(
+        help_text="The url of the task result, or its archive for an acquisition"
+    )
+
+    class Meta:
+        model = Change
+        fields = (
+            "id",
+            "time",
+            "kind",
+            "action",
+            "schedule_entry",
+            "task_id",
+            "recording_id",
+            "status",
+            "data_size",
+            "data_sha256",
+            "url",
+        )
+
+    def get_url(self, obj):
+        if obj.action == Change.DELETED:
+            return None
+
+        request = self.context["request"]
+        if obj.kind == Change.ACQUISITION:
+            route = "task-result-archive"
+        else:
+            route = "task-result-detail"
+        kws = {"schedule_entry_name": obj.schedule_entry_name, "task_id": obj.task_id}
+        kws.update(V1)
+        return reverse(route, kwargs=kws, request=request)
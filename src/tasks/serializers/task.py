@@ -18,6 +18,10 @@ class TaskSerializer(serializers.Serializer):
     time = DateTimeFromTimestampField(
         read_only=True, help_text="UTC time (ISO 8601) the this task is scheduled for"
     )
+    deadline = DateTimeFromTimestampField(
+        read_only=True,
+        help_text="UTC time (ISO 8601) after which this task is skipped, if any",
+    )
 
     def get_schedule_entry(self, obj):
         request = self.context["request"]
@@ -97,6 +97,7 @@ class TaskResultSerializer(serializers.HyperlinkedModelSerializer):
             "started",
             "finished",
             "duration",
+            "steps",
             "data",
         )
 
@@ -16,9 +16,11 @@ class TaskQueue(list):
         super().__init__(*args, **kwargs)
         heapq.heapify(self)
 
-    def enter(self, time, priority, action, schedule_entry_name, task_id):
+    def enter(
+        self, time, priority, action, schedule_entry_name, task_id, deadline=None
+    ):
         """Enter an task into the queue and return the unique task id."""
-        evt = Task(time, priority, action, schedule_entry_name, task_id)
+        evt = Task(time, priority, action, schedule_entry_name, task_id, deadline)
         heapq.heappush(self, evt)
 
     def to_list(self):
@@ -0,0 +1,157 @@
+import hashlib
+
+import pytest
+from django.db import transaction
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from sensor import V1
+from sensor.tests.utils import HTTPS_KWARG, validate_response
+from tasks.models import Acquisition, Change, TaskResult
+from tasks.models import change as change_module
+from test_utils.task_test_utils import (
+    create_task_results,
+    reverse_result_detail,
+    reverse_result_list,
+    simulate_frequency_fft_acquisitions,
+)
+
+
+def get_changes(client, **params):
+    url = reverse("changes", kwargs=V1)
+    response = client.get(url, params, **HTTPS_KWARG)
+    return validate_response(response, status.HTTP_200_OK)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_changes_since_cursor(admin_client):
+    entry_name = create_task_results(2, admin_client)
+    rjson = get_changes(admin_client)
+    assert rjson["complete"]
+    assert not rjson["has_more"]
+    assert [(c["kind"], c["action"], c["task_id"]) for c in rjson["results"]] == [
+        (Change.TASK_RESULT, Change.CREATED, 1),
+        (Change.TASK_RESULT, Change.CREATED, 2),
+    ]
+    assert rjson["results"][0]["url"] == reverse_result_detail(entry_name, 1)
+
+    cursor = rjson["cursor"]
+    admin_client.delete(reverse_result_detail(entry_name, 1), **HTTPS_KWARG)
+    rjson = get_changes(admin_client, since=cursor)
+    (change,) = rjson["results"]
+    assert change["action"] == Change.DELETED
+    assert change["task_id"] == 1
+    assert change["url"] is None
+
+    rjson = get_changes(admin_client, since=rjson["cursor"])
+    assert rjson["results"] == []
+    assert rjson["complete"]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_deleted_results_recorded_in_bulk(admin_client, django_assert_max_num_queries):
+    entry_name = create_task_results(20, admin_client)
+    cursor = get_changes(admin_client)["cursor"]
+    # deleting and recording each result on its own would take over 40 queries
+    with django_assert_max_num_queries(20):
+        response = admin_client.delete(reverse_result_list(entry_name), **HTTPS_KWARG)
+    validate_response(response, status.HTTP_204_NO_CONTENT)
+
+    rjson = get_changes(admin_client, since=cursor)
+    assert [(c["action"], c["task_id"]) for c in rjson["results"]] == [
+        (Change.DELETED, task_id) for task_id in range(1, 21)
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_changes_limit(admin_client):
+    create_task_results(3, admin_client)
+    rjson = get_changes(admin_client, limit=2)
+    assert len(rjson["results"]) == 2
+    assert rjson["has_more"]
+
+    rjson = get_changes(admin_client, since=rjson["cursor"], limit=2)
+    assert len(rjson["results"]) == 1
+    assert not rjson["has_more"]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_changes_cursor_from_another_database(admin_client):
+    create_task_results(1, admin_client)
+    last_id = Change.objects.latest("id").id
+    rjson = get_changes(admin_client, since=last_id + 100)
+    assert not rjson["complete"]
+    assert rjson["cursor"] == last_id
+
+
+@pytest.mark.django_db(transaction=True)
+def test_user_cannot_view_changes(user_client):
+    url = reverse("changes", kwargs=V1)
+    response = user_client.get(url, **HTTPS_KWARG)
+    validate_response(response, status.HTTP_403_FORBIDDEN)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_acquisition_change_has_size_and_hash(admin_client, test_scheduler):
+    simulate_frequency_fft_acquisitions(admin_client)
+    acquisition = Acquisition.objects.get()
+    stored = acquisition.data.read()
+    assert acquisition.data_size == len(stored)
+    assert acquisition.data_sha256 == hashlib.sha256(stored).hexdigest()
+
+    rjson = get_changes(admin_client)
+    (change,) = (c for c in rjson["results"] if c["kind"] == Change.ACQUISITION)
+    assert change["action"] == Change.CREATED
+    assert change["data_size"] == acquisition.data_size
+    assert change["data_sha256"] == acquisition.data_sha256
+
+
+@pytest.mark.django_db(transaction=True)
+def test_unchanged_task_result_save_not_recorded(admin_client):
+    create_task_results(1, admin_client)
+    task_result = TaskResult.objects.get()
+    task_result.save()
+    task_result.save()
+    task_result.status = "notification_failed"
+    task_result.save()
+    task_result.save()
+
+    rjson = get_changes(admin_client)
+    assert [(c["action"], c["status"]) for c in rjson["results"]] == [
+        (Change.CREATED, "success"),
+        (Change.UPDATED, "notification_failed"),
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_rolled_back_change_not_recorded(admin_client):
+    create_task_results(1, admin_client)
+    task_result = TaskResult.objects.get()
+    with pytest.raises(RuntimeError):
+        with transaction.atomic():
+            task_result.status = "failure"
+            task_result.save()
+            assert Change.objects.count() == 1
+            raise RuntimeError
+
+    assert Change.objects.count() == 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_changes_recorded_when_committed(admin_client):
+    create_task_results(1, admin_client)
+    task_result = TaskResult.objects.get()
+    with transaction.atomic():
+        task_result.status = "failure"
+        task_result.save()
+        assert not Change.objects.filter(action=Change.UPDATED).exists()
+
+    assert Change.objects.filter(action=Change.UPDATED).count() == 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_changes_pruned_by_count(admin_client, settings, monkeypatch):
+    settings.CHANGE_LOG_MAX_ROWS = 2
+    monkeypatch.setattr(change_module, "PRUNE_INTERVAL", 1)
+    create_task_results(3, admin_client)
+    assert [c.task_id for c in Change.objects.all()] == [2, 3]
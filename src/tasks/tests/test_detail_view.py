@@ -1,4 +1,5 @@
 import os
+import time
 
 from rest_framework import status
 
@@ -161,3 +162,68 @@ def test_deleted_result_deletes_data_file(admin_client, test_scheduler):
     validate_response(first_response, status.HTTP_204_NO_CONTENT)
     validate_response(second_response, status.HTTP_404_NOT_FOUND)
     assert not os.path.exists(data_file)
+
+
+def test_result_detail_conditional_get(admin_client):
+    entry_name = create_task_results(1, admin_client)
+    url = reverse_result_detail(entry_name, 1)
+    response = admin_client.get(url, **HTTPS_KWARG)
+    validate_response(response, status.HTTP_200_OK)
+    assert "Last-Modified" in response
+
+    response = admin_client.get(
+        url,
+        HTTP_IF_NONE_MATCH=response["ETag"],
+        HTTP_IF_MODIFIED_SINCE=response["Last-Modified"],
+        **HTTPS_KWARG,
+    )
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+
+def test_result_detail_changed_within_a_second(admin_client):
+    entry_name = create_task_results(1, admin_client)
+    TaskResult.objects.filter(task_id=1).update(status="in-progress")
+    url = reverse_result_detail(entry_name, 1)
+    response = admin_client.get(url, **HTTPS_KWARG)
+    validate_response(response, status.HTTP_200_OK)
+    last_modified = response["Last-Modified"]
+
+    # finishes within the same second as the in-progress response
+    task_result = TaskResult.objects.get(task_id=1)
+    task_result.status = "success"
+    task_result.save()
+    response = admin_client.get(
+        url, HTTP_IF_MODIFIED_SINCE=last_modified, **HTTPS_KWARG
+    )
+    rjson = validate_response(response, status.HTTP_200_OK)
+    assert rjson["status"] == "success"
+
+
+def test_result_detail_wait(admin_client, settings):
+    entry_name = create_task_results(1, admin_client)
+    url = reverse_result_detail(entry_name, 1)
+
+    # a finished task is returned without waiting
+    start = time.monotonic()
+    response = admin_client.get(url, {"wait": 30}, **HTTPS_KWARG)
+    rjson = validate_response(response, status.HTTP_200_OK)
+    assert rjson["status"] == "success"
+    assert time.monotonic() - start < 5
+
+    TaskResult.objects.filter(task_id=1).update(status="in-progress")
+    settings.TASK_RESULT_MAX_WAIT = 0.1
+    response = admin_client.get(url, {"wait": 30}, **HTTPS_KWARG)
+    rjson = validate_response(response, status.HTTP_200_OK)
+    assert rjson["status"] == "in-progress"
+
+
+def test_result_detail_not_waiting_when_requests_limited(admin_client, settings):
+    entry_name = create_task_results(1, admin_client)
+    TaskResult.objects.filter(task_id=1).update(status="in-progress")
+    settings.MAX_LONG_REQUESTS = 0
+    url = reverse_result_detail(entry_name, 1)
+    start = time.monotonic()
+    response = admin_client.get(url, {"wait": 30}, **HTTPS_KWARG)
+    rjson = validate_response(response, status.HTTP_200_OK)
+    assert rjson["status"] == "in-progress"
+    assert time.monotonic() - start < 5
@@ -90,3 +90,37 @@ def test_delete_list_data_files_deleted(admin_client, test_scheduler):
     response = admin_client.delete(url, **HTTPS_KWARG)
     validate_response(response, status.HTTP_204_NO_CONTENT)
     assert not os.path.exists(data_file)
+
+
+@pytest.mark.django_db
+def test_result_list_conditional_get(admin_client):
+    entry_name = create_task_results(2, admin_client)
+    url = reverse_result_list(entry_name)
+    response = admin_client.get(url, **HTTPS_KWARG)
+    validate_response(response, status.HTTP_200_OK)
+    etag = response["ETag"]
+
+    response = admin_client.get(url, HTTP_IF_NONE_MATCH=etag, **HTTPS_KWARG)
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    result = TaskResult.objects.get(schedule_entry__name=entry_name, task_id=2)
+    result.status = "failure"
+    result.save()
+    response = admin_client.get(url, HTTP_IF_NONE_MATCH=etag, **HTTPS_KWARG)
+    validate_response(response, status.HTTP_200_OK)
+
+
+@pytest.mark.django_db
+def test_list_wait_for_result_after_task_id(admin_client, settings):
+    entry_name = create_task_results(2, admin_client)
+    url = reverse_result_list(entry_name)
+
+    # task 2 has already finished
+    response = admin_client.get(url, {"wait": 30, "after": 1}, **HTTPS_KWARG)
+    rjson = validate_response(response, status.HTTP_200_OK)
+    assert rjson["count"] == 2
+
+    settings.TASK_RESULT_MAX_WAIT = 0.1
+    response = admin_client.get(url, {"wait": 30}, **HTTPS_KWARG)
+    rjson = validate_response(response, status.HTTP_200_OK)
+    assert rjson["count"] == 2
@@ -4,6 +4,7 @@ from .views import (
     TaskResultInstanceViewSet,
     TaskResultListViewSet,
     TaskResultsOverviewViewSet,
+    changes_view,
     task_root,
     upcoming_tasks,
 )
@@ -11,6 +12,7 @@ from .views import (
 urlpatterns = (
     path("", view=task_root, name="task-root"),
     path("upcoming/", view=upcoming_tasks, name="upcoming-tasks"),
+    path("changes/", view=changes_view, name="changes"),
     path(
         "completed/",
         view=TaskResultsOverviewViewSet.as_view({"get": "list"}),
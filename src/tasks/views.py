@@ -2,12 +2,10 @@ import logging
 import tempfile
 from functools import partial
 
-import sigmf.archive
-import sigmf.sigmffile
-from cryptography.fernet import Fernet
 from django.conf import settings
-from django.http import FileResponse, Http404
-from rest_framework import filters, status
+from django.db.models import Count, Max, Min
+from django.http import Http404
+from rest_framework import filters, serializers, status
 from rest_framework.decorators import action, api_view
 from rest_framework.generics import get_object_or_404
 from rest_framework.mixins import DestroyModelMixin, ListModelMixin, RetrieveModelMixin
@@ -16,29 +14,81 @@ from rest_framework.reverse import reverse
 from rest_framework.settings import api_settings
 from rest_framework.viewsets import GenericViewSet
 
+import events
 from schedule.models import ScheduleEntry
 from scheduler import scheduler
+from sensor.conditional import ConditionalGetMixin
+from sensor.streaming import long_request_slots, stream_file_response
 
 from .models.acquisition import Acquisition
+from .models.change import Change, delete_task_results
 from .models.task_result import TaskResult
+from .serializers.change import ChangeSerializer
 from .serializers.task import TaskSerializer
 from .serializers.task_result import TaskResultSerializer, TaskResultsOverviewSerializer
 
 logger = logging.getLogger(__name__)
 
+CHANGES_PAGE_SIZE = 100
+MAX_CHANGES_PAGE_SIZE = 1000
+
 
 @api_view()
 def task_root(request, version, format=None):
-    """Provides links to upcoming and completed tasks"""
+    """Provides links to upcoming and completed tasks and their changes"""
     reverse_ = partial(reverse, request=request, format=format)
     task_endpoints = {
         "upcoming": reverse_("upcoming-tasks"),
         "completed": reverse_("task-results-overview"),
+        "changes": reverse_("changes"),
     }
 
     return Response(task_endpoints)
 
 
+@api_view()
+def changes_view(request, version, format=None):
+    """
+    Returns task results and acquisitions created, updated or deleted since a
+    change, across all schedule entries, in the order they changed.
+
+    Pass the `cursor` of the last response as `since` to get only newer
+    changes, and `limit` to return at most that many (default 100, maximum
+    1000). If `has_more` is true, request again with the new cursor. If
+    `complete` is false, changes since `since` are no longer kept, e.g. after
+    the sensor's database was reset, and results must be synchronized in full.
+    """
+    try:
+        since = int(request.query_params.get("since", 0))
+        limit = int(request.query_params.get("limit", CHANGES_PAGE_SIZE))
+    except ValueError:
+        raise serializers.ValidationError("since and limit must be integers")
+    limit = max(1, min(limit, MAX_CHANGES_PAGE_SIZE))
+
+    bounds = Change.objects.aggregate(first=Min("id"), last=Max("id"))
+    first, last = bounds["first"], bounds["last"] or 0
+    complete = since <= last and (first is None or since >= first - 1)
+
+    changes = list(Change.objects.filter(id__gt=since).order_by("id")[: limit + 1])
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+    if changes:
+        cursor = changes[-1].id
+    else:
+        # a cursor ahead of the last change is from a previous database
+        cursor = min(since, last)
+
+    context = {"request": request}
+    return Response(
+        {
+            "cursor": cursor,
+            "has_more": has_more,
+            "complete": complete,
+            "results": ChangeSerializer(changes, many=True, context=context).data,
+        }
+    )
+
+
 @api_view()
 def upcoming_tasks(request, version, format=None):
     """Returns a snapshot of upcoming tasks."""
@@ -49,7 +99,40 @@ def upcoming_tasks(request, version, format=None):
     return Response(taskq_serializer.data)
 
 
-class TaskResultsOverviewViewSet(ListModelMixin, GenericViewSet):
+def get_wait_time(request) -> float:
+    """Return the seconds to wait for a result from the `wait` parameter."""
+    wait = request.query_params.get("wait")
+    if wait is None:
+        return 0
+    try:
+        wait = float(wait)
+    except ValueError:
+        raise serializers.ValidationError("wait must be a number of seconds")
+    return max(0, min(wait, settings.TASK_RESULT_MAX_WAIT))
+
+
+def wait_for_task(schedule_entry_name, is_done, timeout: float):
+    """
+    Wait for a task of the entry to finish, see :func:`events.wait_for_task`.
+
+    Returns immediately if MAX_LONG_REQUESTS requests are already waiting,
+    so that waiting requests can't take every worker thread.
+    """
+    if not long_request_slots.acquire():
+        logger.debug("Too many waiting requests, responding without waiting")
+        return
+    try:
+        events.wait_for_task(schedule_entry_name, is_done, timeout)
+    finally:
+        long_request_slots.release()
+
+
+def get_task_results_stamp(queryset) -> dict:
+    """Return a stamp that changes when any of the task results change."""
+    return queryset.aggregate(Count("id"), Max("id"), Max("modified"))
+
+
+class TaskResultsOverviewViewSet(ConditionalGetMixin, ListModelMixin, GenericViewSet):
     """
     list:
     Returns an overview of how many results are available per schedule
@@ -65,6 +148,13 @@ class TaskResultsOverviewViewSet(ListModelMixin, GenericViewSet):
         base_queryset = self.filter_queryset(self.queryset)
         return base_queryset.all()
 
+    def get_version_stamp(self):
+        return (
+            list(self.get_queryset().values_list("name", flat=True)),
+            get_task_results_stamp(TaskResult.objects.all()),
+            Acquisition.objects.count(),
+        )
+
 
 class MultipleFieldLookupMixin:
     """Get multiple field filtering based on a `lookup_fields` attribute."""
@@ -89,10 +179,12 @@ class MultipleFieldLookupMixin:
         return get_object_or_404(queryset, **filter)
 
 
-class TaskResultListViewSet(ListModelMixin, GenericViewSet):
+class TaskResultListViewSet(ConditionalGetMixin, ListModelMixin, GenericViewSet):
     """
     list:
     Returns a list of all results created by the given schedule entry.
+    With `wait=<seconds>`, first waits for the entry's next task to finish,
+    or for a task after `after=<task_id>` if given.
 
     destroy_all:
     Deletes all results created by the given schedule entry.
@@ -122,6 +214,29 @@ class TaskResultListViewSet(ListModelMixin, GenericViewSet):
             raise Http404
         return queryset.all()
 
+    def get_version_stamp(self):
+        return get_task_results_stamp(self.get_queryset())
+
+    def list(self, request, *args, **kwargs):
+        timeout = get_wait_time(request)
+        if timeout:
+            entry_name = kwargs["schedule_entry_name"]
+            finished = TaskResult.objects.filter(
+                schedule_entry__name=entry_name
+            ).exclude(status="in-progress")
+            after = request.query_params.get("after")
+            if after is None:
+                after = finished.aggregate(Max("task_id"))["task_id__max"] or 0
+            else:
+                try:
+                    after = int(after)
+                except ValueError:
+                    raise serializers.ValidationError("after must be a task id")
+            wait_for_task(
+                entry_name, finished.filter(task_id__gt=after).exists, timeout
+            )
+        return super().list(request, *args, **kwargs)
+
     @action(detail=False, methods=("delete",))
     def destroy_all(self, request, version, schedule_entry_name):
         queryset = self.get_queryset()
@@ -129,7 +244,7 @@ class TaskResultListViewSet(ListModelMixin, GenericViewSet):
         if not queryset.exists():
             raise Http404
 
-        queryset.delete()
+        delete_task_results(queryset)
 
         return Response(status=status.HTTP_204_NO_CONTENT)
 
@@ -148,19 +263,28 @@ class TaskResultListViewSet(ListModelMixin, GenericViewSet):
         tmparchive = tempfile.TemporaryFile(dir=settings.SCOS_TMP)
         build_sigmf_archive(tmparchive, schedule_entry_name, acquisitions)
         content_type = "application/x-tar"
-        response = FileResponse(
-            tmparchive, as_attachment=True, filename=fname, content_type=content_type
+        response = stream_file_response(
+            request,
+            tmparchive,
+            as_attachment=True,
+            filename=fname,
+            content_type=content_type,
         )
 
         return response
 
 
 class TaskResultInstanceViewSet(
-    MultipleFieldLookupMixin, RetrieveModelMixin, DestroyModelMixin, GenericViewSet
+    ConditionalGetMixin,
+    MultipleFieldLookupMixin,
+    RetrieveModelMixin,
+    DestroyModelMixin,
+    GenericViewSet,
 ):
     """
     retrieve:
-    Returns a specific result.
+    Returns a specific result. With `wait=<seconds>`, first waits for the
+    task to finish if it hasn't.
 
     destroy:
     Deletes the specified acquisition.
@@ -175,6 +299,32 @@ class TaskResultInstanceViewSet(
     permission_classes = api_settings.DEFAULT_PERMISSION_CLASSES
     lookup_fields = ("schedule_entry__name", "task_id")
 
+    def get_version_stamp(self):
+        return self.get_last_modified()
+
+    def retrieve(self, request, *args, **kwargs):
+        timeout = get_wait_time(request)
+        if timeout:
+            entry_name = kwargs["schedule_entry_name"]
+            finished = TaskResult.objects.filter(
+                schedule_entry__name=entry_name, task_id=kwargs["task_id"]
+            ).exclude(status="in-progress")
+            wait_for_task(entry_name, finished.exists, timeout)
+        return super().retrieve(request, *args, **kwargs)
+
+    def perform_destroy(self, instance):
+        delete_task_results(TaskResult.objects.filter(pk=instance.pk))
+
+    def get_last_modified(self):
+        return (
+            self.queryset.filter(
+                schedule_entry__name=self.kwargs["schedule_entry_name"],
+                task_id=self.kwargs["task_id"],
+            )
+            .values_list("modified", flat=True)
+            .first()
+        )
+
     @action(detail=True)
     def archive(self, request, version, schedule_entry_name, task_id):
         entry_name = schedule_entry_name
@@ -188,8 +338,12 @@ class TaskResultInstanceViewSet(
         tmparchive = tempfile.TemporaryFile(dir=settings.SCOS_TMP)
         build_sigmf_archive(tmparchive, schedule_entry_name, acquisitions)
         content_type = "application/x-tar"
-        response = FileResponse(
-            tmparchive, as_attachment=True, filename=fname, content_type=content_type
+        response = stream_file_response(
+            request,
+            tmparchive,
+            as_attachment=True,
+            filename=fname,
+            content_type=content_type,
         )
         return response
 
@@ -203,6 +357,9 @@ def build_sigmf_archive(fileobj, schedule_entry_name, acquisitions):
     @return: None
 
     """
+    import sigmf.archive
+    import sigmf.sigmffile
+
     logger.debug("building sigmf archive")
 
     multirecording = len(acquisitions) > 1
@@ -212,6 +369,8 @@ def build_sigmf_archive(fileobj, schedule_entry_name, acquisitions):
             if acq.data_encrypted:
                 if not settings.ENCRYPTION_KEY:
                     raise Exception("No value set for ENCRYPTION_KEY!")
+                from cryptography.fernet import Fernet
+
                 fernet = Fernet(settings.ENCRYPTION_KEY)
                 raw_data = acq.data.read()
                 data = fernet.decrypt(raw_data)
@@ -1,6 +1,10 @@
 def get_summary(action_fn):
     """Extract the first line of the action's description as a summary."""
-    description = action_fn.description
+    return summarize(action_fn.description)
+
+
+def summarize(description):
+    """Extract the first line of a description as a summary."""
     summary = None
     if description:
         summary = description.splitlines()[0]